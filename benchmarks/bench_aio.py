@@ -0,0 +1,72 @@
+"""Ingest throughput of the asyncio stream validator and the longest stall it causes other coroutines."""
+import asyncio
+import concurrent.futures
+import json
+import time
+
+from draughts import model
+from draughts.aio import collect
+from draughts.fields import Integer, Keyword, List
+
+SIZE = 50000
+
+
+@model
+class Event:
+    name = Keyword()
+    value = Integer()
+    tags = List(Keyword())
+
+
+def payload():
+    return b''.join(json.dumps({'name': f'event-{_i}', 'value': _i, 'tags': ['a', 'b', 'c']}).encode() + b'\n'
+                    for _i in range(SIZE))
+
+
+async def run_case(data, **options):
+    stalls = []
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            stalls.append(now - last)
+            last = now
+
+    reader = asyncio.StreamReader(limit=2**20)
+    reader.feed_data(data)
+    reader.feed_eof()
+    beat = asyncio.ensure_future(heartbeat())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    events = await collect(reader, Event, **options)
+    elapsed = time.perf_counter() - start
+    beat.cancel()
+    assert len(events) == SIZE
+    stalls.sort()
+    return elapsed, stalls[int(len(stalls) * 0.99)], stalls[-1]
+
+
+def main():
+    data = payload()
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        cases = [
+            ('inline, 1ms slices', dict(time_slice=0.001)),
+            ('inline, 5ms slices', dict(time_slice=0.005)),
+            ('inline, 50ms slices', dict(time_slice=0.05)),
+            ('thread executor', dict(executor=executor)),
+        ]
+        for label, options in cases:
+            loop = asyncio.new_event_loop()
+            try:
+                elapsed, p99, longest = loop.run_until_complete(run_case(data, **options))
+            finally:
+                loop.close()
+            # The longest stalls usually include a full garbage collection of the models built so far
+            print(f"{label:<24} {SIZE / elapsed:10,.0f} records/s   stalls p99 {p99 * 1000:6.2f} ms "
+                  f"max {longest * 1000:6.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
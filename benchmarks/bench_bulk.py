@@ -0,0 +1,78 @@
+"""Throughput of bulk mutations on typed containers and compound proxies, against per item loops."""
+from draughts import model
+from draughts.fields import List, Mapping, Compound, Keyword, Integer
+
+from common import measure
+
+SIZE = 10000
+
+
+@model
+class Entry:
+    name = Keyword()
+    value = Integer()
+
+
+@model
+class Holder:
+    numbers = List(Integer(), default=[])
+    counts = Mapping(Integer(), default={})
+    entries = List(Compound(Entry), default=[])
+    named = Mapping(Compound(Entry), default={})
+
+
+def main():
+    numbers = [str(_i) for _i in range(SIZE)]
+    counts = {f'key-{_i}': str(_i) for _i in range(SIZE)}
+    entries = [{'name': f'entry-{_i}', 'value': _i} for _i in range(SIZE)]
+    named = {_e['name']: _e for _e in entries}
+    obj = Holder()
+
+    def numbers_loop():
+        obj.numbers = []
+        for number in numbers:
+            obj.numbers.append(number)
+
+    def numbers_extend():
+        obj.numbers = []
+        obj.numbers.extend(numbers)
+
+    def counts_loop():
+        obj.counts = {}
+        for key, value in counts.items():
+            obj.counts[key] = value
+
+    def counts_update():
+        obj.counts = {}
+        obj.counts.update(counts)
+
+    def entries_loop():
+        obj.entries = []
+        for entry in entries:
+            obj.entries.append(dict(entry))
+
+    def entries_extend():
+        obj.entries = []
+        obj.entries.extend(dict(_e) for _e in entries)
+
+    def named_loop():
+        obj.named = {}
+        for key, entry in named.items():
+            obj.named[key] = dict(entry)
+
+    def named_update():
+        obj.named = {}
+        obj.named.update({_k: dict(_e) for _k, _e in named.items()})
+
+    measure('list append loop', numbers_loop, SIZE)
+    measure('list extend', numbers_extend, SIZE)
+    measure('mapping setitem loop', counts_loop, SIZE)
+    measure('mapping update', counts_update, SIZE)
+    measure('compound list append loop', entries_loop, SIZE)
+    measure('compound list extend', entries_extend, SIZE)
+    measure('compound mapping setitem loop', named_loop, SIZE)
+    measure('compound mapping update', named_update, SIZE)
+
+
+if __name__ == '__main__':
+    main()
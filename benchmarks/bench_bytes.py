@@ -0,0 +1,67 @@
+"""Peak memory of constructing models around large binary payloads.
+
+Each case runs in its own interpreter, the reported growth is the peak
+resident memory above the baseline taken once the payload exists.
+"""
+import mmap
+import os
+import sys
+import tempfile
+
+from draughts import model
+from draughts.fields import Bytes, Keyword
+
+from common import peak_rss_kb, run_isolated
+
+SIZE = 256 * 2**20
+
+
+@model
+class Copied:
+    name = Keyword()
+    payload = Bytes()
+
+
+@model
+class Shared:
+    name = Keyword()
+    payload = Bytes(copy=False)
+
+
+def bytearray_case(model_class):
+    payload = bytearray(SIZE)
+    baseline = peak_rss_kb()
+    obj = model_class(name='sample', payload=payload)
+    return baseline, obj
+
+
+def mmap_case(model_class):
+    with tempfile.TemporaryFile() as handle:
+        handle.truncate(SIZE)
+        mapped = mmap.mmap(handle.fileno(), SIZE, access=mmap.ACCESS_READ)
+        baseline = peak_rss_kb()
+        obj = model_class(name='sample', payload=mapped)
+        return baseline, obj
+
+
+CASES = {
+    'bytearray-copy': lambda: bytearray_case(Copied),
+    'bytearray-nocopy': lambda: bytearray_case(Shared),
+    'mmap-copy': lambda: mmap_case(Copied),
+    'mmap-nocopy': lambda: mmap_case(Shared),
+}
+
+
+def main():
+    if len(sys.argv) > 1:
+        baseline, _ = CASES[sys.argv[1]]()
+        print(f"{sys.argv[1]:<24} {(peak_rss_kb() - baseline) / 1024:10.1f} MiB peak growth "
+              f"for a {SIZE // 2**20} MiB payload")
+        return
+
+    for case in CASES:
+        run_isolated(os.path.abspath(__file__), case)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Cost of casting values that are already in the form a field stores.
+
+The "reconverting" rows repeat the conversion every value went through
+before casts returned clean values as they are.
+"""
+import json
+
+from draughts import model
+from draughts.fields import Integer, Float, Boolean, Keyword, String, DateString
+from draughts.fields.basic import check_iso
+
+from common import measure
+
+COUNT = 10000
+
+
+@model
+class Event:
+    id = Integer()
+    score = Float()
+    active = Boolean()
+    kind = Keyword()
+    message = String()
+    created = DateString()
+
+
+def main():
+    records = [json.loads(json.dumps({
+        'id': _i,
+        'score': _i / 3,
+        'active': _i % 2 == 0,
+        'kind': f'kind-{_i % 10}',
+        'message': f'message number {_i}',
+        'created': check_iso(f'2021-03-{_i % 28 + 1:02}T12:{_i % 60:02}:00.{_i:06}'),
+    })) for _i in range(COUNT)]
+    dates = [_r['created'] for _r in records]
+    numbers = [_r['id'] for _r in records]
+    cast_date, cast_number = DateString().cast, Integer().cast
+
+    measure("DateString, reconverting", lambda: [check_iso(_d) for _d in dates], COUNT)
+    measure("DateString, canonical check", lambda: [cast_date(_d) for _d in dates], COUNT)
+    measure("Integer, reconverting", lambda: [int(_n) for _n in numbers], COUNT)
+    measure("Integer, exact type", lambda: [cast_number(_n) for _n in numbers], COUNT)
+    measure("construct models from clean records", lambda: [Event(dict(_r)) for _r in records], COUNT)
+
+
+if __name__ == '__main__':
+    main()
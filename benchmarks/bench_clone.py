@@ -0,0 +1,41 @@
+"""Cost of copying models with clone, compared to casting a deep copy of their data again."""
+import copy
+
+from draughts import model, raw, clone
+from draughts.fields import Keyword, Integer, List, Mapping, Compound
+
+from common import measure
+
+COUNT = 2000
+
+
+@model
+class Step:
+    name = Keyword()
+    weight = Integer()
+
+
+@model
+class Recipe:
+    name = Keyword()
+    steps = List(Compound(Step))
+    tags = List(Keyword())
+    limits = Mapping(Integer())
+
+
+def main():
+    recipes = [Recipe({
+        'name': f'recipe-{_i}',
+        'steps': [{'name': f'step-{_s}', 'weight': _s} for _s in range(10)],
+        'tags': ['a', 'b', 'c'],
+        'limits': {'low': 1, 'high': 10},
+    }) for _i in range(COUNT)]
+
+    measure("clone", lambda: [clone(_r) for _r in recipes], COUNT)
+    measure("clone with an override", lambda: [clone(_r, name='copy') for _r in recipes], COUNT)
+    measure("construct from deepcopy of raw", lambda: [Recipe(copy.deepcopy(raw(_r))) for _r in recipes], COUNT)
+    measure("deepcopy", lambda: [copy.deepcopy(_r) for _r in recipes], COUNT)
+
+
+if __name__ == '__main__':
+    main()
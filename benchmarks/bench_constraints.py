@@ -0,0 +1,61 @@
+"""Cost of casting optional and constrained fields with compiled casts against layered closures."""
+from draughts import model
+from draughts.fields import Integer, Keyword, MD5
+from draughts.fields.constraints import compile_cast
+
+from common import measure
+
+COUNT = 10000
+
+
+@model
+class Record:
+    count = Integer(optional=True, min=0, max=10**6)
+    kind = Keyword(optional=True, choices=[f'kind-{_i}' for _i in range(10)])
+    digest = MD5(optional=True)
+
+
+def layered(field):
+    """The cast as it would be built from separate closures for each step."""
+    cast = type(field).cast.__get__(field)
+
+    def checked(value):
+        value = cast(value)
+        if 'min' in field.metadata and value < field.metadata['min']:
+            raise ValueError()
+        if 'max' in field.metadata and value > field.metadata['max']:
+            raise ValueError()
+        if 'choices' in field.metadata and value not in field.metadata['choices']:
+            raise ValueError()
+        return value
+
+    def optional(value):
+        if value is None:
+            return None
+        return checked(value)
+    return optional
+
+
+def main():
+    values = {
+        'count': [_i for _i in range(COUNT)],
+        'kind': [f'kind-{_i % 10}' for _i in range(COUNT)],
+        'digest': [f'{_i:032x}' for _i in range(COUNT)],
+    }
+    fields = {'count': Integer(optional=True, min=0, max=10**6),
+              'kind': Keyword(optional=True, choices=[f'kind-{_i}' for _i in range(10)]),
+              'digest': MD5(optional=True)}
+    for name, field in fields.items():
+        field.name = name
+        data = values[name]
+        slow, fast = layered(field), compile_cast(field)
+        measure(f"{name}, layered closures", lambda: [slow(_v) for _v in data], COUNT)
+        measure(f"{name}, compiled", lambda: [fast(_v) for _v in data], COUNT)
+
+    records = [{'count': _c, 'kind': _k, 'digest': _d}
+               for _c, _k, _d in zip(values['count'], values['kind'], values['digest'])]
+    measure("construct records", lambda: [Record(dict(_r)) for _r in records], COUNT)
+
+
+if __name__ == '__main__':
+    main()
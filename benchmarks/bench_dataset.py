@@ -0,0 +1,66 @@
+"""Index build time and random access through the JSON lines dataset index, against scanning the file."""
+import json
+import os
+import random
+import tempfile
+import time
+
+from draughts import model
+from draughts.dataset import build_index, open_dataset
+from draughts.fields import Compound, Integer, Keyword, List, String
+
+from common import measure
+
+SIZE = 200000
+LOOKUPS = 100
+
+
+@model
+class Source:
+    id = Keyword()
+
+
+@model
+class Entry:
+    value = Integer()
+    source = Compound(Source)
+    description = String()
+    tags = List(Keyword())
+
+
+def main():
+    handle, path = tempfile.mkstemp(suffix='.jsonl')
+    try:
+        with os.fdopen(handle, 'w') as out:
+            for index in range(SIZE):
+                out.write(json.dumps({'value': index, 'source': {'id': f'id-{index}'}, 'description': 'x' * 100,
+                                      'tags': ['a', 'b']}) + '\n')
+        print(f"{os.path.getsize(path) / 2**20:.1f} MiB file of {SIZE:,} records")
+
+        for key in (None, 'source.id'):
+            start = time.perf_counter()
+            build_index(path, Entry, key)
+            print(f"{'build index, key ' + str(key):<48} {(time.perf_counter() - start) * 1e3:10.3f} ms")
+
+        rand = random.Random(1)
+        ids = [f'id-{rand.randrange(SIZE)}' for _ in range(LOOKUPS)]
+        positions = [rand.randrange(SIZE) for _ in range(LOOKUPS)]
+
+        def scan():
+            wanted = set(ids)
+            with open(path) as source:
+                return [Entry(_d) for _d in map(json.loads, source) if _d['source']['id'] in wanted]
+
+        with open_dataset(path, Entry, key='source.id') as data:
+            measure('open dataset with key index', lambda: open_dataset(path, Entry, key='source.id').close())
+            measure(f'{LOOKUPS} records by position', lambda: [data[_p] for _p in positions], LOOKUPS)
+            measure(f'{LOOKUPS} records by key', lambda: list(data.get_many(ids)), LOOKUPS)
+            measure(f'{LOOKUPS} records by scanning', scan, LOOKUPS, repeat=1)
+    finally:
+        os.remove(path)
+        if os.path.exists(path + '.idx'):
+            os.remove(path + '.idx')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Cost of ordering and range filtering dates kept as text against dates kept parsed."""
+import random
+from datetime import datetime, timedelta
+
+from draughts import model
+from draughts.fields import DateString, date_key
+
+from common import measure
+
+SIZE = 20000
+
+
+@model
+class Plain:
+    created = DateString()
+
+
+@model
+class Parsed:
+    created = DateString(parsed=True)
+
+
+def main():
+    start = datetime(2020, 1, 1)
+    dates = [(start + timedelta(seconds=random.randrange(10**8))).isoformat() for _ in range(SIZE)]
+    plain = [Plain(created=_d) for _d in dates]
+    parsed = [Parsed(created=_d) for _d in dates]
+    low, high = date_key('2021-01-01T00:00:00'), date_key('2021-06-01T00:00:00')
+
+    measure("construct, text", lambda: [Plain(created=_d) for _d in dates], SIZE)
+    measure("construct, parsed", lambda: [Parsed(created=_d) for _d in dates], SIZE)
+    measure("sort, reparsing text", lambda: sorted(plain, key=lambda _o: date_key(_o.created)), SIZE)
+    measure("sort, parsed epoch", lambda: sorted(parsed, key=lambda _o: _o.created.epoch), SIZE)
+    measure("range filter, reparsing text",
+            lambda: [_o for _o in plain if low <= date_key(_o.created) < high], SIZE)
+    measure("range filter, parsed epoch",
+            lambda: [_o for _o in parsed if low <= _o.created.epoch < high], SIZE)
+
+
+if __name__ == '__main__':
+    main()
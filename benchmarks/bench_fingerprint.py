@@ -0,0 +1,77 @@
+"""Cost of content fingerprints against hashing a sorted serialization of each record."""
+import hashlib
+import json
+
+from draughts import model, raw, fingerprint
+from draughts.fields import Integer, Float, Keyword, String, List, Compound, DateString
+
+from common import measure
+
+COUNT = 5000
+
+
+@model
+class Entry:
+    name = Keyword()
+    value = Integer()
+    weight = Float()
+    tags = List(Keyword(), default=[])
+
+
+@model
+class Document:
+    id = Keyword()
+    title = String()
+    created = DateString()
+    owner = Compound(Entry)
+    entries = List(Compound(Entry))
+
+
+def make(index):
+    return {
+        'id': f'doc-{index}',
+        'title': f'document number {index}',
+        'created': '2021-03-04T05:06:07+00:00',
+        'owner': {'name': 'owner', 'value': index, 'weight': 1.5, 'tags': ['a', 'b']},
+        'entries': [{'name': f'entry-{_i}', 'value': _i, 'weight': _i / 3, 'tags': ['x']} for _i in range(20)],
+    }
+
+
+def sorted_dumps_hash(obj):
+    return hashlib.blake2b(json.dumps(raw(obj), sort_keys=True).encode(), digest_size=16).digest()
+
+
+def main():
+    documents = [Document(make(_i)) for _i in range(COUNT)]
+
+    def fresh():
+        for document in documents:
+            document._memo = None
+            for entry in list(document.entries) + [document.owner]:
+                entry._memo = None
+                entry.tags._memo = None
+            document.entries._memo = None
+
+    def cold():
+        fresh()
+        return [fingerprint(_d) for _d in documents]
+
+    def one_entry():
+        for document in documents:
+            document.entries[7].value += 1
+        return [fingerprint(_d) for _d in documents]
+
+    def owner():
+        for document in documents:
+            document.owner.value += 1
+        return [fingerprint(_d) for _d in documents]
+
+    measure("sorted dumps + blake2b", lambda: [sorted_dumps_hash(_d) for _d in documents], COUNT)
+    measure("fingerprint, nothing cached", cold, COUNT)
+    measure("fingerprint, cached", lambda: [fingerprint(_d) for _d in documents], COUNT)
+    measure("fingerprint after changing a list item", one_entry, COUNT)
+    measure("fingerprint after changing the owner", owner, COUNT)
+
+
+if __name__ == '__main__':
+    main()
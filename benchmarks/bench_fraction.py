@@ -0,0 +1,29 @@
+"""Cost of constructing models with fraction fields, with and without reading the fractions."""
+from draughts import model
+from draughts.fields import SeparatedFraction, Keyword
+
+from common import measure
+
+COUNT = 10000
+
+
+@model
+class Ratio:
+    name = Keyword()
+    ratio = SeparatedFraction()
+    share = SeparatedFraction()
+
+
+def main():
+    records = [{'name': f'ratio-{_i}', 'ratio_numerator': _i, 'ratio_denominator': 997,
+                'share_numerator': 1, 'share_denominator': _i + 1} for _i in range(COUNT)]
+    values = [{'name': f'ratio-{_i}', 'ratio': (_i, 997), 'share': (1, _i + 1)} for _i in range(COUNT)]
+
+    measure("construct from components", lambda: [Ratio(dict(_r)) for _r in records], COUNT)
+    measure("construct from components, read fractions",
+            lambda: [(_o.ratio, _o.share) for _o in [Ratio(dict(_r)) for _r in records]], COUNT)
+    measure("construct from pairs", lambda: [Ratio(dict(_v)) for _v in values], COUNT)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Encoding the same large documents repeatedly, with and without cached JSON fragments."""
+import json
+
+from draughts import model, raw, dumps
+from draughts.fields import Keyword, Integer, Float, Text, List, Compound
+
+from common import measure
+
+COUNT = 200
+
+
+@model
+class Point:
+    x = Float()
+    y = Float()
+
+
+@model
+class Section:
+    title = Text()
+    body = Text()
+    points = List(Compound(Point))
+
+
+@model
+class Status:
+    state = Keyword()
+    version = Integer()
+
+
+def make(index):
+    return {
+        'id': f'doc-{index}',
+        'status': {'state': 'new', 'version': 0},
+        'sections': [{'title': f'section {_s}', 'body': 'text ' * 40,
+                      'points': [{'x': _p, 'y': _p * 2} for _p in range(20)]} for _s in range(20)],
+    }
+
+
+def build(**options):
+    @model(**options)
+    class Document:
+        id = Keyword()
+        status = Compound(Status)
+        sections = List(Compound(Section))
+    return Document
+
+
+def main():
+    plain = [build()(make(_i)) for _i in range(COUNT)]
+    cached = [build(cache_json=True)(make(_i)) for _i in range(COUNT)]
+    assert [dumps(_d) for _d in cached] == [json.dumps(raw(_d)) for _d in plain]
+
+    def publish(documents):
+        return [dumps(_d) for _d in documents]
+
+    def bump(documents):
+        for document in documents:
+            document.status.version += 1
+        return publish(documents)
+
+    def edit(documents):
+        for document in documents:
+            document.sections[3].points[4].x += 1
+        return publish(documents)
+
+    measure("dumps", lambda: publish(plain), COUNT)
+    measure("dumps, cached", lambda: publish(cached), COUNT)
+    measure("dumps after changing the status", lambda: bump(plain), COUNT)
+    measure("dumps after changing the status, cached", lambda: bump(cached), COUNT)
+    measure("dumps after changing one point", lambda: edit(plain), COUNT)
+    measure("dumps after changing one point, cached", lambda: edit(cached), COUNT)
+
+
+if __name__ == '__main__':
+    main()
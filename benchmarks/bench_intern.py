@@ -0,0 +1,64 @@
+"""Memory held by low cardinality keyword and enum fields, with and without interning."""
+import enum
+import json
+import random
+
+from draughts import model
+from draughts.fields import Keyword, Enum, Integer
+
+from common import retained_kb, measure
+
+COUNT = 200000
+
+
+class Severity(enum.Enum):
+    Low = 'low'
+    Medium = 'medium'
+    High = 'high'
+
+
+@model
+class Plain:
+    status = Keyword()
+    source = Keyword()
+    tenant = Keyword()
+    severity = Enum(Severity)
+    size = Integer()
+
+
+@model
+class Interned:
+    status = Keyword(intern=True)
+    source = Keyword(intern=True)
+    tenant = Keyword(intern=1024)
+    severity = Enum(Severity, store_value=True)
+    size = Integer()
+
+
+def dataset():
+    rand = random.Random(1)
+    statuses = ['queued', 'running', 'complete', 'failed', 'cancelled']
+    sources = [f'sensor-{ii:03}' for ii in range(200)]
+    tenants = [f'tenant-{ii:04}' for ii in range(600)]
+    return [json.dumps({
+        'status': rand.choice(statuses),
+        'source': rand.choice(sources),
+        'tenant': rand.choice(tenants),
+        'severity': rand.choice(['low', 'medium', 'high']),
+        'size': rand.randint(0, 2**20),
+    }) for _ in range(COUNT)]
+
+
+def main():
+    lines = dataset()
+    for model_class in (Plain, Interned):
+        size, _ = retained_kb(lambda: [model_class(json.loads(line)) for line in lines])
+        print(f"{model_class.__name__:<12} {size / 1024:8.1f} MiB retained for {COUNT:,} records")
+
+    for model_class in (Plain, Interned):
+        sample = [json.loads(line) for line in lines[:10000]]
+        measure(f'{model_class.__name__} construction', lambda: [model_class(dict(row)) for row in sample], len(sample))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Cost of using large JSON blobs embedded in messages, kept as text against kept parsed."""
+import json
+
+from draughts import model, raw, dumps
+from draughts.fields import JSON, Keyword
+
+from common import measure
+
+COUNT = 200
+
+
+@model
+class Plain:
+    name = Keyword()
+    payload = JSON()
+
+
+@model
+class Parsed:
+    name = Keyword()
+    payload = JSON(parsed=True)
+
+
+def main():
+    payload = {'rows': [{'id': _i, 'tags': ['a', 'b', 'c'], 'score': _i / 7} for _i in range(2000)]}
+    text = json.dumps(payload)
+    messages = [json.dumps({'name': f'message-{_i}', 'payload': text}) for _i in range(COUNT)]
+    print(f"{COUNT} messages with {len(text) / 1024:.0f} KiB of embedded JSON each")
+
+    def consume(model_class, read):
+        total = 0
+        for message in messages:
+            obj = model_class(json.loads(message))
+            total += len(read(obj)['rows'])
+        return total
+
+    measure("load and read, reparsing text", lambda: consume(Plain, lambda _o: json.loads(_o.payload)), COUNT)
+    measure("load and read, parsed value", lambda: consume(Parsed, lambda _o: _o.payload.value), COUNT)
+    measure("build from objects, text", lambda: [Plain(name='x', payload=json.dumps(payload))
+                                                 for _ in range(COUNT)], COUNT)
+    measure("build from objects, parsed", lambda: [Parsed(name='x', payload=payload) for _ in range(COUNT)], COUNT)
+    built = Parsed(name='x', payload=payload)
+    measure("dumps, parsed", lambda: dumps(built), 1)
+    assert json.loads(raw(built)['payload']) == payload
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Cost of building models with large compound lists eagerly and lazily."""
+import json
+
+from draughts import model
+from draughts.fields import List, Mapping, Compound, Keyword, Integer
+
+from common import measure, retained_kb
+
+SIZE = 10000
+COUNT = 20
+
+
+@model
+class Entry:
+    name = Keyword()
+    value = Integer()
+
+
+@model
+class Eager:
+    entries = List(Compound(Entry))
+    named = Mapping(Compound(Entry))
+
+
+@model
+class Lazy:
+    entries = List(Compound(Entry), lazy=True)
+    named = Mapping(Compound(Entry), lazy=True)
+
+
+def main():
+    entries = [{'name': f'entry-{_i}', 'value': _i} for _i in range(SIZE)]
+    document = json.dumps({'entries': entries, 'named': {_e['name']: _e for _e in entries}})
+
+    for model_class in (Eager, Lazy):
+        size, _ = retained_kb(lambda: [model_class(json.loads(document)) for _ in range(COUNT)])
+        print(f"{model_class.__name__:<12} {size / 1024:8.1f} MiB retained for {COUNT} models "
+              f"of 2 x {SIZE:,} compound items")
+
+    for model_class in (Eager, Lazy):
+        name = model_class.__name__
+        measure(f'{name} construct', lambda: model_class(json.loads(document)), SIZE * 2)
+        obj = model_class(json.loads(document))
+        measure(f'{name} one item', lambda: obj.entries[SIZE // 2].value)
+        measure(f'{name} iterate', lambda: sum(_e.value for _e in obj.entries), SIZE)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Sorting, grouping and partial sorting by nested fields, with compiled keys and with attribute lambdas."""
+import heapq
+import random
+import sys
+
+from draughts import model, keyfunc, group_by, top_k
+from draughts.fields import Keyword, Integer, Float, Compound
+
+from common import measure
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+
+@model
+class Host:
+    name = Keyword()
+    zone = Keyword()
+
+
+@model
+class Event:
+    host = Compound(Host)
+    severity = Integer()
+    ts = Float()
+
+
+def by_attribute(items, key):
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return groups
+
+
+def main():
+    rand = random.Random(1)
+    items = [Event(host={'name': f'host-{rand.randrange(1000)}', 'zone': f'zone-{rand.randrange(10)}'},
+                   severity=rand.randrange(5), ts=rand.random()) for _ in range(COUNT)]
+
+    key = keyfunc(Event, 'host.zone', '-severity', 'ts')
+    measure("sort, attribute lambda", lambda: sorted(
+        items, key=lambda _e: (_e.host.zone, -_e.severity, _e.ts)), COUNT, repeat=3)
+    measure("sort, keyfunc", lambda: sorted(items, key=key), COUNT, repeat=3)
+
+    measure("group, attribute lambda", lambda: by_attribute(items, lambda _e: _e.host.name), COUNT, repeat=3)
+    measure("group, group_by", lambda: group_by(Event, items, 'host.name'), COUNT, repeat=3)
+
+    measure("top 100, sorted with attribute lambda", lambda: sorted(
+        items, key=lambda _e: (-_e.severity, _e.host.name))[:100], COUNT, repeat=3)
+    measure("top 100, heapq with attribute lambda", lambda: heapq.nsmallest(
+        100, items, key=lambda _e: (-_e.severity, _e.host.name)), COUNT, repeat=3)
+    measure("top 100, top_k", lambda: top_k(Event, items, 100, '-severity', 'host.name'), COUNT, repeat=3)
+
+
+if __name__ == '__main__':
+    main()
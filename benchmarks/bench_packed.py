@@ -0,0 +1,52 @@
+"""Memory and throughput of packed numeric lists against plain typed lists."""
+import json
+import random
+
+from draughts import model
+from draughts.fields import List, Integer, Float
+
+from common import measure, retained_kb
+
+SIZE = 10000
+COUNT = 100
+
+
+@model
+class Plain:
+    counts = List(Integer())
+    values = List(Float())
+
+
+@model
+class Packed:
+    counts = List(Integer(), packed=True)
+    values = List(Float(), packed=True)
+
+
+def main():
+    rand = random.Random(1)
+    counts = [rand.randint(-2**40, 2**40) for _ in range(SIZE)]
+    values = [rand.random() * 1000 for _ in range(SIZE)]
+    text = [str(_v) for _v in counts]
+
+    # Decode each document separately, as messages would be, so no values are shared between them
+    document = json.dumps({'counts': counts, 'values': values})
+    for model_class in (Plain, Packed):
+        size, _ = retained_kb(lambda: [model_class(json.loads(document)) for _ in range(COUNT)])
+        print(f"{model_class.__name__:<12} {size / 1024:8.1f} MiB retained for {COUNT} models "
+              f"of 2 x {SIZE:,} element lists")
+
+    for model_class in (Plain, Packed):
+        name = model_class.__name__
+        measure(f'{name} construct', lambda: model_class(counts=counts, values=values), SIZE * 2)
+        measure(f'{name} construct from strings', lambda: model_class(counts=text, values=text), SIZE * 2)
+        obj = model_class(counts=[], values=[])
+
+        def extend():
+            obj.counts = []
+            obj.counts.extend(counts)
+        measure(f'{name} extend', extend, SIZE)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Round trip throughput of pickling nested models."""
+import json
+import pickle
+
+from draughts import model, raw, dumps
+from draughts.fields import Compound, List, Mapping, Integer, Keyword, String, Float
+
+from common import measure
+
+
+@model
+class Point:
+    x = Float()
+    y = Float()
+
+
+@model
+class Shape:
+    name = Keyword()
+    points = List(Compound(Point))
+    tags = List(Keyword())
+
+
+@model
+class Drawing:
+    title = String()
+    version = Integer()
+    shapes = List(Compound(Shape))
+    layers = Mapping(Compound(Shape))
+
+
+def build(count):
+    return [Drawing({
+        'title': f'drawing {ii}',
+        'version': ii,
+        'shapes': [
+            {'name': f'shape {jj}', 'points': [{'x': kk, 'y': -kk} for kk in range(8)], 'tags': ['a', 'b']}
+            for jj in range(10)
+        ],
+        'layers': {f'layer{jj}': {'name': 'layer', 'points': [{'x': 0, 'y': 0}], 'tags': []} for jj in range(4)},
+    }) for ii in range(count)]
+
+
+def main():
+    count = 200
+    docs = build(count)
+    protocol = pickle.HIGHEST_PROTOCOL
+
+    def pickle_round_trip():
+        pickle.loads(pickle.dumps(docs, protocol))
+
+    def raw_pickle_and_construct():
+        [Drawing(data) for data in pickle.loads(pickle.dumps([raw(doc) for doc in docs], protocol))]
+
+    def json_and_construct():
+        [Drawing(json.loads(text)) for text in [dumps(doc) for doc in docs]]
+
+    measure('pickle.dumps/loads of models', pickle_round_trip, count)
+    measure('pickle raw() then construct', raw_pickle_and_construct, count)
+    measure('dumps() then construct', json_and_construct, count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Writing documents with some fields left out, with dumps projections and by deleting keys from a deep copy."""
+import copy
+import json
+
+from draughts import model, raw, dumps
+from draughts.fields import Keyword, Integer, Text, List, Compound
+from draughts.model_decorator import _json_default
+
+from common import measure
+
+COUNT = 2000
+
+
+@model
+class Credential:
+    user = Keyword()
+    token = Keyword()
+
+
+@model
+class Comment:
+    author = Keyword()
+    body = Text()
+    score = Integer()
+
+
+@model
+class Post:
+    id = Keyword()
+    title = Text()
+    body = Text()
+    credential = Compound(Credential)
+    comments = List(Compound(Comment))
+
+
+def redact(obj):
+    data = copy.deepcopy(raw(obj))
+    data.pop('credential')
+    for comment in data['comments']:
+        comment.pop('score')
+    return json.dumps(data, default=_json_default)
+
+
+def main():
+    posts = [Post({
+        'id': f'post-{_i}',
+        'title': 'title',
+        'body': 'body ' * 50,
+        'credential': {'user': 'user', 'token': 'secret'},
+        'comments': [{'author': f'user-{_c}', 'body': 'comment ' * 10, 'score': _c} for _c in range(20)],
+    }) for _i in range(COUNT)]
+    assert json.loads(redact(posts[0])) == json.loads(dumps(posts[0], exclude=['credential', 'comments[].score']))
+
+    measure("dumps", lambda: [dumps(_p) for _p in posts], COUNT)
+    measure("exclude, deepcopy and delete", lambda: [redact(_p) for _p in posts], COUNT)
+    measure("exclude, dumps", lambda: [dumps(_p, exclude=['credential', 'comments[].score']) for _p in posts], COUNT)
+    measure("include, dumps", lambda: [dumps(_p, include=['id', 'title', 'comments[].author']) for _p in posts], COUNT)
+
+
+if __name__ == '__main__':
+    main()
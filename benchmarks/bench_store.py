@@ -0,0 +1,57 @@
+"""Query latency of the indexed model store against filtering a list with comprehensions."""
+import random
+import time
+
+from draughts import model
+from draughts.fields import Compound, Integer, Keyword, Timestamp
+from draughts.store import ModelStore
+
+from common import measure
+
+SIZE = 500000
+
+
+@model
+class Source:
+    id = Keyword(index=True)
+
+
+@model
+class Event:
+    id = Keyword()
+    kind = Keyword(index=True)
+    size = Integer(index=True)
+    time = Timestamp(index=True)
+    source = Compound(Source)
+
+
+def main():
+    rand = random.Random(1)
+    events = [Event(id=f'event-{_i}', kind=f'kind-{_i % 50}', size=rand.randrange(10**6), time=1.6e9 + _i,
+                    source={'id': f'source-{_i % 1000}'}) for _i in range(SIZE)]
+
+    store = ModelStore(Event, 'id')
+    start = time.perf_counter()
+    store.add_many(events)
+    print(f"{'build store of ' + format(SIZE, ',') + ' events':<48} {(time.perf_counter() - start) * 1e3:10.3f} ms")
+
+    cases = [
+        ('primary key', lambda: store['event-12345'], lambda: [_e for _e in events if _e.id == 'event-12345']),
+        ('equality', lambda: store.query(('source.id', '==', 'source-7')),
+         lambda: [_e for _e in events if _e.source.id == 'source-7']),
+        ('range', lambda: store.query(('time', '>=', 1.6e9 + SIZE - 100)),
+         lambda: [_e for _e in events if _e.time >= 1.6e9 + SIZE - 100]),
+        ('equality and range', lambda: store.query(('kind', '==', 'kind-3'), ('size', '<', 1000)),
+         lambda: [_e for _e in events if _e.kind == 'kind-3' and _e.size < 1000]),
+    ]
+    for label, indexed, scan in cases:
+        measure(f'{label}, store', indexed)
+        measure(f'{label}, list comprehension', scan, repeat=1)
+
+    obj = store['event-10']
+    sizes = iter(range(10**9))
+    measure('update an indexed field', lambda: setattr(obj, 'size', next(sizes)))
+
+
+if __name__ == '__main__':
+    main()
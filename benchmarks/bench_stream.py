@@ -0,0 +1,50 @@
+"""Peak memory and throughput of streaming a large JSON array into models, against loading it whole."""
+import json
+import os
+import tempfile
+
+from draughts import model
+from draughts.fields import List, Integer, Keyword, String
+from draughts.stream import iter_json_array
+
+from common import measure, peak_kb
+
+SIZE = 100000
+
+
+@model
+class Record:
+    name = Keyword()
+    description = String()
+    values = List(Integer())
+
+
+def load_whole(path):
+    with open(path, 'rb') as handle:
+        return sum(1 for _ in map(Record, json.load(handle)))
+
+
+def load_streaming(path):
+    with open(path, 'rb') as handle:
+        return sum(1 for _ in iter_json_array(handle, Record))
+
+
+def main():
+    handle, path = tempfile.mkstemp(suffix='.json')
+    try:
+        with os.fdopen(handle, 'w') as out:
+            json.dump([{'name': f'record-{_i}', 'description': 'x' * 100, 'values': list(range(10))}
+                       for _i in range(SIZE)], out)
+        print(f"{os.path.getsize(path) / 2**20:.1f} MiB array of {SIZE:,} records")
+
+        for label, load in (('json.load', load_whole), ('iter_json_array', load_streaming)):
+            peak, count = peak_kb(lambda: load(path))
+            assert count == SIZE
+            print(f"{label:<48} {peak / 1024:10.1f} MiB peak")
+            measure(label, lambda: load(path), SIZE, repeat=3)
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
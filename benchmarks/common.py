@@ -0,0 +1,59 @@
+"""Shared helpers for the benchmark scripts in this directory.
+
+Run the scripts directly with the package installed (or on the path), for
+example `python benchmarks/bench_pickle.py`.
+"""
+import timeit
+
+
+def measure(label, func, count=1, repeat=5):
+    """Time func, which handles `count` items per call, and report the best rate."""
+    number, _ = timeit.Timer(func).autorange()
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f"{label:<48} {best * 1e3:10.3f} ms {count / best:14,.0f} items/s")
+    return best
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process so far, in KiB."""
+    import resource
+    import sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_isolated(script, case):
+    """Run one case of a benchmark script in a fresh interpreter so peak memory is measured on its own."""
+    import subprocess
+    import sys
+    subprocess.run([sys.executable, script, case], check=True)
+
+
+def retained_kb(build):
+    """Memory still allocated by Python once build() returns, in KiB, along with its result."""
+    import gc
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current // 1024, result
+
+
+def peak_kb(run):
+    """Peak memory allocated by Python while run() executes, in KiB, along with its result."""
+    import gc
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak // 1024, result
@@ -1,2 +1,4 @@
 from .model_decorator import model, model_fields, model_fields_flat, raw, dumps
-from .util import construct_safe, recursive_update
+from .util import construct_safe, recursive_update, clone
+from .fingerprints import fingerprint
+from .ordering import keyfunc, group_by, top_k
@@ -0,0 +1,228 @@
+"""Validate streams of documents in asyncio applications without stalling the event loop.
+
+Records are read from an `asyncio.StreamReader` or any async iterable that
+produces JSON lines (as str or bytes) or dicts. Reading, validating and
+consuming run concurrently and are joined by bounded queues, so a slow
+consumer stops validation and, in turn, stops reading from the source.
+"""
+import asyncio
+import json
+import time
+from typing import List, Optional, Tuple
+
+_END = object()
+
+
+class _Failure:
+    __slots__ = ['error']
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _load(model, record):
+    if isinstance(record, (bytes, bytearray, str)):
+        record = json.loads(record)
+    return model(record)
+
+
+def _load_chunk(model, records: List) -> Tuple[List, Optional[_Failure]]:
+    """Parse and validate a chunk of records, this is what runs on an executor.
+
+    Stops at the first invalid record, returning the models before it along with its error.
+    """
+    models = []
+    for record in records:
+        if _blank(record):
+            continue
+        try:
+            models.append(_load(model, record))
+        except Exception as error:
+            return models, _Failure(error)
+    return models, None
+
+
+def _blank(record) -> bool:
+    return isinstance(record, (bytes, bytearray, str)) and not record.strip()
+
+
+async def _records(source):
+    if isinstance(source, asyncio.StreamReader):
+        while True:
+            line = await source.readline()
+            if not line:
+                return
+            yield line
+    else:
+        async for record in source:
+            yield record
+
+
+class ValidatingStream:
+    """An async iterator of the models validated from a stream of records.
+
+    Validation happens in chunks of up to `chunk_size` records, taking
+    whatever has already been read rather than waiting for a chunk to fill.
+    When validating on the event loop, control is handed back to the loop
+    every `time_slice` seconds. With an `executor` whole chunks are validated
+    there instead, a process pool needs the model to be importable by name.
+    At most `queue_size` chunks are held between each stage.
+
+    An invalid record raises its error from the iterator, after every model
+    from the records ahead of it, and ends the stream.
+    """
+    def __init__(self, source, model, time_slice: float = 0.005, chunk_size: int = 256,
+                 executor=None, queue_size: int = 4):
+        if chunk_size < 1 or queue_size < 1:
+            raise ValueError("chunk_size and queue_size must be at least one")
+        self.model = model
+        self.time_slice = time_slice
+        self.chunk_size = chunk_size
+        self.executor = executor
+        self._source = source
+        self._queue_size = queue_size
+        self._records: Optional[asyncio.Queue] = None
+        self._models: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Future] = []
+        self._ready: List = []
+        self._position = 0
+        self._done = False
+
+    def _start(self):
+        self._records = asyncio.Queue(self.chunk_size * self._queue_size)
+        self._models = asyncio.Queue(self._queue_size)
+        self._tasks = [asyncio.ensure_future(self._read()), asyncio.ensure_future(self._validate())]
+
+    async def _read(self):
+        put = self._records.put
+        try:
+            async for record in _records(self._source):
+                await put(record)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            await put(_Failure(error))
+        else:
+            await put(_END)
+
+    async def _next_chunk(self) -> List:
+        """Wait for at least one record, then take whatever else is ready up to a full chunk."""
+        records = self._records
+        chunk = [await records.get()]
+        while len(chunk) < self.chunk_size and not records.empty():
+            chunk.append(records.get_nowait())
+        return chunk
+
+    async def _validate(self):
+        put = self._models.put
+        loop = asyncio.get_event_loop()
+        while True:
+            chunk = await self._next_chunk()
+            end = None
+            for index, record in enumerate(chunk):
+                if record is _END or isinstance(record, _Failure):
+                    end = record
+                    del chunk[index:]
+                    break
+
+            try:
+                if self.executor is not None:
+                    if chunk:
+                        models, failure = await loop.run_in_executor(self.executor, _load_chunk, self.model, chunk)
+                        # Hand over what came before the bad record first, as validating inline does
+                        if models:
+                            await put(models)
+                        if failure is not None:
+                            await put(failure)
+                            return
+                else:
+                    await self._validate_inline(chunk, put)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                await put(_Failure(error))
+                return
+
+            if end is not None:
+                await put(end)
+                return
+
+    async def _validate_inline(self, chunk: List, put):
+        model = self.model
+        models = []
+        deadline = time.perf_counter() + self.time_slice
+        for record in chunk:
+            if _blank(record):
+                continue
+            try:
+                models.append(_load(model, record))
+            except Exception:
+                # Hand over what came before the bad record first, so errors arrive in order
+                if models:
+                    await put(models)
+                raise
+            if time.perf_counter() > deadline:
+                await put(models)
+                models = []
+                await asyncio.sleep(0)
+                deadline = time.perf_counter() + self.time_slice
+        if models:
+            await put(models)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while self._position >= len(self._ready):
+            if self._done:
+                raise StopAsyncIteration()
+            if self._models is None:
+                self._start()
+            item = await self._models.get()
+            if item is _END or isinstance(item, _Failure):
+                self._done = True
+                await self.aclose()
+                if item is _END:
+                    raise StopAsyncIteration()
+                raise item.error
+            self._ready = item
+            self._position = 0
+
+        model = self._ready[self._position]
+        self._position += 1
+        return model
+
+    async def aclose(self):
+        """Stop reading and validating, a stream that isn't read to the end should be closed."""
+        self._done = True
+        self._ready = []
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+
+def validate_stream(source, model, **options) -> ValidatingStream:
+    """Validate records from a stream reader or async iterable, see `ValidatingStream` for the options.
+
+        async with validate_stream(reader, Model) as models:
+            async for obj in models:
+                ...
+    """
+    return ValidatingStream(source, model, **options)
+
+
+async def collect(source, model, **options) -> List:
+    """Validate every record of a stream and return the models as a list."""
+    async with validate_stream(source, model, **options) as models:
+        return [_m async for _m in models]
@@ -0,0 +1,341 @@
+"""A compact binary encoding of models driven by their schema.
+
+Fields are written in declaration order without keys. Optional fields are
+marked present or absent in a bitmap at the start of each model. Integers are
+written as zigzag varints, floats as little endian doubles, enums by their
+position in the enum, and strings and bytes with a varint length prefix.
+Lists and mappings are prefixed with their length, and each of their items
+with a presence byte when the items are optional. Mapping keys are tagged
+as a string or as the JSON of a number, boolean or null key.
+"""
+import json
+import struct
+import typing
+from typing import Dict, Tuple, Callable
+
+from .model_decorator import ClassCache, model_fields, trusted as load_trusted
+from .fields import Boolean, Integer, Float, Enum, Bytes, String, DateString, JSON, JSONValue, Any, \
+    SeparatedFraction, Compound, ListTypes, MappingTypes
+from .fields.bases import Field, MultiField
+
+Encoder = Callable[[typing.Any, bytearray], None]
+Decoder = Callable[[memoryview, int], Tuple[typing.Any, int]]
+
+_codecs: Dict[type, Tuple[Encoder, Decoder]] = typing.cast(Dict, ClassCache('codecs'))
+
+_double = struct.Struct('<d')
+
+
+def _write_uvarint(value: int, out: bytearray):
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_uvarint(buf: memoryview, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _encode_integer(value, out):
+    _write_uvarint(value << 1 if value >= 0 else ((-value) << 1) - 1, out)
+
+
+def _decode_integer(buf, pos):
+    value, pos = _read_uvarint(buf, pos)
+    if value & 1:
+        return -((value + 1) >> 1), pos
+    return value >> 1, pos
+
+
+def _encode_float(value, out):
+    out += _double.pack(value)
+
+
+def _decode_float(buf, pos):
+    return _double.unpack_from(buf, pos)[0], pos + 8
+
+
+def _encode_boolean(value, out):
+    out.append(1 if value else 0)
+
+
+def _decode_boolean(buf, pos):
+    return buf[pos] != 0, pos + 1
+
+
+def _encode_bytes(value, out):
+    _write_uvarint(len(value), out)
+    out += value
+
+
+def _decode_bytes(buf, pos):
+    size, pos = _read_uvarint(buf, pos)
+    end = pos + size
+    return bytes(buf[pos:end]), end
+
+
+def _encode_string(value, out):
+    _encode_bytes(value.encode(), out)
+
+
+def _decode_string(buf, pos):
+    size, pos = _read_uvarint(buf, pos)
+    end = pos + size
+    return str(buf[pos:end], 'utf-8'), end
+
+
+def _encode_any(value, out):
+    _encode_string(json.dumps(value), out)
+
+
+def _decode_any(buf, pos):
+    value, pos = _decode_string(buf, pos)
+    return json.loads(value), pos
+
+
+def _encode_fraction(value, out):
+    _encode_integer(value[0], out)
+    _encode_integer(value[1], out)
+
+
+def _decode_fraction(buf, pos):
+    numerator, pos = _decode_integer(buf, pos)
+    denominator, pos = _decode_integer(buf, pos)
+    return (numerator, denominator), pos
+
+
+def _encode_key(key, out):
+    if isinstance(key, str):
+        out.append(0)
+        _encode_string(key, out)
+    elif isinstance(key, (int, float)) or key is None:
+        out.append(1)
+        _encode_any(key, out)
+    else:
+        raise ValueError(f"No binary encoding for {key.__class__.__name__} mapping keys")
+
+
+def _decode_key(buf, pos):
+    if buf[pos]:
+        return _decode_any(buf, pos + 1)
+    return _decode_string(buf, pos + 1)
+
+
+def _optional_codec(field: Field) -> Tuple[Encoder, Decoder]:
+    """The codec of a list or mapping item, with a presence byte in front when the item can be None."""
+    encode, decode = _field_codec(field)
+    if not field.metadata.get('optional', False):
+        return encode, decode
+
+    def _encode_optional(value, out):
+        if value is None:
+            out.append(0)
+        else:
+            out.append(1)
+            encode(value, out)
+
+    def _decode_optional(buf, pos):
+        if buf[pos]:
+            return decode(buf, pos + 1)
+        return None, pos + 1
+
+    return _encode_optional, _decode_optional
+
+
+def _enum_codec(field: Enum) -> Tuple[Encoder, Decoder]:
+    # Encode whatever the field stores, either the enum members or their values
+    stored = tuple(field.cast(member) for member in field.enum)
+    ordinals = {value: index for index, value in enumerate(stored)}
+
+    def _encode_enum(value, out):
+        _write_uvarint(ordinals[value], out)
+
+    def _decode_enum(buf, pos):
+        index, pos = _read_uvarint(buf, pos)
+        return stored[index], pos
+
+    return _encode_enum, _decode_enum
+
+
+def _date_codec(field: DateString) -> Tuple[Encoder, Decoder]:
+    # Parsed dates are rebuilt from their text, the loader doesn't cast decoded values again
+    cast = field.cast
+
+    def _decode_date(buf, pos):
+        value, pos = _decode_string(buf, pos)
+        return cast(value), pos
+
+    return _encode_string, _decode_date
+
+
+def _decode_json(buf, pos):
+    # The text was checked when it was encoded, leave parsing it until the value is used
+    value, pos = _decode_string(buf, pos)
+    return JSONValue(value), pos
+
+
+def _list_codec(field: Field) -> Tuple[Encoder, Decoder]:
+    encode_item, decode_item = _optional_codec(field.field)
+
+    def _encode_list(value, out):
+        _write_uvarint(len(value), out)
+        for item in value:
+            encode_item(item, out)
+
+    def _decode_list(buf, pos):
+        size, pos = _read_uvarint(buf, pos)
+        items = []
+        for _ in range(size):
+            item, pos = decode_item(buf, pos)
+            items.append(item)
+        return items, pos
+
+    return _encode_list, _decode_list
+
+
+def _mapping_codec(field: Field) -> Tuple[Encoder, Decoder]:
+    encode_item, decode_item = _optional_codec(field.field)
+
+    def _encode_mapping(value, out):
+        _write_uvarint(len(value), out)
+        for key, item in value.items():
+            _encode_key(key, out)
+            encode_item(item, out)
+
+    def _decode_mapping(buf, pos):
+        size, pos = _read_uvarint(buf, pos)
+        items = {}
+        for _ in range(size):
+            key, pos = _decode_key(buf, pos)
+            items[key], pos = decode_item(buf, pos)
+        return items, pos
+
+    return _encode_mapping, _decode_mapping
+
+
+def _field_codec(field: Field) -> Tuple[Encoder, Decoder]:
+    if isinstance(field, SeparatedFraction):
+        return _encode_fraction, _decode_fraction
+    if isinstance(field, Compound):
+        return _model_codec(field.model)
+    if isinstance(field, ListTypes):
+        return _list_codec(field)
+    if isinstance(field, MappingTypes):
+        return _mapping_codec(field)
+    if isinstance(field, Boolean):
+        return _encode_boolean, _decode_boolean
+    if isinstance(field, Enum):
+        return _enum_codec(field)
+    if isinstance(field, Integer):
+        return _encode_integer, _decode_integer
+    if isinstance(field, Float):
+        return _encode_float, _decode_float
+    if isinstance(field, Bytes):
+        return _encode_bytes, _decode_bytes
+    if isinstance(field, DateString) and field.parsed:
+        return _date_codec(field)
+    if isinstance(field, JSON) and field.parsed:
+        return _encode_string, _decode_json
+    if isinstance(field, String):
+        return _encode_string, _decode_string
+    if isinstance(field, Any):
+        return _encode_any, _decode_any
+    raise ValueError(f"No binary encoding for {field.__class__.__name__} fields")
+
+
+def _model_codec(model) -> Tuple[Encoder, Decoder]:
+    try:
+        return _codecs[model]
+    except KeyError:
+        pass
+
+    entries = []
+    for name, field in model_fields(model).items():
+        if isinstance(field, MultiField) and not isinstance(field, SeparatedFraction):
+            raise ValueError(f"No binary encoding for {field.__class__.__name__} fields")
+        components = tuple(field.components()) if isinstance(field, MultiField) else None
+        entries.append((name, components, bool(field['optional'])) + _field_codec(field))
+    entries = tuple(entries)
+    bitmap_size = (sum(1 for _e in entries if _e[2]) + 7) // 8
+
+    def _encode_model(data, out):
+        values = []
+        bits = 0
+        bit = 1
+        for name, components, optional, encode, _ in entries:
+            if components:
+                value = tuple(data.get(_c) for _c in components)
+                if None in value:
+                    value = None
+            else:
+                value = data.get(name)
+            if optional:
+                if value is not None:
+                    bits |= bit
+                bit <<= 1
+            values.append(value)
+
+        if bitmap_size:
+            out += bits.to_bytes(bitmap_size, 'little')
+        for (_, _, optional, encode, _), value in zip(entries, values):
+            if value is not None or not optional:
+                encode(value, out)
+
+    def _decode_model(buf, pos):
+        data = {}
+        bits = 0
+        if bitmap_size:
+            bits = int.from_bytes(buf[pos:pos + bitmap_size], 'little')
+            pos += bitmap_size
+        bit = 1
+        for name, components, optional, _, decode in entries:
+            if optional:
+                present = bits & bit
+                bit <<= 1
+                if not present:
+                    continue
+            value, pos = decode(buf, pos)
+            if components:
+                data.update(zip(components, value))
+            else:
+                data[name] = value
+        return data, pos
+
+    codec = _codecs[model] = (_encode_model, _decode_model)
+    return codec
+
+
+def encode(obj) -> bytes:
+    """Encode a model instance."""
+    out = bytearray()
+    _model_codec(type(obj))[0](obj._data, out)
+    return bytes(out)
+
+
+def decode(model, buf, trusted: bool = False):
+    """Decode an instance of a model from an encoded buffer.
+
+    The decoded data is checked with the model constructor, since the buffer
+    may not hold a valid instance. The encoding carries the types of every
+    field, so if the buffer is known to come from `encode` pass `trusted=True`
+    to rebuild the model without casting or checking its fields again.
+    """
+    buf = memoryview(buf)
+    try:
+        data, pos = _model_codec(model)[1](buf, 0)
+    except (IndexError, struct.error, UnicodeDecodeError) as error:
+        raise ValueError(f"Invalid encoding of {model.__name__}: {error}")
+    if pos != len(buf):
+        raise ValueError(f"Unexpected data after encoded {model.__name__}")
+    if trusted:
+        return load_trusted(model, data)
+    return model(data)
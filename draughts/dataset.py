@@ -0,0 +1,202 @@
+"""Random access to the records of a JSON lines file through a sidecar offset index.
+
+The index holds the byte offset of every record in the data file and,
+optionally, the value of one field of each record so records can be found
+by key. The data file is memory mapped, only the records asked for are read
+and constructed.
+"""
+import array
+import json
+import mmap
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .path import resolve, fans_out, getter
+from .fields import Compound, ListTypes, MappingTypes
+
+INDEX_SUFFIX = '.idx'
+_VERSION = 1
+
+
+def _write_offsets(offsets: array.array, out):
+    if sys.byteorder != 'little':
+        offsets = array.array('q', offsets)
+        offsets.byteswap()
+    out.write(offsets.tobytes())
+
+
+def _read_offsets(data: bytes) -> array.array:
+    offsets = array.array('q')
+    offsets.frombytes(data)
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    return offsets
+
+
+def _stamp(path: str) -> Dict[str, int]:
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+
+
+def _key_getter(model, key: str):
+    """Check a key path selects a single hashable value, and compile it."""
+    steps, field = resolve(model, key)
+    if fans_out(steps):
+        raise ValueError(f"Key path {key} can select more than one value")
+    if isinstance(field, ListTypes + MappingTypes + (Compound,)):
+        raise ValueError(f"Key path {key} names a {type(field).__name__} field, keys must be single values")
+    return getter(model, key)
+
+
+def build_index(path: str, model=None, key: Optional[str] = None, index_path: Optional[str] = None) -> str:
+    """Index the records of a JSON lines file in one pass, returning the path of the index.
+
+    Blank lines are skipped. When a key path is given the model is needed to
+    check it, every record must have a unique value at that path. Keys are
+    taken from the file as written, before any casting by the model.
+    """
+    index_path = index_path or path + INDEX_SUFFIX
+    get_key = None
+    if key is not None:
+        if model is None:
+            raise ValueError("A model is required to index records by key")
+        get_key = _key_getter(model, key)
+
+    offsets = array.array('q')
+    keys: List[Any] = []
+    seen = set()
+    position = 0
+    stamp = _stamp(path)
+    with open(path, 'rb') as handle:
+        for line in handle:
+            if line.strip():
+                offsets.append(position)
+                if get_key is not None:
+                    value = get_key(json.loads(line))
+                    if value is None:
+                        raise ValueError(f"Record {len(keys)} has no value for key {key}")
+                    try:
+                        duplicate = value in seen
+                    except TypeError:
+                        raise ValueError(f"Record {len(keys)} has an unhashable key {value!r} for {key}") from None
+                    if duplicate:
+                        raise ValueError(f"Duplicate key {value!r} for {key}")
+                    seen.add(value)
+                    keys.append(value)
+            position += len(line)
+    offsets.append(position)
+
+    header = dict(stamp, version=_VERSION, count=len(offsets) - 1, key=key)
+    temporary = index_path + '.tmp'
+    with open(temporary, 'wb') as out:
+        out.write(json.dumps(header).encode() + b'\n')
+        _write_offsets(offsets, out)
+        if key is not None:
+            out.write(json.dumps(keys).encode())
+    os.replace(temporary, index_path)
+    return index_path
+
+
+def _load_index(path: str, index_path: str, key: Optional[str]):
+    """Read an index, or return None if it is missing or doesn't match the data file."""
+    try:
+        with open(index_path, 'rb') as handle:
+            header = json.loads(handle.readline())
+            if header.get('version') != _VERSION or header.get('key') != key:
+                return None
+            if {'size': header.get('size'), 'mtime': header.get('mtime')} != _stamp(path):
+                return None
+            offsets = _read_offsets(handle.read((header['count'] + 1) * 8))
+            keys = json.loads(handle.read()) if key is not None else None
+    except (OSError, ValueError, KeyError):
+        return None
+    if len(offsets) != header['count'] + 1 or (keys is not None and len(keys) != header['count']):
+        return None
+    return offsets, keys
+
+
+class Dataset:
+    """Read records of a model from a JSON lines file by position or by key.
+
+    The index is loaded from the sidecar file (by default the data path with
+    `.idx` appended), it is rebuilt if it is missing or the data file has
+    changed since it was written.
+    """
+    def __init__(self, path: str, model, key: Optional[str] = None, index_path: Optional[str] = None):
+        self.path = path
+        self.model = model
+        self.key = key
+        if key is not None:
+            _key_getter(model, key)
+        index_path = index_path or path + INDEX_SUFFIX
+        loaded = _load_index(path, index_path, key)
+        if loaded is None:
+            build_index(path, model, key, index_path)
+            loaded = _load_index(path, index_path, key)
+        self._offsets, keys = loaded
+        self._positions: Optional[Dict[Any, int]] = None
+        if keys is not None:
+            self._positions = {_k: _i for _i, _k in enumerate(keys)}
+
+        self._file = open(path, 'rb')
+        # Empty files can't be mapped, but have no records to read either
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if len(self) else None
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def _load(self, position: int):
+        return self.model(json.loads(self._map[self._offsets[position]:self._offsets[position + 1]]))
+
+    def __getitem__(self, position: int):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(f"Record {position} out of range")
+        return self._load(position)
+
+    def __iter__(self) -> Iterator:
+        for position in range(len(self)):
+            yield self._load(position)
+
+    def _position_map(self) -> Dict[Any, int]:
+        if self._positions is None:
+            raise ValueError(f"Dataset {self.path} isn't indexed by key")
+        return self._positions
+
+    def __contains__(self, key) -> bool:
+        return key in self._position_map()
+
+    def get(self, key, default=None):
+        """Get the record with a key, or the default if there isn't one."""
+        position = self._position_map().get(key)
+        if position is None:
+            return default
+        return self._load(position)
+
+    def get_many(self, keys: Iterable) -> Iterator:
+        """Get the records for several keys, in file order, skipping keys that aren't found."""
+        positions = self._position_map()
+        found = sorted(positions[_k] for _k in keys if _k in positions)
+        for position in found:
+            yield self._load(position)
+
+    def keys(self):
+        return self._position_map().keys()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def open_dataset(path: str, model, key: Optional[str] = None, index_path: Optional[str] = None) -> Dataset:
+    """Open a JSON lines file of a model for random access, building its index if needed."""
+    return Dataset(path, model, key, index_path)
@@ -1,5 +1,5 @@
 from .basic import Boolean, Integer, Float, Timestamp, Enum, Bytes
-from .basic import String, Keyword, Text, JSON, UUID, DateString, SeparatedFraction
+from .basic import String, Keyword, Text, JSON, JSONValue, UUID, DateString, DateValue, date_key, SeparatedFraction
 from .basic import Any
 from .pattern import PatternString, MD5, SHA256, PhoneNumber, MACAddress, PrivateIP, SSDeepHash, IP, \
     Domain, Email, SHA1, URI, URIPath
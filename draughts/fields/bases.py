@@ -33,6 +33,10 @@ class MultivaluedField(Field):
     def sample(self):
         raise NotImplementedError()
 
+    def wrap(self, value):
+        """Rebuild the typed container for a value that has already been cast by this field."""
+        raise NotImplementedError()
+
     def flat_fields(self, prefix):
         raise NotImplementedError()
 
@@ -60,6 +64,20 @@ class ProxyField(Field):
         """
         raise NotImplementedError()
 
+    def cast_data(self, value):
+        """Cast a value for this field, returning only the underlying data object.
+
+        Fields can override this to avoid building a proxy object nobody will use.
+        """
+        return self.cast(value)[1]
+
+    def wrap(self, data):
+        """Build the proxy object over data that has already been cast by this field.
+
+        Unlike cast, nothing is checked or converted, only the proxy objects are rebuilt.
+        """
+        raise NotImplementedError()
+
     def sample(self):
         raise NotImplementedError()
 
@@ -67,6 +85,11 @@ class ProxyField(Field):
         raise NotImplementedError()
 
 
+class _Pending(tuple):
+    """The values a lazy multi field has been given but not yet built into its value."""
+    __slots__ = ()
+
+
 class MultiField(Field):
     """A field that actually represents several hidden entries in the model.
 
@@ -99,6 +122,13 @@ class MultiField(Field):
         """Return an (ideally random) object that would be appropriate as an argument to cast."""
         raise NotImplementedError()
 
+    # Lazy fields return a _Pending from proxy, which materialize turns into the value the first time it is read
+    lazy = False
+
+    def materialize(self, pending: '_Pending'):
+        """Build the value of a lazy field from the _Pending returned by proxy."""
+        raise NotImplementedError()
+
     def components(self):
         """Return the keys for the components.
 
@@ -1,6 +1,8 @@
 import sys
 import fractions
 import json
+import math
+import re
 import uuid
 import random
 import string
@@ -9,15 +11,39 @@ from typing import Sequence
 import arrow
 from datetime import datetime, timezone
 
-from .bases import Field, MultiField
+from .bases import Field, MultiField, _Pending
 
 
 if sys.version_info < (3, 7):
-    def check_iso(value):
-        return arrow.get(value).isoformat()
+    def parse_iso(value):
+        return arrow.get(value).datetime
 else:
-    def check_iso(value):
-        return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).isoformat()
+    def parse_iso(value):
+        return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def check_iso(value):
+    return parse_iso(value).isoformat()
+
+
+# Dates exactly as check_iso writes them, limited to days that are valid in every month
+_canonical_iso = re.compile(r'(?!0000)\d{4}-(0[1-9]|1[0-2])-(0[1-9]|1\d|2[0-8])T([01]\d|2[0-3]):[0-5]\d:[0-5]\d'
+                            r'(\.(?!000000)\d{6})?\+00:00').fullmatch
+
+
+if sys.version_info < (3, 8):
+    def readonly(view):
+        return view
+else:
+    def readonly(view):
+        return view if view.readonly else view.toreadonly()
+
+
+if sys.version_info < (3, 9):
+    def randbytes(length):
+        return random.getrandbits(length * 8).to_bytes(length, 'little') if length else b''
+else:
+    randbytes = random.randbytes
 
 
 class Any(Field):
@@ -30,6 +56,8 @@ class Any(Field):
 
 class Boolean(Field):
     def cast(self, value):
+        if type(value) is bool:
+            return value
         if isinstance(value, str):
             if value[0:5].lower() == 'false':
                 return False
@@ -41,6 +69,8 @@ class Boolean(Field):
 
 class Integer(Field):
     def cast(self, value):
+        if type(value) is int:
+            return value
         return int(value)
 
     def sample(self):
@@ -49,6 +79,8 @@ class Integer(Field):
 
 class Float(Field):
     def cast(self, value):
+        if type(value) is float:
+            return value
         return float(value)
 
     def sample(self):
@@ -58,22 +90,42 @@ class Float(Field):
 class SeparatedFraction(MultiField):
     """Store a fraction as two values.
 
-    Most
+    The numerator and denominator are kept in lowest terms, the `Fraction`
+    itself is only built when the field is first read.
     """
+    lazy = True
+
     def cast(self, value) -> Sequence:
+        if type(value) is int:
+            return value, 1
         if isinstance(value, fractions.Fraction):
-            pass
-        elif isinstance(value, (tuple, list)):
+            return value.numerator, value.denominator
+        if isinstance(value, (tuple, list)):
+            if len(value) == 2 and type(value[0]) is int and type(value[1]) is int:
+                return value[0], value[1]
             value = fractions.Fraction(*value)
         else:
             value = fractions.Fraction(value)
         return value.numerator, value.denominator
 
     def proxy(self, parent, values):
-        fraction = fractions.Fraction(*values)
-        parent[self.name + '_numerator'] = fraction.numerator
-        parent[self.name + '_denominator'] = fraction.denominator
-        return fraction
+        numerator, denominator = values
+        if type(numerator) is int and type(denominator) is int and denominator:
+            divisor = math.gcd(numerator, denominator)
+            if denominator < 0:
+                divisor = -divisor
+            if divisor != 1:
+                numerator //= divisor
+                denominator //= divisor
+        else:
+            fraction = fractions.Fraction(numerator, denominator)
+            numerator, denominator = fraction.numerator, fraction.denominator
+        parent[self.name + '_numerator'] = numerator
+        parent[self.name + '_denominator'] = denominator
+        return _Pending((numerator, denominator))
+
+    def materialize(self, pending):
+        return fractions.Fraction(*pending)
 
     def sample(self):
         return fractions.Fraction(random.randint(-1000000, 100000), random.randint(0, 100000))
@@ -87,6 +139,8 @@ class SeparatedFraction(MultiField):
 
 class String(Field):
     def cast(self, value):
+        if type(value) is str:
+            return value
         if isinstance(value, bytes):
             return value.decode()
         return str(value)
@@ -97,18 +151,67 @@ class String(Field):
 
 
 class Bytes(Field):
+    """A field storing binary data.
+
+    With `copy=False` any object supporting the buffer protocol (bytearray,
+    memoryview, mmap, etc.) is stored as a memoryview over its memory rather
+    than being copied into a new bytes object. On Python 3.8 and later the view
+    is read only, earlier versions can't make one so a view of a writable
+    buffer can still be written through.
+
+    The view pins the source buffer for as long as the model holds it: a
+    bytearray can't be resized and closing an mmap raises BufferError until
+    the value is replaced or the model released. Pickling or deep copying the
+    model stores a bytes copy of the view. Like bytes, views can't be written
+    by `dumps`, leave the field out with `exclude` to encode the rest.
+    """
+    def __init__(self, copy=True, **kwargs):
+        super().__init__(**kwargs)
+        self.copy = copy
+
     def cast(self, value):
         if isinstance(value, str):
             return value.encode()
-        return bytes(value)
+        if self.copy:
+            return bytes(value)
+        try:
+            view = memoryview(value)
+        except TypeError:
+            raise ValueError(f"Expected a bytes like object not {type(value).__name__}")
+        if view.ndim != 1 or view.format != 'B':
+            view = view.cast('B')
+        return readonly(view)
 
     def sample(self):
-        length = random.randint(0, 2**18)
-        return bytes(random.getrandbits(8) for _ in range(length))
+        return randbytes(random.randint(0, 2**18))
 
 
 class Keyword(String):
-    """A short string with symbolic value."""
+    """A short string with symbolic value.
+
+    Keywords often take only a few distinct values, so they can be interned
+    to share one string object between every record holding the same value.
+    Pass `intern=True` to use `sys.intern`, or an integer to intern at most
+    that many distinct values in a table kept by the field.
+    """
+    def __init__(self, intern=False, **kwargs):
+        super().__init__(**kwargs)
+        self.intern = intern
+        self.intern_table = {}
+
+    def cast(self, value):
+        value = super().cast(value)
+        if not self.intern:
+            return value
+        if self.intern is True:
+            return sys.intern(value)
+        try:
+            return self.intern_table[value]
+        except KeyError:
+            if len(self.intern_table) < self.intern:
+                self.intern_table[value] = value
+            return value
+
     def sample(self):
         length = random.randint(0, 128)
         return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
@@ -133,9 +236,57 @@ class Timestamp(Float):
     pass
 
 
+class DateValue(str):
+    """An ISO date string that keeps the datetime it was parsed from, and its epoch time."""
+    def __new__(cls, text, parsed: datetime):
+        self = super().__new__(cls, text)
+        self.datetime = parsed
+        self.epoch = parsed.timestamp()
+        return self
+
+    def __reduce__(self):
+        return DateValue, (str(self), self.datetime)
+
+    # Order by the instant rather than the text, so dates written with different offsets sort correctly
+    def __lt__(self, other):
+        if isinstance(other, DateValue):
+            return self.epoch < other.epoch
+        return str.__lt__(self, other)
+
+    def __le__(self, other):
+        if isinstance(other, DateValue):
+            return self.epoch <= other.epoch
+        return str.__le__(self, other)
+
+    def __gt__(self, other):
+        if isinstance(other, DateValue):
+            return self.epoch > other.epoch
+        return str.__gt__(self, other)
+
+    def __ge__(self, other):
+        if isinstance(other, DateValue):
+            return self.epoch >= other.epoch
+        return str.__ge__(self, other)
+
+
 class DateString(String):
-    """A field storing date."""
+    """A field storing date.
+
+    With `parsed=True` values are stored as `DateValue` strings, which keep
+    the parsed `datetime` and epoch time so they never need parsing again.
+    """
+    def __init__(self, parsed=False, **kwargs):
+        super().__init__(**kwargs)
+        self.parsed = parsed
+
     def cast(self, value):
+        if self.parsed:
+            if isinstance(value, DateValue):
+                return value
+            return self._cast_parsed(value)
+
+        if type(value) is str and _canonical_iso(value):
+            return value
         if value == "NOW":
             return datetime.utcnow().isoformat()
 
@@ -144,20 +295,50 @@ class DateString(String):
         except (TypeError, ValueError):
             return arrow.get(value).isoformat()
 
+    def _cast_parsed(self, value):
+        if value == "NOW":
+            now = datetime.utcnow()
+            return DateValue(now.isoformat(), now.replace(tzinfo=timezone.utc))
+
+        try:
+            parsed = parse_iso(value)
+        except (TypeError, ValueError):
+            parsed = arrow.get(value).datetime
+        return DateValue(parsed.isoformat(), parsed)
+
     def sample(self):
+        if self.parsed:
+            return self.cast('2020-03-20T14:28:23.382748')
         return '2020-03-20T14:28:23.382748'
 
 
+_parsed_dates = DateString(parsed=True)
+
+
+def date_key(value) -> float:
+    """Sort key for dates, the epoch time of a DateValue or of a date string parsed as DateString would."""
+    try:
+        return value.epoch
+    except AttributeError:
+        return _parsed_dates.cast(value).epoch
+
+
 class Enum(Field):
-    """A field for enum values."""
-    def __init__(self, enum, **kwargs):
+    """A field for enum values.
+
+    By default the enum members are stored, with `store_value=True` the
+    value of the member is stored instead.
+    """
+    def __init__(self, enum, store_value=False, **kwargs):
         super().__init__(**kwargs)
         self.enum = enum
+        self.store_value = store_value
         self.conversion = {}
         for val in self.enum:
-            self.conversion[val.value] = val
-            self.conversion[val.name] = val
-            self.conversion[val] = val
+            stored = val.value if store_value else val
+            self.conversion[val.value] = stored
+            self.conversion[val.name] = stored
+            self.conversion[val] = stored
 
     def sample(self):
         return random.choice(list(self.conversion.values()))
@@ -169,21 +350,61 @@ class Enum(Field):
             raise ValueError(f"Not an accepted enum value {value}")
 
 
+_unparsed = object()
+
+
+class JSONValue(str):
+    """JSON text that keeps the object it encodes, parsing the text on first use if it wasn't given.
+
+    The parsed object is shared rather than copied, changing it doesn't change the text.
+    """
+    def __new__(cls, text, value=_unparsed):
+        self = super().__new__(cls, text)
+        self._value = value
+        return self
+
+    @property
+    def value(self):
+        if self._value is _unparsed:
+            self._value = json.loads(self)
+        return self._value
+
+    def __reduce__(self):
+        return JSONValue, (str(self),)
+
+
 class JSON(String):
-    """A string field that checks that its content is always valid JSON"""
-    def __init__(self, **kwargs):
+    """A string field that checks that its content is always valid JSON
+
+    With `parsed=True` values are stored as `JSONValue` strings, which keep
+    the object decoded while checking them as `.value`. Objects that are
+    already decoded are accepted too, they are encoded to get their text.
+    """
+    def __init__(self, parsed=False, **kwargs):
         super().__init__(**kwargs)
+        self.parsed = parsed
 
     def cast(self, value):
+        if self.parsed:
+            if isinstance(value, JSONValue):
+                return value
+            if isinstance(value, (str, bytes)):
+                text = super().cast(value)
+                return JSONValue(text, json.loads(text))
+            return JSONValue(json.dumps(value), value)
+
         value = super().cast(value)
         json.loads(value)
         return value
 
     def sample(self):
-        return random.choice([
+        value = random.choice([
             '{}',
             '[]',
             '0',
             '"abc"',
             'null',
         ])
+        if self.parsed:
+            return self.cast(value)
+        return value
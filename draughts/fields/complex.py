@@ -1,5 +1,6 @@
 import string
 import random
+import weakref
 from typing import Tuple, Any
 
 from .bases import ProxyField, Field, MultivaluedField
@@ -10,6 +11,14 @@ class Compound(ProxyField):
     def __init__(self, model, **kwargs):
         super().__init__(**kwargs)
         self.model = model
+        self._validate = None
+        self._load = None
+
+    def _bind(self):
+        # The model module imports the fields, so look up its loaders on first use
+        from ..model_decorator import _validators, _trusted
+        self._validate = _validators[self.model]
+        self._load = _trusted[self.model]
 
     def cast(self, value) -> Tuple[Any, Any]:
         if isinstance(value, self.model):
@@ -17,6 +26,18 @@ class Compound(ProxyField):
         obj = self.model(value)
         return obj, obj._data
 
+    def cast_data(self, value):
+        if isinstance(value, self.model):
+            return value._data
+        if self._validate is None:
+            self._bind()
+        return self._validate(value)
+
+    def wrap(self, data):
+        if self._load is None:
+            self._bind()
+        return self._load(data)
+
     def sample(self):
         from ..randomizer import sample
         return sample(self.model)
@@ -27,11 +48,17 @@ class Compound(ProxyField):
 
 
 class List(ProxyField):
-    def __init__(self, field: Field, **kwargs):
+    """A list of compound fields.
+
+    With `lazy=True` every item is still checked when the list is set, but
+    the view objects for items are only created when they are accessed.
+    """
+    def __init__(self, field: Field, lazy=False, **kwargs):
         super().__init__(**kwargs)
         assert isinstance(field, (MultivaluedField, ProxyField))
         self.field = field
-        self.proxy = _list_proxy(field.cast)
+        self.lazy = lazy
+        self.proxy = _list_proxy(field, lazy=lazy)
 
     def cast(self, value):
         # Only cast to list when we must to preserve structure of source document
@@ -42,6 +69,19 @@ class List(ProxyField):
         obj = self.proxy(value)
         return obj, obj._data
 
+    def cast_data(self, value):
+        if isinstance(value, self.proxy):
+            return value._data
+        if not isinstance(value, list):
+            value = list(value)
+        cast_data = self.field.cast_data
+        for index, item in enumerate(value):
+            value[index] = cast_data(item)
+        return value
+
+    def wrap(self, data):
+        return self.proxy.wrap(data)
+
     def sample(self):
         return self.proxy([self.field.sample() for _ in range(random.randint(0, 10))])
 
@@ -49,47 +89,113 @@ class List(ProxyField):
         return self.field.flat_fields(prefix + '[].')
 
 
-def _list_proxy(cast):
+def _cast_many(cast, values):
+    """Cast a batch of values for a proxy field, returning the views and data as two lists."""
+    views = []
+    data = []
+    add_view = views.append
+    add_data = data.append
+    for value in values:
+        view, _d = cast(value)
+        add_view(view)
+        add_data(_d)
+    return views, data
+
+
+def _sort_order(views, key, reverse):
+    """Get the order of positions that sorts a list of views."""
+    if key is None:
+        return sorted(range(len(views)), key=views.__getitem__, reverse=reverse)
+    return sorted(range(len(views)), key=lambda _i: key(views[_i]), reverse=reverse)
+
+
+def _list_proxy(child: ProxyField, frozen=False, lazy=False):
+    cast = child.cast
+    cast_data = child.cast_data
+    wrap = child.wrap
+
     class ListProxy:
-        __slots__ = ['_data', '_view']
+        __slots__ = ['_data', '_view', '_memo', '__weakref__']
 
         """A proxy object over a list to enforce typing."""
 
         def __init__(self, data):
             self._view = []
             self._data = data
+            self._memo = None
             for index, _d in enumerate(data):
                 _v, self._data[index] = cast(_d)
                 self._view.append(_v)
 
+        @classmethod
+        def wrap(cls, data):
+            self = cls.__new__(cls)
+            self._data = data
+            self._view = [wrap(_d) for _d in data]
+            self._memo = None
+            return self
+
         def append(self, item):
+            self._memo = None
             view, data = cast(item)
             self._view.append(view)
             self._data.append(data)
 
         def extend(self, iterable):
-            _t = [cast(_o) for _o in iterable]
-            self._view.extend((_r[0] for _r in _t))
-            self._data.extend((_r[1] for _r in _t))
+            self._memo = None
+            views, data = _cast_many(cast, iterable)
+            self._view.extend(views)
+            self._data.extend(data)
 
         def insert(self, index, item):
+            self._memo = None
             v, d = cast(item)
             self._view.insert(index, v)
             self._data.insert(index, d)
 
+        def pop(self, index=-1):
+            self._memo = None
+            self._data.pop(index)
+            return self._view.pop(index)
+
+        def remove(self, item):
+            del self[self._data.index(cast_data(item))]
+
+        def clear(self):
+            self._memo = None
+            self._view.clear()
+            self._data.clear()
+
+        def reverse(self):
+            self._memo = None
+            self._view.reverse()
+            self._data.reverse()
+
+        def sort(self, key=None, reverse=False):
+            self._memo = None
+            order = _sort_order(self._view, key, reverse)
+            self._view[:] = [self._view[_i] for _i in order]
+            self._data[:] = [self._data[_i] for _i in order]
+
         def __len__(self):
             return len(self._data)
 
         def __setitem__(self, key, value):
+            self._memo = None
             if isinstance(key, slice):
-                view = [cast(_o) for _o in value]
-                self._view[key] = [_v[0] for _v in view]
-                self._data[key] = [_v[1] for _v in view]
+                views, data = _cast_many(cast, value)
+                self._view[key] = views
+                self._data[key] = data
             else:
                 view, data = cast(value)
                 self._view[key] = view
                 self._data[key] = data
 
+        def __delitem__(self, key):
+            self._memo = None
+            del self._view[key]
+            del self._data[key]
+
         def __iadd__(self, other):
             self.extend(other)
             return self
@@ -100,14 +206,125 @@ def _list_proxy(cast):
         def __eq__(self, other):
             return self._data == other._data
 
-    return ListProxy
+    class LazyListProxy:
+        """A proxy object over a list to enforce typing that creates item views on access.
+
+        Views are kept in a weak cache, an item keeps the same view for as long
+        as something else holds a reference to it.
+        """
+        __slots__ = ['_data', '_views', '__weakref__']
+
+        def __init__(self, data):
+            self._data = data
+            self._views = None
+            for index, _d in enumerate(data):
+                data[index] = cast_data(_d)
+
+        @classmethod
+        def wrap(cls, data):
+            self = cls.__new__(cls)
+            self._data = data
+            self._views = None
+            return self
+
+        def _view_of(self, data):
+            if self._views is None:
+                self._views = weakref.WeakValueDictionary()
+            view = self._views.get(id(data))
+            if view is None or view._data is not data:
+                view = self._views[id(data)] = wrap(data)
+            return view
+
+        def _keep(self, view, data):
+            if self._views is None:
+                self._views = weakref.WeakValueDictionary()
+            self._views[id(data)] = view
+            return data
+
+        def append(self, item):
+            self._data.append(self._keep(*cast(item)))
+
+        def extend(self, iterable):
+            self._data.extend([cast_data(_o) for _o in iterable])
+
+        def insert(self, index, item):
+            self._data.insert(index, self._keep(*cast(item)))
+
+        def pop(self, index=-1):
+            return self._view_of(self._data.pop(index))
+
+        def remove(self, item):
+            self._data.remove(cast_data(item))
+
+        def clear(self):
+            self._data.clear()
+
+        def reverse(self):
+            self._data.reverse()
+
+        def sort(self, key=None, reverse=False):
+            order = _sort_order(self[:], key, reverse)
+            self._data[:] = [self._data[_i] for _i in order]
+
+        def __len__(self):
+            return len(self._data)
+
+        def __setitem__(self, key, value):
+            if isinstance(key, slice):
+                self._data[key] = [cast_data(_o) for _o in value]
+            else:
+                self._data[key] = self._keep(*cast(value))
+
+        def __delitem__(self, key):
+            del self._data[key]
+
+        def __iadd__(self, other):
+            self.extend(other)
+            return self
+
+        def __getitem__(self, item):
+            if isinstance(item, slice):
+                return [self._view_of(_d) for _d in self._data[item]]
+            return self._view_of(self._data[item])
+
+        def __iter__(self):
+            for _d in self._data:
+                yield self._view_of(_d)
+
+        def __eq__(self, other):
+            return self._data == other._data
+
+    base = LazyListProxy if lazy else ListProxy
+
+    if frozen:
+        class FrozenListProxy(base):
+            """A read only proxy over a list."""
+            __slots__ = []
+
+            def _read_only(self, *args, **kwargs):
+                raise TypeError("Can't modify the list of a frozen model")
+
+            append = extend = insert = __setitem__ = __delitem__ = __iadd__ = _read_only
+            pop = remove = clear = reverse = sort = _read_only
+
+            def __hash__(self):
+                return hash(tuple(self))
+
+        return FrozenListProxy
+    return base
 
 
 class Mapping(ProxyField):
-    def __init__(self, field: ProxyField, **kwargs):
+    """A mapping of compound fields.
+
+    With `lazy=True` every item is still checked when the mapping is set, but
+    the view objects for items are only created when they are accessed.
+    """
+    def __init__(self, field: ProxyField, lazy=False, **kwargs):
         super().__init__(**kwargs)
         self.field = field
-        self.proxy = _mapping_proxy(field)
+        self.lazy = lazy
+        self.proxy = _mapping_proxy(field, lazy=lazy)
 
     def cast(self, value):
         if not isinstance(value, dict):
@@ -117,6 +334,19 @@ class Mapping(ProxyField):
         obj = self.proxy(value)
         return obj, obj._data
 
+    def cast_data(self, value):
+        if isinstance(value, self.proxy):
+            return value._data
+        if not isinstance(value, dict):
+            value = dict(value)
+        cast_data = self.field.cast_data
+        for key, item in value.items():
+            value[key] = cast_data(item)
+        return value
+
+    def wrap(self, data):
+        return self.proxy.wrap(data)
+
     def sample(self):
         return self.proxy({
             ''.join(random.choices(string.ascii_letters, k=10)): self.field.sample()
@@ -127,27 +357,44 @@ class Mapping(ProxyField):
         return self.field.flat_fields(prefix + '.*.')
 
 
-def _mapping_proxy(child: Field):
+def _mapping_proxy(child: ProxyField, frozen=False, lazy=False):
     cast = child.cast
+    cast_data = child.cast_data
+    wrap = child.wrap
 
     class MappingProxy:
         """A proxy object over a list to enforce typing."""
-        __slots__ = ['_data', '_view']
+        __slots__ = ['_data', '_view', '_memo', '__weakref__']
 
         def __init__(self, data):
             self._view = {}
             self._data = data
+            self._memo = None
             for _k, _o in data.items():
                 self._view[_k], self._data[_k] = cast(_o)
 
+        @classmethod
+        def wrap(cls, data):
+            self = cls.__new__(cls)
+            self._data = data
+            self._view = {_k: wrap(_o) for _k, _o in data.items()}
+            self._memo = None
+            return self
+
         def __iter__(self):
             return iter(self._view)
 
         def __setitem__(self, key, value):
+            self._memo = None
             view, data = cast(value)
             self._view[key] = view
             self._data[key] = data
 
+        def __delitem__(self, key):
+            self._memo = None
+            del self._data[key]
+            del self._view[key]
+
         def __contains__(self, item):
             return item in self._view
 
@@ -160,6 +407,42 @@ def _mapping_proxy(child: Field):
         def __eq__(self, other):
             return self._data == other._data
 
+        def get(self, key, default=None):
+            return self._view.get(key, default)
+
+        def update(self, *args, **kwargs):
+            self._memo = None
+            items = dict(*args, **kwargs)
+            views, data = _cast_many(cast, items.values())
+            self._view.update(zip(items, views))
+            self._data.update(zip(items, data))
+
+        def __ior__(self, other):
+            self.update(other)
+            return self
+
+        def setdefault(self, key, default=None):
+            if key not in self._data:
+                self[key] = default
+            return self._view[key]
+
+        def pop(self, key, *default):
+            self._memo = None
+            if key not in self._data and default:
+                return default[0]
+            del self._data[key]
+            return self._view.pop(key)
+
+        def popitem(self):
+            self._memo = None
+            key, _ = self._data.popitem()
+            return key, self._view.pop(key)
+
+        def clear(self):
+            self._memo = None
+            self._view.clear()
+            self._data.clear()
+
         def values(self):
             return self._view.values()
 
@@ -169,4 +452,115 @@ def _mapping_proxy(child: Field):
         def items(self):
             return self._view.items()
 
-    return MappingProxy
+    class LazyMappingProxy:
+        """A proxy object over a mapping to enforce typing that creates item views on access.
+
+        Views are kept in a weak cache, an item keeps the same view for as long
+        as something else holds a reference to it. The values and items methods
+        return iterators rather than views of the mapping.
+        """
+        __slots__ = ['_data', '_views', '__weakref__']
+
+        def __init__(self, data):
+            self._data = data
+            self._views = None
+            for _k, _o in data.items():
+                data[_k] = cast_data(_o)
+
+        @classmethod
+        def wrap(cls, data):
+            self = cls.__new__(cls)
+            self._data = data
+            self._views = None
+            return self
+
+        def _view_of(self, data):
+            if self._views is None:
+                self._views = weakref.WeakValueDictionary()
+            view = self._views.get(id(data))
+            if view is None or view._data is not data:
+                view = self._views[id(data)] = wrap(data)
+            return view
+
+        def __iter__(self):
+            return iter(self._data)
+
+        def __setitem__(self, key, value):
+            view, data = cast(value)
+            if self._views is None:
+                self._views = weakref.WeakValueDictionary()
+            self._views[id(data)] = view
+            self._data[key] = data
+
+        def __delitem__(self, key):
+            del self._data[key]
+
+        def __contains__(self, item):
+            return item in self._data
+
+        def __getitem__(self, item):
+            return self._view_of(self._data[item])
+
+        def __len__(self):
+            return len(self._data)
+
+        def __eq__(self, other):
+            return self._data == other._data
+
+        def get(self, key, default=None):
+            if key in self._data:
+                return self._view_of(self._data[key])
+            return default
+
+        def update(self, *args, **kwargs):
+            self._data.update({_k: cast_data(_v) for _k, _v in dict(*args, **kwargs).items()})
+
+        def __ior__(self, other):
+            self.update(other)
+            return self
+
+        def setdefault(self, key, default=None):
+            if key not in self._data:
+                self[key] = default
+            return self[key]
+
+        def pop(self, key, *default):
+            if key not in self._data and default:
+                return default[0]
+            return self._view_of(self._data.pop(key))
+
+        def popitem(self):
+            key, data = self._data.popitem()
+            return key, self._view_of(data)
+
+        def clear(self):
+            self._data.clear()
+
+        def values(self):
+            for _d in self._data.values():
+                yield self._view_of(_d)
+
+        def keys(self):
+            return self._data.keys()
+
+        def items(self):
+            for _k, _d in self._data.items():
+                yield _k, self._view_of(_d)
+
+    base = LazyMappingProxy if lazy else MappingProxy
+
+    if frozen:
+        class FrozenMappingProxy(base):
+            """A read only proxy over a mapping."""
+            __slots__ = []
+
+            def _read_only(self, *args, **kwargs):
+                raise TypeError("Can't modify the mapping of a frozen model")
+
+            __setitem__ = __delitem__ = update = __ior__ = setdefault = pop = popitem = clear = _read_only
+
+            def __hash__(self):
+                return hash(frozenset(self.items()))
+
+        return FrozenMappingProxy
+    return base
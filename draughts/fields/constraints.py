@@ -0,0 +1,109 @@
+"""Compile the cast of a field, its optional handling and its constraints into one function.
+
+Constraints are declared as field metadata:
+
+    min, max:                 Bounds (inclusive) on the cast value.
+    min_length, max_length:   Bounds (inclusive) on the length of the cast value.
+    choices:                  A collection of the only values allowed.
+
+For the basic field types the conversion itself is written into the
+generated function as well, so casting a value is a single call.
+"""
+from typing import Callable, Dict, List
+
+from .bases import Field
+from .basic import Boolean, Integer, Float, String, Keyword, Bytes
+from .pattern import PatternString
+
+CONSTRAINTS = ('min', 'max', 'min_length', 'max_length', 'choices')
+
+_conversions = {
+    Integer.cast: ["if type(value) is not int:", "    value = int(value)"],
+    Float.cast: ["if type(value) is not float:", "    value = float(value)"],
+    Boolean.cast: [
+        "if type(value) is not bool:",
+        "    value = not (isinstance(value, str) and value[0:5].lower() == 'false') and bool(value)",
+    ],
+    String.cast: [
+        "if type(value) is not str:",
+        "    value = value.decode() if isinstance(value, bytes) else str(value)",
+    ],
+}
+
+
+def _conversion(field: Field, base: Callable, namespace: Dict) -> List[str]:
+    """Source for converting `value` to the type of a field, inline where the field's cast is a known one."""
+    method = type(field).cast
+    if method is Keyword.cast and not field.intern:
+        method = String.cast
+    if method is PatternString.cast:
+        namespace['_pattern'] = field.pattern.fullmatch
+        return _conversions[String.cast] + [
+            "if not _pattern(value):",
+            f"    raise ValueError(f'Illegal value for {type(field).__name__} {{value}}')",
+        ]
+    if base == method.__get__(field) and method in _conversions:
+        return _conversions[method]
+    namespace['_cast'] = base
+    return ["value = _cast(value)"]
+
+
+def _length_units(field: Field) -> str:
+    """What the length of a value of the field counts, for error messages."""
+    if isinstance(field, String):
+        return 'characters'
+    if isinstance(field, Bytes):
+        return 'bytes'
+    return 'items'
+
+
+def compile_cast(field: Field) -> Callable:
+    """Build the cast function a model uses for a field.
+
+    Compiling a field that was already compiled starts again from the cast it had before.
+    """
+    base = getattr(field.cast, '__wrapped__', field.cast)
+    metadata = field.metadata
+    namespace = {}
+    lines = []
+
+    if metadata.get('optional', False):
+        lines += ["if value is None:", "    return None"]
+    lines += _conversion(field, base, namespace)
+
+    label = field.name or type(field).__name__
+    if metadata.get('min') is not None:
+        namespace['_min'] = metadata['min']
+        lines += ["if value < _min:", f"    raise ValueError(f'{label} must be at least {{_min!r}}, not {{value!r}}')"]
+    if metadata.get('max') is not None:
+        namespace['_max'] = metadata['max']
+        lines += ["if value > _max:", f"    raise ValueError(f'{label} must be at most {{_max!r}}, not {{value!r}}')"]
+    units = _length_units(field)
+    if metadata.get('min_length') is not None:
+        namespace['_min_length'] = metadata['min_length']
+        lines += ["if len(value) < _min_length:",
+                  f"    raise ValueError(f'{label} must have at least {{_min_length}} {units}, not {{len(value)}}')"]
+    if metadata.get('max_length') is not None:
+        namespace['_max_length'] = metadata['max_length']
+        lines += ["if len(value) > _max_length:",
+                  f"    raise ValueError(f'{label} must have at most {{_max_length}} {units}, not {{len(value)}}')"]
+    if metadata.get('choices') is not None:
+        choices = metadata['choices']
+        try:
+            choices = frozenset(choices)
+        except TypeError:
+            choices = tuple(choices)
+        namespace['_choices'] = choices
+        lines += ["if value not in _choices:",
+                  f"    raise ValueError(f'{label} must be one of {{sorted(map(repr, _choices))}}, not {{value!r}}')"]
+
+    if lines == ["value = _cast(value)"]:
+        return base
+
+    source = "def cast(value):\n" + "".join(f"    {_l}\n" for _l in lines) + "    return value\n"
+    exec(compile(source, f"<cast {label}>", 'exec'), namespace)
+    cast = namespace['cast']
+    cast.__wrapped__ = base
+    # Whether the cast checks more than the conversion, so a packed list has to run it on every value
+    cast.checks = len(lines) > len(_conversions.get(type(field).cast, ()))
+    return cast
@@ -1,75 +1,360 @@
+import array
 import string
 import random
 
 from .bases import MultivaluedField, Field
+from .basic import Integer, Float
 
 
 class TypedList(list):
-    def __init__(self, data, cast):
+    """A list that casts every value put into it.
+
+    Bulk operations cast the whole batch before changing the list, so a bad
+    value leaves the list as it was.
+    """
+    def __init__(self, data, cast, trusted=False):
+        self.__cast = cast
+        self._memo = None
+        if trusted:
+            super().__init__(data)
+        else:
+            super().__init__(map(cast, data))
+
+    def __reduce__(self):
+        # Ship only the values, the owning model restores the typing on load
+        return list, (list(self),)
+
+    def append(self, item):
+        self._memo = None
+        super().append(self.__cast(item))
+
+    def extend(self, iterable):
+        self._memo = None
+        super().extend(list(map(self.__cast, iterable)))
+
+    def insert(self, index, item):
+        self._memo = None
+        super().insert(index, self.__cast(item))
+
+    def __setitem__(self, key, value):
+        self._memo = None
+        if isinstance(key, slice):
+            super().__setitem__(key, list(map(self.__cast, value)))
+        else:
+            super().__setitem__(key, self.__cast(value))
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, other):
+        self._memo = None
+        return super().__imul__(other)
+
+    def __delitem__(self, key):
+        self._memo = None
+        super().__delitem__(key)
+
+    def pop(self, index=-1):
+        self._memo = None
+        return super().pop(index)
+
+    def remove(self, item):
+        self._memo = None
+        super().remove(item)
+
+    def clear(self):
+        self._memo = None
+        super().clear()
+
+    def reverse(self):
+        self._memo = None
+        super().reverse()
+
+    def sort(self, key=None, reverse=False):
+        self._memo = None
+        super().sort(key=key, reverse=reverse)
+
+
+class FrozenTypedList(TypedList):
+    """A read only typed list."""
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Can't modify the list of a frozen model")
+
+    append = extend = insert = __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    pop = remove = clear = sort = reverse = _read_only
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+
+def _exact(cast) -> bool:
+    """Whether cast is just the conversion of an Integer or Float, which an array makes as well."""
+    base = getattr(cast, '__wrapped__', cast)
+    return getattr(base, '__func__', None) in (Integer.cast, Float.cast) and not getattr(cast, 'checks', False)
+
+
+def _pack(typecode, data, cast, exact=True):
+    """Build an array from data.
+
+    When exact, values are only cast if the array won't accept them as they
+    are, otherwise every value is cast first.
+    """
+    if not isinstance(data, (list, tuple, array.array)):
+        data = list(data)
+    try:
+        if exact:
+            try:
+                return array.array(typecode, data)
+            except TypeError:
+                pass
+        return array.array(typecode, [cast(_v) for _v in data])
+    except OverflowError as error:
+        raise ValueError(f"Value out of range for a packed list: {error}")
+
+
+class TypedArray(array.array):
+    """A typed list stored in an array, subclasses choose the array type with TYPECODE."""
+    TYPECODE = ''
+
+    def __new__(cls, data, cast, trusted=False):
+        if trusted:
+            return super().__new__(cls, cls.TYPECODE, data)
+        return super().__new__(cls, cls.TYPECODE, _pack(cls.TYPECODE, data, cast, _exact(cast)))
+
+    def __init__(self, data, cast, trusted=False):
+        super().__init__()
         self.__cast = cast
-        super().__init__(cast(_r) for _r in data)
+        self.__exact = _exact(cast)
+        self._memo = None
+
+    def __reduce_ex__(self, protocol):
+        return array.array(self.typecode, self).__reduce_ex__(protocol)
 
     def append(self, item):
+        self._memo = None
         super().append(self.__cast(item))
 
     def extend(self, iterable):
-        super().extend((self.__cast(_o) for _o in iterable))
+        self._memo = None
+        super().extend(_pack(self.typecode, iterable, self.__cast, self.__exact))
 
     def insert(self, index, item):
+        self._memo = None
         super().insert(index, self.__cast(item))
 
     def __setitem__(self, key, value):
+        self._memo = None
         if isinstance(key, slice):
-            super().__setitem__(key, (self.__cast(_o) for _o in value))
+            super().__setitem__(key, _pack(self.typecode, value, self.__cast, self.__exact))
         else:
             super().__setitem__(key, self.__cast(value))
 
     def __iadd__(self, other):
-        super().extend((self.__cast(_o) for _o in other))
+        self.extend(other)
         return self
 
+    def __imul__(self, other):
+        self._memo = None
+        return super().__imul__(other)
+
+    def __delitem__(self, key):
+        self._memo = None
+        super().__delitem__(key)
+
+    def pop(self, index=-1):
+        self._memo = None
+        return super().pop(index)
+
+    def remove(self, item):
+        self._memo = None
+        super().remove(item)
+
+    def reverse(self):
+        self._memo = None
+        super().reverse()
+
+    def frombytes(self, data):
+        self._memo = None
+        super().frombytes(data)
+
+    def fromlist(self, values):
+        self._memo = None
+        super().fromlist(values)
+
+    def byteswap(self):
+        self._memo = None
+        super().byteswap()
+
+    def __eq__(self, other):
+        if isinstance(other, list):
+            return self.tolist() == other
+        return super().__eq__(other)
+
+    __hash__ = None
+
+
+class IntegerArray(TypedArray):
+    TYPECODE = 'q'
+
+
+class FloatArray(TypedArray):
+    TYPECODE = 'd'
+
+
+class FrozenTypedArray(TypedArray):
+    """A read only typed array."""
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Can't modify the list of a frozen model")
+
+    append = extend = insert = __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    pop = remove = reverse = frombytes = fromlist = byteswap = _read_only
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+
+class FrozenIntegerArray(FrozenTypedArray, IntegerArray):
+    pass
+
+
+class FrozenFloatArray(FrozenTypedArray, FloatArray):
+    pass
+
 
 class SimpleList(MultivaluedField):
-    """A list of non-complex """
-    def __init__(self, field, **kwargs):
+    """A list of non-complex fields.
+
+    Lists of Integer or Float fields can be created with `packed=True` to
+    store the values in an `array.array` of 64 bit integers or doubles rather
+    than as individual python objects. Packed items can't be optional.
+    """
+    container = TypedList
+
+    def __init__(self, field, packed=False, **kwargs):
         super().__init__(**kwargs)
         self.field = field
+        self.packed = packed
+        if packed:
+            if isinstance(field, Integer):
+                self.container = IntegerArray
+            elif isinstance(field, Float):
+                self.container = FloatArray
+            else:
+                raise ValueError("Only lists of Integer or Float fields can be packed")
+            if field.metadata.get('optional', False):
+                raise ValueError("Packed lists can't hold optional values")
 
     def cast(self, value):
-        return TypedList(value, cast=self.field.cast)
+        return self.container(value, cast=self.field.cast)
+
+    def wrap(self, value):
+        if isinstance(value, self.container):
+            return value
+        if isinstance(self.field, MultivaluedField):
+            value = [self.field.wrap(_v) for _v in value]
+        return self.container(value, cast=self.field.cast, trusted=True)
 
     def sample(self):
-        return TypedList([self.field.sample() for _ in range(random.randint(0, 10))], cast=self.field.cast)
+        return self.container([self.field.sample() for _ in range(random.randint(0, 10))], cast=self.field.cast)
 
     def flat_fields(self, prefix):
         return {prefix + '[]': self.field}
 
 
 class TypedDict(dict):
-    def __init__(self, data, cast):
+    """A dict that casts every value put into it.
+
+    Bulk operations cast the whole batch before changing the dict, so a bad
+    value leaves the dict as it was.
+    """
+    def __init__(self, data, cast, trusted=False):
         self.__cast = cast
-        if isinstance(data, dict):
+        self._memo = None
+        if trusted:
+            super().__init__(data)
+        elif isinstance(data, dict):
             super().__init__({k: cast(v) for k, v in data.items()})
         else:
             super().__init__({k: cast(v) for k, v in data})
 
-    def setdefault(self, k, default=...):
-        super().setdefault(k, default=self.__cast(default))
+    def setdefault(self, key, default=None):
+        self._memo = None
+        if key not in self:
+            super().__setitem__(key, self.__cast(default))
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        self._memo = None
+        cast = self.__cast
+        super().update({_k: cast(_v) for _k, _v in dict(*args, **kwargs).items()})
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __delitem__(self, key):
+        self._memo = None
+        super().__delitem__(key)
+
+    def pop(self, key, *default):
+        self._memo = None
+        return super().pop(key, *default)
+
+    def popitem(self):
+        self._memo = None
+        return super().popitem()
+
+    def clear(self):
+        self._memo = None
+        super().clear()
 
     def __setitem__(self, key, value):
+        self._memo = None
         super().__setitem__(key, self.__cast(value))
 
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class FrozenTypedDict(TypedDict):
+    """A read only typed mapping."""
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Can't modify the mapping of a frozen model")
+
+    setdefault = __setitem__ = __delitem__ = update = __ior__ = pop = popitem = clear = _read_only
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+
+frozen_containers = {
+    TypedList: FrozenTypedList,
+    IntegerArray: FrozenIntegerArray,
+    FloatArray: FrozenFloatArray,
+    TypedDict: FrozenTypedDict,
+}
+
 
 class SimpleMapping(MultivaluedField):
+    container = TypedDict
+
     def __init__(self, field: Field, **kwargs):
         super().__init__(**kwargs)
         self.field = field
 
     def cast(self, value):
-        return TypedDict(value, self.field.cast)
+        return self.container(value, self.field.cast)
+
+    def wrap(self, value):
+        if isinstance(value, self.container):
+            return value
+        if isinstance(self.field, MultivaluedField):
+            value = {_k: self.field.wrap(_v) for _k, _v in value.items()}
+        return self.container(value, self.field.cast, trusted=True)
 
     def sample(self):
-        return TypedDict({
+        return self.container({
             ''.join(random.choices(string.ascii_letters, k=10)): self.field.sample()
             for _ in range(random.randint(0, 10))
         }, self.field.cast)
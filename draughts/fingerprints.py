@@ -0,0 +1,225 @@
+"""Content fingerprints of models, for deduplication and cache keys.
+
+The fingerprint is a BLAKE2 digest of a canonical JSON encoding of the
+fields, taken in the order the model declares them, so it doesn't depend on
+the order of keys in the data. Keys that aren't fields of the model aren't
+included.
+
+Models are split into nodes that are hashed separately: the model itself,
+each list or mapping of compounds, and each compound that has lists or
+mappings of its own. A node encodes its plain values and the compounds
+without lists or mappings inline, and the other nodes below it by their
+digest. The digest of each node is kept in the memo of its view, which the
+field setters and container mutators drop, so taking the fingerprint again after a
+change only encodes the nodes from the change up to the root. Lazy lists and
+mappings, and models with `Any` fields or lists of lists, are encoded again
+every time.
+"""
+import array
+import base64
+import enum
+import hashlib
+import json
+import typing
+from typing import Dict, List, Tuple
+
+from .model_decorator import ClassCache, model_fields, memo
+from .fields import Any, Compound, CompoundList, CompoundMapping
+from .fields.bases import MultiField, MultivaluedField, ProxyField
+
+DIGEST_SIZE = 16
+
+_UNCACHED = object()
+
+_plans: Dict[type, Tuple] = typing.cast(Dict, ClassCache('plans'))
+
+
+def _default(value):
+    if isinstance(value, array.array):
+        return value.tolist()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {'$bytes': base64.b64encode(value).decode()}
+    raise TypeError(f"Can't fingerprint a value of type {value.__class__.__name__}")
+
+
+_encode = json.JSONEncoder(sort_keys=True, separators=(',', ':'), check_circular=False, default=_default).encode
+
+
+def _hash(value) -> bytes:
+    return hashlib.blake2b(_encode(value).encode(), digest_size=DIGEST_SIZE).digest()
+
+
+def _plan(cls):
+    """How a model is encoded: its plain values, typed containers, inline compounds and child nodes.
+
+    Inline compounds are listed with their own plan. The last entry says
+    whether the encoding can be kept, it can't when there are values whose
+    changes aren't tracked.
+    """
+    try:
+        return _plans[cls]
+    except KeyError:
+        pass
+    values = []
+    containers = []
+    inline = []
+    nodes = []
+    cacheable = True
+    for name, field in model_fields(cls).items():
+        if isinstance(field, MultiField):
+            values.extend(field.components())
+        elif _inline(field):
+            inline.append((name, _plan(field.model)))
+            cacheable &= _plan(field.model)[4]
+        elif isinstance(field, ProxyField):
+            nodes.append((name, field))
+        else:
+            values.append(name)
+            if isinstance(field, MultivaluedField):
+                containers.append(name)
+                cacheable &= not isinstance(field.field, (MultivaluedField, Any))
+            cacheable &= not isinstance(field, Any)
+    plan = _plans[cls] = (tuple(values), tuple(containers), tuple(inline), tuple(nodes), cacheable)
+    return plan
+
+
+def _inline(field) -> bool:
+    """If the values of a field are encoded inside the node holding them, rather than being nodes themselves."""
+    return isinstance(field, Compound) and not _plan(field.model)[3]
+
+
+def _values(plan, data: dict, views, deps: List, seen: List) -> List:
+    """The encoding of a model as a list.
+
+    When views are given they, and the typed containers in data, are added
+    to seen along with their memo so changes to them can be noticed.
+    """
+    names, containers, inline, nodes, _ = plan
+    values = [data.get(_n) for _n in names]
+    if views is not None:
+        for name in containers:
+            container = data.get(name)
+            if container is not None:
+                seen.append((container, memo(container)))
+
+    for name, child in inline:
+        value = data.get(name)
+        if value is None:
+            values.append(None)
+            continue
+        view = views.get(name) if views is not None else None
+        if view is not None:
+            seen.append((view, memo(view)))
+            values.append(_values(child, value, view._compounds, deps, seen))
+        else:
+            values.append(_values(child, value, None, deps, seen))
+
+    for name, field in nodes:
+        value = data.get(name)
+        if value is None:
+            values.append(None)
+            continue
+        view = views.get(name) if views is not None else None
+        digest = _digest(field, view, value)
+        values.append(digest.hex())
+        if view is not None:
+            deps.append((field, view, digest))
+    return values
+
+
+def _items(field, views, data, keys, deps: List, seen: List) -> List:
+    """The encoding of the items of a list or mapping of compounds inside the node of the container."""
+    if not _inline(field):
+        encoded = []
+        for key in keys:
+            view = views[key] if views is not None else None
+            digest = _digest(field, view, data[key])
+            if view is not None:
+                deps.append((field, view, digest))
+            encoded.append(digest.hex())
+        return encoded
+
+    plan = _plan(field.model)
+    if views is None:
+        return [_values(plan, data[_k], None, deps, seen) for _k in keys]
+    encoded = []
+    for key in keys:
+        view = views[key]
+        seen.append((view, memo(view)))
+        encoded.append(_values(plan, data[key], view._compounds, deps, seen))
+    return encoded
+
+
+def _compute(field, view, data, deps: List, seen: List) -> bytes:
+    if field is None or isinstance(field, Compound):
+        if view is not None:
+            return _hash(_values(_plan(type(view)), data, view._compounds, deps, seen))
+        return _hash(_values(_plan(field.model), data, None, deps, seen))
+
+    views = _item_views(view)
+    if isinstance(field, CompoundList):
+        return _hash(_items(field.field, views, data, range(len(data)), deps, seen))
+    if isinstance(field, CompoundMapping):
+        keys = sorted(data)
+        return _hash([keys, _items(field.field, views, data, keys, deps, seen)])
+    raise TypeError(f"Can't fingerprint a {type(field).__name__} field")
+
+
+def _item_views(view):
+    """The views of the items of a list or mapping proxy, or None if they are read from its data."""
+    # Only eager proxies keep views of their items, lazy ones are encoded from the data
+    return getattr(view, '_view', None)
+
+
+def _cacheable(field, view) -> bool:
+    if field is None or isinstance(field, Compound):
+        return _plan(type(view))[4]
+    return not _inline(field.field) or _plan(field.field.model)[4]
+
+
+def _node_cache(key: str, compute):
+    """Build a function giving the value of a node, reusing the one kept under key in the memo of its view.
+
+    compute is called with the field, view and data of a node and two lists,
+    it adds the nodes it used as (field, view, value) to the first, and the
+    views and containers it read as (item, memo) to the second. A kept value
+    is reused while those memos are the same and the nodes give the same value.
+    """
+    def _valid(children: List, seen: List) -> bool:
+        for item, used in seen:
+            if item._memo is not used:
+                return False
+        for field, view, used in children:
+            if _cached(field, view, view._data) != used:
+                return False
+        return True
+
+    def _cached(field, view, data):
+        current = getattr(view, '_memo', _UNCACHED)
+        if current is not _UNCACHED and current is not None:
+            entry = current.get(key)
+            if entry is not None and _valid(entry[1], entry[2]):
+                return entry[0]
+
+        children = []
+        seen = []
+        value = compute(field, view, data, children, seen)
+        if current is not _UNCACHED and _cacheable(field, view):
+            memo(view)[key] = (value, children, seen)
+        return value
+    return _cached
+
+
+# Digest of a node, reusing the one kept on its view if nothing it was built from has changed
+_digest = _node_cache('fingerprint', _compute)
+
+
+def fingerprint(obj) -> bytes:
+    """A digest of the content of a model instance.
+
+    Instances with equal field values have the same fingerprint, whatever
+    model variant they are and however their data was ordered.
+    """
+    return _digest(None, obj, obj._data)
@@ -0,0 +1,129 @@
+"""Cached JSON encodings of instances, used by `dumps` for models built with `cache_json=True`.
+
+Instances are split into the same nodes as for their fingerprint: the
+instance itself, each list or mapping of compounds, and each compound that
+has lists or mappings of its own. The encoded text of each node is kept in
+the memo of its view, which the field setters and container mutators drop,
+and encoding a node again splices in the text of every node below it that
+hasn't changed. Lazy lists and mappings, and models with `Any` fields or
+lists of lists, are encoded again every time.
+"""
+import json
+import typing
+from typing import Dict, List, Tuple
+
+from .model_decorator import ClassCache, model_fields, memo, _json_default
+from .fields import Compound, CompoundList
+from .fingerprints import _plan, _inline, _item_views, _node_cache
+from .projection import _encode_key
+
+_layouts: Dict[type, Tuple] = typing.cast(Dict, ClassCache('layouts'))
+
+_encode = json.JSONEncoder(default=_json_default).encode
+
+
+def _layout(cls):
+    """How the keys of a model are encoded.
+
+    Typed containers map to None, inline compounds to their own layout and
+    nodes to their field. Keys that aren't in the layout hold plain values.
+    """
+    try:
+        return _layouts[cls]
+    except KeyError:
+        pass
+    fields = model_fields(cls)
+    _, containers, inline, nodes, _ = _plan(cls)
+    kinds = {_n: None for _n in containers}
+    for name, _ in inline:
+        kinds[name] = _layout(fields[name].model)
+    kinds.update(nodes)
+    layout = _layouts[cls] = (kinds, containers, tuple(_n for _n, _ in inline))
+    return layout
+
+
+def _mark(layout, view, seen: List):
+    """Add an inline compound, and the typed containers and compounds inside it, to seen."""
+    seen.append((view, memo(view)))
+    _, containers, inline = layout
+    data = view._data
+    for name in containers:
+        container = data.get(name)
+        if container is not None:
+            seen.append((container, memo(container)))
+    kinds = layout[0]
+    for name in inline:
+        child = view._compounds.get(name)
+        if child is not None:
+            _mark(kinds[name], child, seen)
+
+
+def _encode_model(view, data, children: List, seen: List) -> str:
+    kinds = _layout(type(view))[0]
+    views = view._compounds
+    parts = []
+    for key, value in data.items():
+        if value is None or key not in kinds:
+            parts.append(_encode_key(key) + _encode(value))
+            continue
+        kind = kinds[key]
+        if kind is None:
+            seen.append((value, memo(value)))
+            text = _encode(value)
+        elif isinstance(kind, tuple):
+            _mark(kind, views[key], seen)
+            text = _encode(value)
+        else:
+            child = views[key]
+            text = _fragment(kind, child, value)
+            children.append((kind, child, text))
+        parts.append(_encode_key(key) + text)
+    return '{' + ', '.join(parts) + '}'
+
+
+def _encode_items(field, views, data, keys, children: List, seen: List) -> List[str]:
+    item = field.field
+    if _inline(item):
+        layout = _layout(item.model)
+        encoded = []
+        for key in keys:
+            value = data[key]
+            if value is not None:
+                _mark(layout, views[key], seen)
+            encoded.append(_encode(value))
+        return encoded
+
+    encoded = []
+    for key in keys:
+        value = data[key]
+        if value is None:
+            encoded.append('null')
+            continue
+        view = views[key]
+        text = _fragment(item, view, value)
+        children.append((item, view, text))
+        encoded.append(text)
+    return encoded
+
+
+def _compute(field, view, data, children: List, seen: List) -> str:
+    if field is None or isinstance(field, Compound):
+        return _encode_model(view, data, children, seen)
+
+    views = _item_views(view)
+    if views is None:
+        return _encode(data)
+    if isinstance(field, CompoundList):
+        return '[' + ', '.join(_encode_items(field, views, data, range(len(data)), children, seen)) + ']'
+    keys = list(data)
+    encoded = _encode_items(field, views, data, keys, children, seen)
+    return '{' + ', '.join([_encode_key(_k) + _t for _k, _t in zip(keys, encoded)]) + '}'
+
+
+# Encoding of a node, reusing the one kept on its view if nothing it was built from has changed
+_fragment = _node_cache('json', _compute)
+
+
+def encode(obj) -> str:
+    """The JSON encoding of an instance, the same as `json.dumps` of its data would give."""
+    return _fragment(None, obj, obj._data)
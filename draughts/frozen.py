@@ -0,0 +1,129 @@
+"""Support for frozen models, see the `frozen` and `intern` options of `model`."""
+import array
+import typing
+import weakref
+from typing import Dict
+
+from .model_decorator import ClassCache, portable_data, build_model, trusted, is_frozen, _sources, _frozen, _cached_json
+from .fields import Compound, SimpleList, SimpleMapping, CompoundList, CompoundMapping
+from .fields.bases import Field
+from .fields.complex import _list_proxy, _mapping_proxy
+from .fields.multivalued import frozen_containers
+from .projection import copy_field
+from .util import _copy_data
+
+_variants: Dict[type, Dict[bool, type]] = typing.cast(Dict, ClassCache('variants'))
+_tables: Dict[type, weakref.WeakValueDictionary] = typing.cast(Dict, ClassCache('tables'))
+
+
+def hashable(value):
+    """Convert raw model data into a hashable value with the same equality."""
+    if isinstance(value, dict):
+        return frozenset((_k, hashable(_v)) for _k, _v in value.items())
+    if isinstance(value, list):
+        return tuple(hashable(_v) for _v in value)
+    if isinstance(value, array.array):
+        return tuple(value)
+    return value
+
+
+class FrozenCompound(Compound):
+    """A compound field of a frozen model, which also takes instances of the model it was frozen from."""
+    def __init__(self, model, source, **kwargs):
+        super().__init__(model, **kwargs)
+        self.source = source
+
+    def cast(self, value):
+        if isinstance(value, self.source):
+            value = _copy_data(self.source, value._data)
+        return super().cast(value)
+
+    def cast_data(self, value):
+        if isinstance(value, self.source):
+            value = _copy_data(self.source, value._data)
+        return super().cast_data(value)
+
+
+class InternedCompound(FrozenCompound):
+    """A compound field of a frozen model that shares one instance between identical values."""
+    def __init__(self, model, source, **kwargs):
+        super().__init__(model, source, **kwargs)
+        self.table = _tables.setdefault(model, weakref.WeakValueDictionary())
+
+    def cast(self, value):
+        obj, data = super().cast(value)
+        key = hash(obj)
+        shared = self.table.get(key)
+        if shared is not None and shared._data == data:
+            return shared, shared._data
+        self.table[key] = obj
+        return obj, data
+
+
+def freeze_field(field: Field, intern: bool) -> Field:
+    """Get the version of a field to use in a frozen model.
+
+    Fields that hold containers or other models are replaced with ones that
+    produce read only containers and frozen versions of the models.
+    """
+    if isinstance(field, Compound):
+        compound = InternedCompound if intern else FrozenCompound
+        return compound(frozen(field.model, intern), field.model, **field.metadata)
+
+    if isinstance(field, CompoundList):
+        inner = freeze_field(field.field, intern)
+        frozen_field = CompoundList(inner, lazy=field.lazy, **field.metadata)
+        frozen_field.proxy = _list_proxy(inner, frozen=True, lazy=field.lazy)
+        return frozen_field
+
+    if isinstance(field, CompoundMapping):
+        inner = freeze_field(field.field, intern)
+        frozen_field = CompoundMapping(inner, lazy=field.lazy, **field.metadata)
+        frozen_field.proxy = _mapping_proxy(inner, frozen=True, lazy=field.lazy)
+        return frozen_field
+
+    if isinstance(field, SimpleList):
+        frozen_field = SimpleList(freeze_field(field.field, intern), packed=field.packed, **field.metadata)
+        frozen_field.container = frozen_containers[field.container]
+        return frozen_field
+
+    if isinstance(field, SimpleMapping):
+        frozen_field = SimpleMapping(freeze_field(field.field, intern), **field.metadata)
+        frozen_field.container = frozen_containers[field.container]
+        return frozen_field
+
+    return field
+
+
+def frozen(model, intern: bool = False) -> type:
+    """Get a frozen version of a model, keeping its methods and properties."""
+    if is_frozen(model) and _frozen[model] == intern:
+        return model
+
+    variants = _variants.setdefault(model, {})
+    try:
+        return variants[intern]
+    except KeyError:
+        pass
+
+    source, metadata = _sources[model]
+    namespace = {}
+    for name, value in source.__dict__.items():
+        if name in ('__dict__', '__weakref__'):
+            continue
+        if isinstance(value, Field):
+            value = copy_field(value)
+        namespace[name] = value
+
+    variant = variants[intern] = build_model(type(source.__name__, (), namespace), metadata,
+                                             frozen=True, intern=intern, cache_json=model in _cached_json)
+
+    def __reduce__(self):
+        return _restore, (model, intern, portable_data(self))
+    variant.__reduce__ = __reduce__
+
+    return variant
+
+
+def _restore(model, intern: bool, data: dict):
+    return trusted(frozen(model, intern), data)
@@ -0,0 +1,143 @@
+"""Export flattened, index ready documents using the `index` metadata of fields."""
+import array
+import typing
+from typing import Dict, Iterable, List, Optional
+
+from .model_decorator import ClassCache, model_fields
+from .fields import ListTypes, MappingTypes, Compound, SimpleMapping
+from .fields.bases import Field, MultiField
+
+_exporters: Dict[type, Dict[bool, 'IndexExporter']] = typing.cast(Dict, ClassCache('exporters'))
+
+
+def _store(value, key, out, many):
+    if many:
+        values = out.get(key)
+        if values is None:
+            values = out[key] = []
+        if isinstance(value, (list, array.array)):
+            values.extend(value)
+        else:
+            values.append(value)
+    elif isinstance(value, array.array):
+        out[key] = value.tolist()
+    elif isinstance(value, list):
+        # Copy lists so the export doesn't share the containers of the model
+        out[key] = list(value)
+    else:
+        out[key] = value
+
+
+def _store_mapping(value, key, out, many):
+    for sub_key, item in value.items():
+        _store(item, key + '.' + sub_key, out, many)
+
+
+def _compile_field(field: Field, index: bool):
+    """Build a visitor for the value of a field, or None if nothing under it is indexed."""
+    if field['index'] is False:
+        return None
+    if field['index'] is not None:
+        index = field['index']
+
+    if isinstance(field, Compound):
+        return _compile_model(field.model, index)
+
+    if isinstance(field, SimpleMapping):
+        return _store_mapping if index else None
+
+    if isinstance(field, ListTypes) and not isinstance(field.field, (Compound, ListTypes, MappingTypes)):
+        return _store if index else None
+
+    if isinstance(field, ListTypes):
+        inner = _compile_field(field.field, index)
+        if inner is None:
+            return None
+
+        def _visit_list(value, key, out, many):
+            for item in value:
+                if item is not None:
+                    inner(item, key, out, True)
+        return _visit_list
+
+    if isinstance(field, MappingTypes):
+        inner = _compile_field(field.field, index)
+        if inner is None:
+            return None
+
+        def _visit_mapping(value, key, out, many):
+            for sub_key, item in value.items():
+                if item is not None:
+                    inner(item, key + '.' + sub_key, out, many)
+        return _visit_mapping
+
+    return _store if index else None
+
+
+def _compile_model(model, index: bool, root: bool = False):
+    """Build a visitor for the data of a model, or None if none of its fields are indexed."""
+    visitors = []
+    for name, field in model_fields(model).items():
+        visit = _compile_field(field, index)
+        if visit is None:
+            continue
+        if isinstance(field, MultiField):
+            for component in field.components():
+                visitors.append((component, component if root else '.' + component, _store))
+        else:
+            visitors.append((name, name if root else '.' + name, visit))
+
+    if not visitors:
+        return None
+    visitors = tuple(visitors)
+
+    def _visit_model(data, key, out, many):
+        for name, suffix, visit in visitors:
+            value = data.get(name)
+            if value is not None:
+                visit(value, key + suffix, out, many)
+    return _visit_model
+
+
+class IndexExporter:
+    """Flattens documents of a model down to their indexed fields.
+
+    Keys in the exported document are the dotted paths of the fields with the
+    list markers removed, values under lists are gathered into lists and the
+    keys of mappings become part of the path. A field is indexed if its `index`
+    metadata is true, fields without an `index` setting take it from the
+    compound containing them, or the exporter default at the top level.
+    Subtrees with nothing indexed are never visited.
+    """
+    def __init__(self, model, default: bool = False):
+        self.model = model
+        self._visit = _compile_model(model, default, root=True)
+
+    def __call__(self, obj) -> Dict[str, typing.Any]:
+        out: Dict[str, typing.Any] = {}
+        if self._visit is not None:
+            self._visit(obj._data if isinstance(obj, self.model) else obj, '', out, False)
+        return out
+
+    def batch(self, objs: Iterable) -> List[Dict[str, typing.Any]]:
+        """Export a batch of documents for bulk indexing."""
+        visit = self._visit
+        model = self.model
+        docs = []
+        for obj in objs:
+            out: Dict[str, typing.Any] = {}
+            if visit is not None:
+                visit(obj._data if isinstance(obj, model) else obj, '', out, False)
+            docs.append(out)
+        return docs
+
+
+def exporter(model, default: Optional[bool] = False) -> IndexExporter:
+    """Get the (cached) index exporter for a model."""
+    default = bool(default)
+    cache = _exporters.setdefault(model, {})
+    try:
+        return cache[default]
+    except KeyError:
+        instance = cache[default] = IndexExporter(model, default)
+        return instance
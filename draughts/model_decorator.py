@@ -1,14 +1,58 @@
 """"""
+import array
 import json
 import weakref
 
 import typing
 from typing import Dict, Set
 
-from .fields.bases import ProxyField, Field, MultiField
+from .fields.bases import ProxyField, Field, MultiField, MultivaluedField, _Pending
+from .fields.constraints import compile_cast, CONSTRAINTS
+
+
+class ClassCache:
+    """Values kept per model class, stored on the class itself.
+
+    Values may refer back to their class, unlike with a WeakKeyDictionary the
+    class can still be collected along with them.
+    """
+    __slots__ = ['_attr']
+
+    def __init__(self, name: str):
+        self._attr = f'_draughts_{name}'
+
+    def __getitem__(self, cls: type):
+        try:
+            return cls.__dict__[self._attr]
+        except KeyError:
+            raise KeyError(cls) from None
+
+    def __setitem__(self, cls: type, value):
+        setattr(cls, self._attr, value)
+
+    def __contains__(self, cls: type):
+        return self._attr in cls.__dict__
+
+    def get(self, cls: type, default=None):
+        return cls.__dict__.get(self._attr, default)
+
+    def setdefault(self, cls: type, default):
+        try:
+            return cls.__dict__[self._attr]
+        except KeyError:
+            setattr(cls, self._attr, default)
+            return default
+
 
 _fields: Dict[type, Dict[str, Field]] = typing.cast(Dict, weakref.WeakKeyDictionary())
 _flat_fields: Dict[type, Dict[str, Field]] = typing.cast(Dict, weakref.WeakKeyDictionary())
+_trusted: Dict[type, typing.Callable] = typing.cast(Dict, ClassCache('trusted'))
+_validators: Dict[type, typing.Callable] = typing.cast(Dict, ClassCache('validators'))
+_sources: Dict[type, typing.Tuple[type, Dict]] = typing.cast(Dict, ClassCache('sources'))
+_frozen: Dict[type, bool] = typing.cast(Dict, ClassCache('frozen'))
+_cached_json: Dict[type, bool] = typing.cast(Dict, ClassCache('cached_json'))
+_portables: Dict[type, typing.Optional[typing.Callable]] = typing.cast(Dict, ClassCache('portables'))
+_trackers: Dict[type, typing.Optional[typing.Callable]] = typing.cast(Dict, ClassCache('trackers'))
 
 
 def model_fields(cls: type):
@@ -19,21 +63,176 @@ def model_fields_flat(cls: type):
     return _flat_fields[cls]
 
 
+def is_frozen(cls: type):
+    return cls in _frozen
+
+
 def raw(obj):
     return getattr(obj, '_data')
 
 
-def dumps(obj):
-    return json.dumps(raw(obj))
+def _json_default(value):
+    # Packed lists are stored as arrays
+    if isinstance(value, array.array):
+        return value.tolist()
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def dumps(obj, include: typing.Iterable[str] = (), exclude: typing.Iterable[str] = ()):
+    """Encode an instance as JSON, optionally writing only the flat paths in `include` and leaving out `exclude`."""
+    if include or exclude:
+        from .projection import encoder
+        return encoder(type(obj), include, exclude)(obj)
+    if type(obj) in _cached_json:
+        from .fragments import encode
+        return encode(obj)
+    return json.dumps(raw(obj), default=_json_default)
+
+
+def trusted(cls: type, data: dict):
+    """Build an instance of a model over data that is already valid for it.
+
+    None of the fields are cast, only the proxies over the data are rebuilt,
+    so this must only be used on data taken from another instance of the model.
+    """
+    return _trusted[cls](data)
+
+
+def _buffers(field) -> typing.Optional[typing.Callable]:
+    """A function replacing the zero copy buffers in a value of a field with bytes, or None if it can't hold any."""
+    from .fields.basic import Bytes
+    from .fields.complex import Compound
+    if isinstance(field, Bytes):
+        return None if field.copy else bytes
+    if isinstance(field, Compound):
+        return _portable(field.model)
+    inner = getattr(field, 'field', None)
+    item = _buffers(inner) if isinstance(inner, Field) else None
+    if item is None:
+        return None
+
+    def _convert(value):
+        if isinstance(value, dict):
+            return {_k: None if _v is None else item(_v) for _k, _v in value.items()}
+        return [None if _v is None else item(_v) for _v in value]
+    return _convert
+
+
+def _portable(cls: type) -> typing.Optional[typing.Callable]:
+    """A function copying the data of a model with its zero copy buffers replaced by bytes, or None if it has none."""
+    try:
+        return _portables[cls]
+    except KeyError:
+        pass
+    converters = {}
+    for name, field in _fields[cls].items():
+        convert = None if isinstance(field, MultiField) else _buffers(field)
+        if convert is not None:
+            converters[name] = convert
 
+    if not converters:
+        _portables[cls] = None
+        return None
 
-def model(cls=None, **metadata):
+    def portable(data):
+        data = dict(data)
+        for _name, _convert in converters.items():
+            value = data.get(_name)
+            if value is not None:
+                data[_name] = _convert(value)
+        return data
+    _portables[cls] = portable
+    return portable
+
+
+def portable_data(obj) -> dict:
+    """The data of an instance in a form that can be pickled, memoryviews from `Bytes(copy=False)` become bytes."""
+    portable = _portable(type(obj))
+    return obj._data if portable is None else portable(obj._data)
+
+
+def validate(cls: type, data):
+    """Cast data in place for a model, exactly as constructing it would, without building the instance."""
+    return _validators[cls](data)
+
+
+def memo(obj) -> dict:
+    """A dict of values derived from the content of an instance, list or mapping.
+
+    The memo is dropped by every change to the object, so whatever is kept in
+    it stays valid for as long as the same memo is returned.
+    """
+    current = obj._memo
+    if current is None:
+        _track(type(obj))
+        current = obj._memo = {}
+    return current
+
+
+def _track(cls: type):
+    """Switch a model to setters that drop memos and call observers, the first time either is used.
+
+    Until then its setters only store the value, so models that never use
+    them don't pay for the checks on every assignment.
+    """
+    enable = _trackers.get(cls)
+    if enable is not None:
+        _trackers[cls] = None
+        enable()
+
+
+def observe(obj, callback: typing.Callable):
+    """Call `callback(obj, name)` after each assignment to a field of a model instance."""
+    _track(type(obj))
+    if obj._listeners is None:
+        obj._listeners = []
+    obj._listeners.append(callback)
+
+
+def unobserve(obj, callback: typing.Callable):
+    """Stop calling a callback registered with `observe`."""
+    if obj._listeners and callback in obj._listeners:
+        obj._listeners.remove(callback)
+
+
+def _notify(obj, name: str):
+    for callback in list(obj._listeners):
+        callback(obj, name)
+
+
+def _project(cls, *paths):
+    from .projection import project
+    return project(cls, *paths)
+
+
+def model(cls=None, frozen=False, intern=False, cache_json=False, **metadata):
+    """Build a model class from the fields declared on a class.
+
+    Any keyword arguments other than the ones below are metadata defaults for
+    every field of the model.
+
+    frozen: Make instances, and any lists, mappings or compounds in them, read only and hashable.
+    intern: For frozen models, share one instance between identical compound subdocuments.
+    cache_json: Keep the JSON encoding of the subdocuments of instances, so `dumps` only encodes what changed.
+    """
     # If we are given default metadata
     if cls is None:
         def capture(cls):
-            return model(cls, **metadata)
+            return model(cls, frozen=frozen, intern=intern, cache_json=cache_json, **metadata)
         return capture
 
+    return build_model(cls, metadata, frozen=frozen, intern=intern, cache_json=cache_json)
+
+
+def build_model(cls, metadata, strict=True, frozen=False, intern=False, cache_json=False):
+    """Build the model class for the fields declared on cls.
+
+    When strict is false, keys in the data that aren't fields of the model are
+    left untouched rather than rejected.
+    """
+    if frozen:
+        from .frozen import freeze_field
+
     # Track the keys that will be added to the model so that we can
     # check if two fields conflict in what keys they use (primarily
     # that multi-fields don't try and use the same hidden keys)
@@ -51,19 +250,30 @@ def model(cls=None, **metadata):
 
     for _name, field in cls.__dict__.items():
         if isinstance(field, Field):
+            if frozen:
+                field = freeze_field(field, intern)
             casts[_name] = field.cast
             fields[_name] = field
             field.name = _name
             field.metadata_defaults = metadata
 
-            if field.metadata.get('optional', False):
-                def make_optional_cast(_c):
-                    def _cast(value):
-                        if value is None:
-                            return None
-                        return _c(value)
-                    return _cast
-                field.cast = casts[_name] = make_optional_cast(field.cast)
+            if isinstance(field, (ProxyField, MultiField)):
+                if any(field.metadata.get(_c) is not None for _c in CONSTRAINTS):
+                    raise ValueError(f"Constraints aren't supported on {field.__class__.__name__} field {_name}")
+                if field.metadata.get('optional', False):
+                    def make_optional_cast(_c):
+                        def _cast(value):
+                            if value is None:
+                                return None
+                            return _c(value)
+                        return _cast
+                    field.cast = casts[_name] = make_optional_cast(field.cast)
+            else:
+                field.cast = casts[_name] = compile_cast(field)
+                item = field
+                while isinstance(item, MultivaluedField):
+                    item = item.field
+                    item.cast = compile_cast(item)
 
             if isinstance(field, ProxyField):
                 keys.add(_name)
@@ -90,6 +300,7 @@ def model(cls=None, **metadata):
             static_values[_name] = field
 
     field_names = set(fields.keys())
+    multivalued = {_name: field for _name, field in basic.items() if isinstance(field, MultivaluedField)}
 
     # Now go back over the multi fields, and make sure none of their generated
     # sub components collide with anything else in the object we are creating.
@@ -112,6 +323,12 @@ def model(cls=None, **metadata):
         # If the multi field hasn't already used its name, reserve it.
         keys.add(_name)
 
+    def _read_only(self, instance, value):
+        raise AttributeError(f"Can't assign fields of frozen model {cls.__name__}")
+
+    # The properties to give tracking setters once a memo or observer is used, see _track
+    tracked = []
+
     def field_property(_name, _cast, optional):
         if optional:
             class FieldProperty:
@@ -129,6 +346,16 @@ def model(cls=None, **metadata):
                 def __set__(self, instance, value):
                     instance._data[_name] = _cast(value)
 
+        def _set_tracked(self, instance, value):
+            instance._data[_name] = _cast(value)
+            instance._memo = None
+            if instance._listeners:
+                _notify(instance, _name)
+
+        if frozen:
+            FieldProperty.__set__ = _read_only
+        else:
+            tracked.append((FieldProperty, _set_tracked))
         return FieldProperty()
 
     class CompoundProperty:
@@ -142,6 +369,12 @@ def model(cls=None, **metadata):
         def __set__(self, instance, value):
             instance._compounds[self.name], instance._data[self.name] = casts[self.name](value)
 
+        def _set_tracked(self, instance, value):
+            instance._compounds[self.name], instance._data[self.name] = casts[self.name](value)
+            instance._memo = None
+            if instance._listeners:
+                _notify(instance, self.name)
+
     class MultiValueProperty:
         def __init__(self, name, field):
             self.name = name
@@ -153,76 +386,124 @@ def model(cls=None, **metadata):
         def __set__(self, instance, value):
             instance._compounds[self.name] = proxies[self.name](instance._data, casts[self.name](value))
 
+        def _set_tracked(self, instance, value):
+            instance._compounds[self.name] = proxies[self.name](instance._data, casts[self.name](value))
+            instance._memo = None
+            if instance._listeners:
+                _notify(instance, self.name)
+
+    class LazyMultiValueProperty(MultiValueProperty):
+        def __init__(self, name, field, materialize):
+            super().__init__(name, field)
+            self.materialize = materialize
+
+        def __get__(self, instance, objtype):
+            value = instance._compounds[self.name]
+            if type(value) is _Pending:
+                value = instance._compounds[self.name] = self.materialize(value)
+            return value
+
+    if frozen:
+        CompoundProperty.__set__ = _read_only
+        MultiValueProperty.__set__ = _read_only
+    else:
+        tracked.append((CompoundProperty, CompoundProperty._set_tracked))
+        tracked.append((MultiValueProperty, MultiValueProperty._set_tracked))
+
+    def _cast_into(data, kwargs, views):
+        """Cast data in place, taking values from kwargs before the data.
+
+        When views is given the views of the compound and multi fields are stored in it.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Unexpected parameter type for model construction")
+
+        kw_pop = kwargs.pop
+
+        if strict and set(data.keys()) - field_names:
+            raise ValueError(f"Unexpected key provided: {set(data.keys()) - field_names}")
+
+        for name, field in compounds.items():
+            if name in kwargs:
+                value = kw_pop(name)
+            elif data.get(name) is not None:
+                value = data[name]
+            elif 'default' in field.metadata:
+                value = field['default']
+            elif 'factory' in field.metadata:
+                value = field['factory']()
+            elif field.metadata.get('optional', False):
+                if views is not None:
+                    views[name] = None
+                # data[name] = None
+                continue
+            else:
+                raise ValueError(f"Missing key [{name}] to construct {cls.__name__}")
+            if views is None:
+                data[name] = field.cast_data(value)
+            else:
+                views[name], data[name] = field.cast(value)
+
+        for name, field in multi_fields.items():
+            _components = multi_field_components[name]
+            if all(_c in kwargs for _c in _components):
+                proxy = field.proxy(data, [kw_pop(_c) for _c in _components])
+            elif name in kwargs:
+                proxy = field.proxy(data, field.cast(kw_pop(name)))
+            elif all(_c in data for _c in _components):
+                proxy = field.proxy(data, [data[_c] for _c in _components])
+            elif data.get(name) is not None:
+                proxy = field.proxy(data, field.cast(data[name]))
+            elif 'default' in field.metadata:
+                proxy = field.proxy(data, field.cast(field['default']))
+            elif 'factory' in field.metadata:
+                proxy = field.proxy(data, field.cast(field['factory']()))
+            elif field.metadata.get('optional', False):
+                proxy = None
+                # data[name] = None
+            else:
+                raise ValueError(f"Missing key [{name}] to construct {cls.__name__}")
+            if views is not None:
+                views[name] = proxy
+
+        for name, field in basic.items():
+            cast = casts[name]
+            if name in kwargs:
+                data[name] = cast(kw_pop(name))
+            elif name in data:
+                data[name] = cast(data[name])
+            elif 'default' in field.metadata:
+                data[name] = cast(field['default'])
+            elif 'factory' in field.metadata:
+                data[name] = cast(field['factory']())
+            elif field.metadata.get('optional', False):
+                pass
+                # data[name] = None
+            else:
+                raise ValueError(f"Missing key [{name}] to construct {cls.__name__}")
+
+        if kwargs:
+            raise ValueError(f"Unexpected key provided: {kwargs.keys()}")
+        return data
+
     class ModelClass:
-        __slots__ = ['_data', '_compounds']
+        __slots__ = ['_data', '_compounds', '_listeners', '_memo', '__weakref__'] + (['_hash'] if frozen else [])
 
         def __init__(self, *args, **kwargs):
             data = self._data = args[0] if args else {}
             _compounds = self._compounds = {}
+            self._listeners = None
+            self._memo = None
+
+            _cast_into(data, kwargs, _compounds)
+
+        def __reduce__(self):
+            return trusted, (self.__class__, portable_data(self))
 
-            if not isinstance(data, dict):
-                raise ValueError("Unexpected parameter type for model construction")
-
-            kw_pop = kwargs.pop
-
-            if set(data.keys()) - field_names:
-                raise ValueError(f"Unexpected key provided: {set(data.keys()) - field_names}")
-
-            for name, field in compounds.items():
-                if name in kwargs:
-                    _compounds[name], data[name] = field.cast(kw_pop(name))
-                elif data.get(name) is not None:
-                    _compounds[name], data[name] = field.cast(data[name])
-                elif 'default' in field.metadata:
-                    _compounds[name], data[name] = field.cast(field['default'])
-                elif 'factory' in field.metadata:
-                    _compounds[name], data[name] = field.cast(field['factory']())
-                elif field.metadata.get('optional', False):
-                    _compounds[name] = None
-                    # data[name] = None
-                    continue
-                else:
-                    raise ValueError(f"Missing key [{name}] to construct {cls.__name__}")
-
-            for name, field in multi_fields.items():
-                _components = multi_field_components[name]
-                if all(_c in kwargs for _c in _components):
-                    _compounds[name] = field.proxy(data, [kw_pop(_c) for _c in _components])
-                elif name in kwargs:
-                    _compounds[name] = field.proxy(data, field.cast(kw_pop(name)))
-                elif all(_c in data for _c in _components):
-                    _compounds[name] = field.proxy(data, [data[_c] for _c in _components])
-                elif data.get(name) is not None:
-                    _compounds[name] = field.proxy(data, field.cast(data[name]))
-                elif 'default' in field.metadata:
-                    _compounds[name] = field.proxy(data, field.cast(field['default']))
-                elif 'factory' in field.metadata:
-                    _compounds[name] = field.proxy(data, field.cast(field['factory']()))
-                elif field.metadata.get('optional', False):
-                    _compounds[name] = None
-                    # data[name] = None
-                    continue
-                else:
-                    raise ValueError(f"Missing key [{name}] to construct {cls.__name__}")
-
-            for name, field in basic.items():
-                cast = casts[name]
-                if name in kwargs:
-                    data[name] = cast(kw_pop(name))
-                elif name in data:
-                    data[name] = cast(data[name])
-                elif 'default' in field.metadata:
-                    data[name] = cast(field['default'])
-                elif 'factory' in field.metadata:
-                    data[name] = cast(field['factory']())
-                elif field.metadata.get('optional', False):
-                    pass
-                    # data[name] = None
-                else:
-                    raise ValueError(f"Missing key [{name}] to construct {cls.__name__}")
-
-            if kwargs:
-                raise ValueError(f"Unexpected key provided: {kwargs.keys()}")
+        def __copy__(self):
+            # Copying the containers keeps the proxies of each copy in step with its own data
+            from .util import clone
+            return clone(self)
 
         def __eq__(self, other):
             if isinstance(other, dict):
@@ -235,14 +516,67 @@ def model(cls=None, **metadata):
                 print('true')
             return True
 
+    if frozen:
+        from .frozen import hashable
+
+        def __hash__(self):
+            try:
+                return self._hash
+            except AttributeError:
+                self._hash = hash(hashable(self._data))
+                return self._hash
+        ModelClass.__hash__ = __hash__
+
+    def _load_trusted(data):
+        obj = ModelClass.__new__(ModelClass)
+        obj._data = data
+        _compounds = obj._compounds = {}
+        obj._listeners = None
+        obj._memo = None
+
+        for name, field in compounds.items():
+            value = data.get(name)
+            _compounds[name] = None if value is None else field.wrap(value)
+
+        for name, field in multi_fields.items():
+            _components = multi_field_components[name]
+            if all(_c in data for _c in _components):
+                _compounds[name] = field.proxy(data, [data[_c] for _c in _components])
+            else:
+                _compounds[name] = None
+
+        for name, field in multivalued.items():
+            value = data.get(name)
+            if value is not None:
+                data[name] = field.wrap(value)
+
+        return obj
+
+    def _validate(data):
+        return _cast_into(data, {}, None)
+
     # Lets over write some class properties to make it a little nicer
     ModelClass.__name__ = cls.__name__
+    ModelClass.__qualname__ = cls.__qualname__
+    ModelClass.__module__ = cls.__module__
     ModelClass.__doc__ = cls.__doc__
     if hasattr(cls, '__annotations__'):
         ModelClass.__annotations__ = cls.__annotations__
 
     _fields[ModelClass] = fields
     _flat_fields[ModelClass] = flat_fields
+    _trusted[ModelClass] = _load_trusted
+    _validators[ModelClass] = _validate
+    _sources[ModelClass] = (cls, metadata)
+    if frozen:
+        _frozen[ModelClass] = intern
+    if cache_json:
+        _cached_json[ModelClass] = True
+    if not frozen:
+        def _enable_tracking():
+            for owner, setter in tracked:
+                owner.__set__ = setter
+        _trackers[ModelClass] = _enable_tracking
 
     # Apply the properties to the class so that our attribute access works
     for _name, field in compounds.items():
@@ -250,7 +584,10 @@ def model(cls=None, **metadata):
     for _name, field in basic.items():
         setattr(ModelClass, _name, field_property(_name, field.cast, field['optional']))
     for _name, field in multi_fields.items():
-        setattr(ModelClass, _name, MultiValueProperty(_name, field.cast))
+        if field.lazy:
+            setattr(ModelClass, _name, LazyMultiValueProperty(_name, field.cast, field.materialize))
+        else:
+            setattr(ModelClass, _name, MultiValueProperty(_name, field.cast))
 
     # If there were any pre-defined properties on the class make sure it is put back
     for _name, _p in properties.items():
@@ -260,4 +597,7 @@ def model(cls=None, **metadata):
     for _name, _p in static_values.items():
         setattr(ModelClass, _name, _p)
 
+    if 'project' not in keys:
+        ModelClass.project = classmethod(_project)
+
     return ModelClass
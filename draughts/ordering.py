@@ -0,0 +1,138 @@
+"""Compiled sort and group keys over the flat field paths of a model.
+
+Each path may start with `-` to order by that field in descending order,
+for example `keyfunc(Event, 'source.name', '-ts')`. Keys are read straight
+from the stored data of the instances rather than through their properties.
+"""
+import heapq
+import typing
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from .model_decorator import ClassCache, model_fields
+from .path import resolve, fans_out, getter
+from .fields import Boolean, Integer, Float, Compound, ListTypes, MappingTypes
+
+_keys: Dict[type, Dict[Tuple[str, ...], Callable]] = typing.cast(Dict, ClassCache('keys'))
+
+
+class _Descending:
+    """Wrap a value so that it sorts in the reverse of its normal order."""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __gt__(self, other):
+        return other.value > self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __repr__(self):
+        return f"_Descending({self.value!r})"
+
+
+def _compile_part(model, path: str, index: int, namespace: Dict) -> Tuple[List[str], str]:
+    """Source reading one part of a key into a local, and the expression for that part of the key."""
+    descending = path.startswith('-')
+    if descending:
+        path = path[1:]
+    steps, field = resolve(model, path)
+    if fans_out(steps):
+        raise ValueError(f"Path {path} can select more than one value and can't be used as a key")
+
+    # Missing optional fields leave None in the key, so guard every step after one
+    name = f"_k{index}"
+    lines = []
+    fields = model_fields(model)
+    nullable = False
+    for step in steps:
+        step_field = fields[step]
+        source = name if lines else 'data'
+        read = f"{source}.get({step!r})" if step_field.metadata.get('optional', False) else f"{source}[{step!r}]"
+        if nullable:
+            lines += [f"if {name} is not None:", f"    {name} = {read}"]
+        else:
+            lines.append(f"{name} = {read}")
+        nullable = nullable or step_field.metadata.get('optional', False)
+        if isinstance(step_field, Compound):
+            fields = model_fields(step_field.model)
+
+    if not descending:
+        expression = name
+    elif isinstance(field, (Boolean, Integer, Float)):
+        expression = f"-{name}"
+    else:
+        namespace['_Descending'] = _Descending
+        expression = f"_Descending({name})"
+
+    # None values sort after all others in either direction
+    if nullable:
+        expression = f"({name} is None, None if {name} is None else {expression})"
+    return lines, expression
+
+
+def keyfunc(model, *paths: str) -> Callable:
+    """Compile flat paths into a sort key for instances, or the raw data, of a model.
+
+    Paths starting with `-` are ordered descending. Missing values sort last
+    whichever the direction.
+    """
+    if not paths:
+        raise ValueError("At least one path is required")
+
+    cache = _keys.setdefault(model, {})
+    try:
+        return cache[paths]
+    except KeyError:
+        pass
+
+    namespace = {'_model': model}
+    lines = ["data = obj._data if isinstance(obj, _model) else obj"]
+    expressions = []
+    for index, path in enumerate(paths):
+        part_lines, expression = _compile_part(model, path, index, namespace)
+        lines += part_lines
+        expressions.append(expression)
+
+    if len(expressions) == 1:
+        lines.append(f"return {expressions[0]}")
+    else:
+        lines.append(f"return ({', '.join(expressions)})")
+
+    source = "def key(obj):\n" + "".join(f"    {_l}\n" for _l in lines)
+    exec(compile(source, f"<key {model.__name__} {' '.join(paths)}>", 'exec'), namespace)
+    key = cache[paths] = namespace['key']
+    return key
+
+
+def top_k(model, items: Iterable, k: int, *paths: str) -> List:
+    """The first k items in the order given by the paths, without sorting all of them."""
+    return heapq.nsmallest(k, items, key=keyfunc(model, *paths))
+
+
+def group_by(model, items: Iterable, *paths: str) -> Dict[typing.Any, List]:
+    """Group items by the values at the given paths.
+
+    With one path the groups are keyed by its value, with several by a tuple
+    of their values. Groups, and the items within them, keep the order the
+    items were given in.
+    """
+    for path in paths:
+        steps, field = resolve(model, path)
+        if fans_out(steps):
+            raise ValueError(f"Path {path} can select more than one value and can't be used to group")
+        if isinstance(field, ListTypes + MappingTypes + (Compound,)):
+            raise ValueError(f"Path {path} names a {type(field).__name__} field and can't be used to group")
+    key = getter(model, *paths)
+    groups = {}
+    for item in items:
+        value = key(item)
+        try:
+            groups[value].append(item)
+        except KeyError:
+            groups[value] = [item]
+    return groups
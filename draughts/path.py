@@ -0,0 +1,204 @@
+"""Compiled accessors for the flat field paths named by `model_fields_flat`.
+
+Paths use the same syntax as the flat field listing: compound fields are
+joined with `.`, list elements are marked with `[]` and mapping values with `*`,
+for example `a.b[].c` or `m.*.x`.
+"""
+import typing
+from typing import Dict, Tuple
+
+from .model_decorator import ClassCache, model_fields
+from .fields import ListTypes, MappingTypes, Compound
+from .fields.bases import Field, MultiField
+
+LIST = '[]'
+MAPPING = '*'
+
+_getters: Dict[type, Dict[Tuple[str, ...], typing.Callable]] = typing.cast(Dict, ClassCache('getters'))
+
+
+def tokenize(path: str) -> Tuple[str, ...]:
+    """Split a flat path into field names and fan out markers."""
+    tokens = []
+    for part in path.split('.'):
+        depth = 0
+        while part.endswith(LIST):
+            part = part[:-len(LIST)]
+            depth += 1
+        if part:
+            tokens.append(part)
+        tokens.extend([LIST] * depth)
+    return tuple(tokens)
+
+
+def join(tokens: Tuple[str, ...]) -> str:
+    """Write the steps of a path back out as a flat path."""
+    path = ''
+    for token in tokens:
+        if token == LIST:
+            path += LIST
+        else:
+            path += '.' + token if path else token
+    return path
+
+
+def resolve(model, path: str) -> Tuple[Tuple[str, ...], Field]:
+    """Check a path against a model, returning its steps and the field it names."""
+    fields = model_fields(model)
+    field = None
+    steps = tokenize(path)
+    if not steps:
+        raise ValueError(f"Empty path for {model.__name__}")
+
+    for step in steps:
+        if step == LIST:
+            if not isinstance(field, ListTypes):
+                raise ValueError(f"Path {path} expands a non-list field on {model.__name__}")
+            field = field.field
+        elif step == MAPPING:
+            if not isinstance(field, MappingTypes):
+                raise ValueError(f"Path {path} expands a non-mapping field on {model.__name__}")
+            field = field.field
+        else:
+            if field is not None:
+                if not isinstance(field, Compound):
+                    raise ValueError(f"Path {path} indexes into a non-compound field on {model.__name__}")
+                fields = model_fields(field.model)
+            try:
+                field = fields[step]
+            except KeyError:
+                raise ValueError(f"Unknown field {step} in path {path} on {model.__name__}")
+            if isinstance(field, MultiField):
+                raise ValueError(f"Path {path} names multi-field {step}, use its components instead")
+
+    return steps, field
+
+
+def fans_out(steps: Tuple[str, ...]) -> bool:
+    """Check if a path can select more than one value."""
+    return LIST in steps or MAPPING in steps
+
+
+def _compile_scalar(keys):
+    if len(keys) == 1:
+        key, = keys
+
+        def _get(data):
+            return data.get(key)
+        return _get
+
+    def _get(data):
+        for key in keys:
+            data = data.get(key)
+            if data is None:
+                return None
+        return data
+    return _get
+
+
+def _compile_node(node):
+    """Build a visitor for one node of the path trie.
+
+    The visitor is called with the value at that node and the output list,
+    it stores the value in any slots for paths ending here and then descends.
+    """
+    scalar_slots, list_slots, children = node
+    visitors = []
+
+    for step, child in children.items():
+        visit_child = _compile_node(child)
+        if step == LIST:
+            def _visit(value, out, _child=visit_child):
+                for item in value:
+                    if item is not None:
+                        _child(item, out)
+        elif step == MAPPING:
+            def _visit(value, out, _child=visit_child):
+                for item in value.values():
+                    if item is not None:
+                        _child(item, out)
+        else:
+            def _visit(value, out, _child=visit_child, _key=step):
+                item = value.get(_key)
+                if item is not None:
+                    _child(item, out)
+        visitors.append(_visit)
+
+    scalar_slots = tuple(scalar_slots)
+    list_slots = tuple(list_slots)
+    visitors = tuple(visitors)
+
+    def _node(value, out):
+        for index in scalar_slots:
+            out[index] = value
+        for index in list_slots:
+            out[index].append(value)
+        for _visit in visitors:
+            _visit(value, out)
+    return _node
+
+
+def _compile_many(parsed):
+    # Build a trie of the steps so shared prefixes are only traversed once
+    root = ([], [], {})
+    for index, steps in enumerate(parsed):
+        node = root
+        for step in steps:
+            node = node[2].setdefault(step, ([], [], {}))
+        if fans_out(steps):
+            node[1].append(index)
+        else:
+            node[0].append(index)
+
+    visit = _compile_node(root)
+    list_slots = tuple(index for index, steps in enumerate(parsed) if fans_out(steps))
+    size = len(parsed)
+
+    def _get(data):
+        out = [None] * size
+        for index in list_slots:
+            out[index] = []
+        visit(data, out)
+        return out
+    return _get
+
+
+def getter(model, *paths: str):
+    """Compile one or more flat paths into a function that reads them from an instance or raw dict.
+
+    With a single path the function returns the value found there, or with
+    several paths a tuple with one entry per path. Paths passing through a list
+    or mapping fan out and produce a list of every value found. Missing or None
+    values are returned as None, or left out of fanned out results.
+    """
+    if not paths:
+        raise ValueError("At least one path is required")
+
+    cache = _getters.setdefault(model, {})
+    try:
+        return cache[paths]
+    except KeyError:
+        pass
+
+    parsed = [resolve(model, path)[0] for path in paths]
+
+    if len(parsed) == 1 and not fans_out(parsed[0]):
+        extract = _compile_scalar(parsed[0])
+
+        def _getter(obj):
+            return extract(obj._data if isinstance(obj, model) else obj)
+
+    elif len(parsed) == 1:
+        extract_many = _compile_many(parsed)
+
+        def _getter(obj):
+            return extract_many(obj._data if isinstance(obj, model) else obj)[0]
+
+    else:
+        extract_many = _compile_many(parsed)
+
+        def _getter(obj):
+            return tuple(extract_many(obj._data if isinstance(obj, model) else obj))
+
+    cache[paths] = _getter
+    return _getter
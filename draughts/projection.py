@@ -0,0 +1,244 @@
+"""Derived models that only construct a subset of the fields of another model, and encoders that only write one."""
+import copy
+import json
+import typing
+from json.encoder import encode_basestring_ascii
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from .model_decorator import ClassCache, portable_data, model_fields, build_model, trusted, _json_default, _sources
+from .fields import Compound, ListTypes, MappingTypes
+from .fields.bases import Field, MultiField
+from .path import tokenize, join, resolve, LIST, MAPPING
+
+_projections: Dict[type, Dict[FrozenSet[Tuple[str, ...]], type]] = typing.cast(Dict, ClassCache('projections'))
+
+
+def copy_field(field: Field) -> Field:
+    field = copy.copy(field)
+    # Drop the optional wrapper the model decorator installed so it isn't applied twice
+    vars(field).pop('cast', None)
+    return field
+
+
+def _project_field(field: Field, rests: FrozenSet[Tuple[str, ...]]) -> Field:
+    if () in rests:
+        return copy_field(field)
+
+    heads = {rest[0] for rest in rests}
+    if isinstance(field, Compound) and not heads & {LIST, MAPPING}:
+        return Compound(_project(field.model, rests), **field.metadata)
+    if isinstance(field, ListTypes) and heads == {LIST}:
+        return type(field)(_project_field(field.field, frozenset(rest[1:] for rest in rests)), **field.metadata)
+    if isinstance(field, MappingTypes) and heads == {MAPPING}:
+        return type(field)(_project_field(field.field, frozenset(rest[1:] for rest in rests)), **field.metadata)
+    raise ValueError(f"Can't project {field.__class__.__name__} field {field.name} onto {heads}")
+
+
+def _project(model, paths: FrozenSet[Tuple[str, ...]]) -> type:
+    cache = _projections.setdefault(model, {})
+    try:
+        return cache[paths]
+    except KeyError:
+        pass
+
+    fields = model_fields(model)
+    grouped: Dict[str, set] = {}
+    for path in paths:
+        if path[0] not in fields:
+            raise ValueError(f"Unknown field {path[0]} to project from {model.__name__}")
+        grouped.setdefault(path[0], set()).add(path[1:])
+
+    # Keep the methods and properties of the model along with the projected fields
+    source, metadata = _sources[model]
+    namespace = {}
+    for name, value in source.__dict__.items():
+        if name in ('__dict__', '__weakref__'):
+            continue
+        if isinstance(value, Field):
+            if name not in grouped:
+                continue
+            value = _project_field(fields[name], frozenset(grouped[name]))
+        namespace[name] = value
+
+    projected = cache[paths] = build_model(type(source.__name__, (), namespace), metadata, strict=False)
+
+    # Projections can't be found by name, so pickle them by the model and paths they came from
+    def __reduce__(self):
+        return _restore, (model, paths, portable_data(self))
+    projected.__reduce__ = __reduce__
+
+    return projected
+
+
+def _restore(model, paths: FrozenSet[Tuple[str, ...]], data: dict):
+    return trusted(_project(model, paths), data)
+
+
+def project(model, *paths: str) -> type:
+    """Derive a model that only validates and constructs the given flat paths.
+
+    Naming a nested path includes the compound fields leading to it, naming
+    a compound field includes all of its contents. Any other keys in the data
+    are left as they are. Projections are cached, so projecting the same set
+    of paths again returns the same class.
+    """
+    if not paths:
+        raise ValueError("At least one path is required to project a model")
+    return _project(model, frozenset(tokenize(path) for path in paths))
+
+
+_encoders: Dict[type, Dict[Tuple[FrozenSet[str], FrozenSet[str]], typing.Callable]] = \
+    typing.cast(Dict, ClassCache('encoders'))
+
+
+def _expand(model, path: str) -> List[Tuple[str, ...]]:
+    """Check a path to write, naming a multi-field selects each of its components."""
+    steps = tokenize(path)
+    if steps and steps[-1] not in (LIST, MAPPING):
+        parent = model_fields(model) if len(steps) == 1 else None
+        if parent is None:
+            container = resolve(model, join(steps[:-1]))[1]
+            if isinstance(container, Compound):
+                parent = model_fields(container.model)
+        field = parent.get(steps[-1]) if parent is not None else None
+        if isinstance(field, MultiField):
+            return [steps[:-1] + (_c,) for _c in field.components()]
+    return [resolve(model, path)[0]]
+
+
+def _encode_key(key) -> str:
+    """A key and its separator as json writes them, other keys it allows are written as their JSON in quotes."""
+    if not isinstance(key, str):
+        if isinstance(key, (bool, float)) or key is None:
+            key = json.dumps(key)
+        elif isinstance(key, int):
+            key = int.__repr__(key)
+        else:
+            raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+    return encode_basestring_ascii(key) + ': '
+
+
+def _write_empty(empty):
+    def _write(value, out):
+        out.append(empty)
+    return _write
+
+
+def _compile_writer(includes, excludes, whole):
+    """Build a writer for one node of the selection, or None if the node writes nothing.
+
+    `includes` is None when everything below the node is selected, `excludes`
+    holds the rests of the excluded paths. Writers are called with a value and
+    the list of output fragments.
+    """
+    if () in excludes:
+        return None
+    if includes is not None and () in includes:
+        includes = None
+    if includes is None and not excludes:
+        return whole
+
+    heads: Dict[str, Tuple[set, set]] = {}
+    for rest in includes or ():
+        heads.setdefault(rest[0], (set(), set()))[0].add(rest[1:])
+    for rest in excludes:
+        heads.setdefault(rest[0], (None if includes is None else set(), set()))[1].add(rest[1:])
+
+    children = {}
+    for head, (child_includes, child_excludes) in heads.items():
+        if includes is not None and not child_includes:
+            continue
+        children[head] = _compile_writer(child_includes, child_excludes, whole)
+    # Keys nobody named are written whole when everything is selected, or left out otherwise
+    rest = whole if includes is None else None
+
+    if LIST in children:
+        write_item = children[LIST]
+        if write_item is None:
+            return _write_empty('[]')
+
+        def _write(value, out):
+            out.append('[')
+            first = True
+            for item in value:
+                if not first:
+                    out.append(', ')
+                first = False
+                if item is None:
+                    out.append('null')
+                else:
+                    write_item(item, out)
+            out.append(']')
+        return _write
+
+    if MAPPING in children:
+        write_item = children[MAPPING]
+        if write_item is None:
+            return _write_empty('{}')
+
+        def _write(value, out):
+            out.append('{')
+            first = True
+            for key, item in value.items():
+                if not first:
+                    out.append(', ')
+                first = False
+                out.append(_encode_key(key))
+                if item is None:
+                    out.append('null')
+                else:
+                    write_item(item, out)
+            out.append('}')
+        return _write
+
+    def _write(value, out):
+        out.append('{')
+        first = True
+        for key, item in value.items():
+            write_item = children.get(key, rest)
+            if write_item is None:
+                continue
+            if not first:
+                out.append(', ')
+            first = False
+            out.append(_encode_key(key))
+            if item is None:
+                out.append('null')
+            else:
+                write_item(item, out)
+        out.append('}')
+    return _write
+
+
+def encoder(model, include: Iterable[str] = (), exclude: Iterable[str] = ()) -> typing.Callable:
+    """Compile a function writing the JSON of an instance with only part of its fields.
+
+    Only the flat paths in `include` are written if any are given, the
+    compounds leading to them included, and the paths in `exclude` are left
+    out. The stored data is encoded as it is walked, without copying it.
+    Encoders are cached per set of paths. A single path can be given as a string.
+    """
+    include = frozenset([include] if isinstance(include, str) else include)
+    exclude = frozenset([exclude] if isinstance(exclude, str) else exclude)
+    cache = _encoders.setdefault(model, {})
+    try:
+        return cache[include, exclude]
+    except KeyError:
+        pass
+
+    includes = {_s for _p in include for _s in _expand(model, _p)} if include else None
+    excludes = {_s for _p in exclude for _s in _expand(model, _p)}
+    encode = json.JSONEncoder(default=_json_default).encode
+
+    def _whole(value, out):
+        out.append(encode(value))
+
+    write = _compile_writer(includes, excludes, _whole) or _write_empty('{}')
+
+    def _encoder(obj):
+        out = []
+        write(obj._data, out)
+        return ''.join(out)
+
+    cache[include, exclude] = _encoder
+    return _encoder
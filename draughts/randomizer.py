@@ -1,8 +1,55 @@
+import math
+import random
+import string
+
 from .model_decorator import model_fields
 from .fields.bases import Field, ProxyField, MultivaluedField
 from . import fields
 
 
+def constrained_sample(field_spec: Field, minimal: bool = False):
+    """Sample a field, keeping to the min, max, length and choices constraints declared on it.
+
+    Minimal samples of lists and mappings hold only as many items as they must.
+    """
+    metadata = field_spec.metadata
+    if metadata.get('choices') is not None:
+        return random.choice(list(metadata['choices']))
+
+    min_length = metadata.get('min_length') or 0
+    max_length = metadata.get('max_length')
+    if isinstance(field_spec, (fields.SimpleList, fields.SimpleMapping)):
+        if minimal:
+            count = min_length
+        else:
+            count = random.randint(min_length, max_length if max_length is not None else min_length + 10)
+        items = [constrained_sample(field_spec.field, minimal) for _ in range(count)]
+        if isinstance(field_spec, fields.SimpleMapping):
+            return {f'{random.choice(string.ascii_letters)}{_i}': _v for _i, _v in enumerate(items)}
+        return items
+    if minimal and isinstance(field_spec, MultivaluedField):
+        return field_spec.cast([])
+
+    low, high = metadata.get('min'), metadata.get('max')
+    if low is not None or high is not None:
+        if isinstance(field_spec, fields.Integer):
+            low = math.ceil(low) if low is not None else math.floor(high) - 2**30
+            high = math.floor(high) if high is not None else low + 2**30
+            return random.randint(low, high)
+        if isinstance(field_spec, fields.Float):
+            low = low if low is not None else high - 1000
+            high = high if high is not None else low + 1000
+            return random.uniform(low, high)
+
+    value = field_spec.sample()
+    if isinstance(value, (str, bytes)):
+        if max_length is not None:
+            value = value[:max_length]
+        if len(value) < min_length:
+            value += (b'x' if isinstance(value, bytes) else 'x') * (min_length - len(value))
+    return value
+
+
 def minimal_field_sample(field_spec: Field):
     if isinstance(field_spec, (ProxyField, MultivaluedField)):
         # Explicitly recursively call minimal sample on compounds
@@ -12,10 +59,10 @@ def minimal_field_sample(field_spec: Field):
             # ProxyField types should handle an empty iterable, but return a tuple
             return field_spec.cast([])[0]
         else:
-            # MultiValueField types should be able to handle an empty iterable
-            return field_spec.cast([])
+            # MultiValueField types hold no more items than their constraints require
+            return constrained_sample(field_spec, minimal=True)
     # all non complex fields can be sampled directly in the minimal case
-    return field_spec.sample()
+    return constrained_sample(field_spec, minimal=True)
 
 
 def minimal_sample(model, **data):
@@ -31,5 +78,5 @@ def sample(model, **data):
     for field_name, field_spec in model_fields(model).items():
         if field_name in data:
             continue
-        data[field_name] = field_spec.sample()
+        data[field_name] = constrained_sample(field_spec)
     return model(data)
@@ -0,0 +1,468 @@
+"""An in memory store of model instances with secondary indexes on their indexed fields."""
+import bisect
+import functools
+import operator
+import typing
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .model_decorator import model_fields, observe, unobserve
+from .fields import Compound, ListTypes, MappingTypes, Integer, Float
+from .fields.bases import Field, MultiField
+from .path import tokenize, join, resolve, fans_out, getter, LIST, MAPPING
+
+_operators = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda value, options: value in options,
+}
+_ranges = {'<', '<=', '>', '>='}
+_MISSING = object()
+_CHUNK = 512
+
+Condition = Tuple[str, str, Any]
+
+
+def _indexed_fields(model, index: bool = False, prefix: Tuple[str, ...] = ()) -> List[Tuple[Tuple[str, ...], Field]]:
+    """Find the paths of the indexed values of a model, fields without an index setting follow their parent."""
+    found = []
+    for name, field in model_fields(model).items():
+        if not isinstance(field, MultiField):
+            found.extend(_indexed_field(field, index, prefix + (name,)))
+    return found
+
+
+def _indexed_field(field: Field, index: bool, path: Tuple[str, ...]):
+    if field['index'] is False:
+        return []
+    if field['index'] is not None:
+        index = field['index']
+    if isinstance(field, Compound):
+        return _indexed_fields(field.model, index, path)
+    if isinstance(field, ListTypes):
+        return _indexed_field(field.field, index, path + (LIST,))
+    if isinstance(field, MappingTypes):
+        return _indexed_field(field.field, index, path + (MAPPING,))
+    return [(path, field)] if index else []
+
+
+class _HashIndex:
+    """The keys of the records holding each value.
+
+    Most values are held by a single record, so a lone key is stored as it is
+    and only replaced with a set once a second record holds the same value.
+    """
+    def __init__(self):
+        self.entries: Dict[Any, Any] = {}
+
+    def add(self, value, key):
+        entries = self.entries
+        found = entries.get(value, _MISSING)
+        if found is _MISSING:
+            entries[value] = key
+        elif type(found) is set:
+            found.add(key)
+        else:
+            entries[value] = {found, key}
+
+    def remove(self, value, key):
+        entries = self.entries
+        found = entries[value]
+        if type(found) is set:
+            found.discard(key)
+            if len(found) == 1:
+                entries[value], = found
+        else:
+            del entries[value]
+
+    def equal(self, value):
+        found = self.entries.get(value, _MISSING)
+        if found is _MISSING:
+            return ()
+        if type(found) is set:
+            return found
+        return (found,)
+
+
+class _SortedIndex:
+    """Values in sorted order alongside the keys of the records holding them.
+
+    Entries are kept in a list of chunks, so adding or removing one only moves
+    the entries of a single chunk rather than the whole index.
+    """
+    def __init__(self):
+        self.values: List[List] = []
+        self.keys: List[List] = []
+        self.maxes: List = []
+
+    def add(self, value, key):
+        if not self.maxes:
+            self.values, self.keys, self.maxes = [[value]], [[key]], [value]
+            return
+        chunk = min(bisect.bisect_right(self.maxes, value), len(self.maxes) - 1)
+        values = self.values[chunk]
+        keys = self.keys[chunk]
+        position = bisect.bisect_right(values, value)
+        values.insert(position, value)
+        keys.insert(position, key)
+        self.maxes[chunk] = values[-1]
+        if len(values) > 2 * _CHUNK:
+            self.values[chunk:chunk + 1] = [values[:_CHUNK], values[_CHUNK:]]
+            self.keys[chunk:chunk + 1] = [keys[:_CHUNK], keys[_CHUNK:]]
+            self.maxes[chunk:chunk + 1] = [values[_CHUNK - 1], values[-1]]
+
+    def extend(self, values: List, keys: List):
+        """Add many entries, sorting once at the end rather than inserting each in place."""
+        for chunk_values, chunk_keys in zip(self.values, self.keys):
+            values.extend(chunk_values)
+            keys.extend(chunk_keys)
+        order = sorted(range(len(values)), key=values.__getitem__)
+        values = [values[_i] for _i in order]
+        keys = [keys[_i] for _i in order]
+        self.values = [values[_i:_i + _CHUNK] for _i in range(0, len(values), _CHUNK)]
+        self.keys = [keys[_i:_i + _CHUNK] for _i in range(0, len(keys), _CHUNK)]
+        self.maxes = [_c[-1] for _c in self.values]
+
+    def remove(self, value, key):
+        # Equal values can run over several chunks
+        for chunk in range(bisect.bisect_left(self.maxes, value), len(self.maxes)):
+            values = self.values[chunk]
+            keys = self.keys[chunk]
+            start = bisect.bisect_left(values, value)
+            end = bisect.bisect_right(values, value, start)
+            if key in keys[start:end]:
+                position = keys.index(key, start, end)
+                del values[position]
+                del keys[position]
+                if values:
+                    self.maxes[chunk] = values[-1]
+                else:
+                    del self.values[chunk], self.keys[chunk], self.maxes[chunk]
+                return
+            if end < len(values):
+                break
+        raise KeyError(value)
+
+    def _position(self, value, after: bool) -> Tuple[int, int]:
+        search = bisect.bisect_right if after else bisect.bisect_left
+        chunk = search(self.maxes, value)
+        if chunk == len(self.maxes):
+            return chunk, 0
+        return chunk, search(self.values[chunk], value)
+
+    def _slice(self, start: Tuple[int, int], end: Tuple[int, int]) -> List:
+        (first, offset), (last, limit) = start, end
+        if first == last:
+            return self.keys[first][offset:limit] if first < len(self.keys) else []
+        keys = self.keys[first][offset:]
+        for chunk in self.keys[first + 1:last]:
+            keys.extend(chunk)
+        if last < len(self.keys):
+            keys.extend(self.keys[last][:limit])
+        return keys
+
+    def equal(self, value):
+        return self._slice(self._position(value, False), self._position(value, True))
+
+    def range(self, op: str, value) -> List:
+        if op == '<':
+            return self._slice((0, 0), self._position(value, False))
+        if op == '<=':
+            return self._slice((0, 0), self._position(value, True))
+        if op == '>':
+            return self._slice(self._position(value, True), (len(self.maxes), 0))
+        return self._slice(self._position(value, False), (len(self.maxes), 0))
+
+
+def _compile_predicate(model, path: str, op: str):
+    """Build a check of a condition on raw model data, any value on a fanned out path can match."""
+    try:
+        compare = _operators[op]
+    except KeyError:
+        raise ValueError(f"Unknown query operator {op}")
+    steps, _ = resolve(model, path)
+    get = getter(model, path)
+
+    if fans_out(steps):
+        def _check(data, value):
+            return any(compare(_v, value) for _v in get(data) if _v is not None)
+    else:
+        def _check(data, value):
+            found = get(data)
+            return found is not None and compare(found, value)
+    return _check
+
+
+class ModelStore:
+    """Model instances kept by a primary key, with indexes on the fields marked `index=True`.
+
+    Integer, Float and Timestamp fields get a sorted index that answers both
+    equality and range conditions, other indexed fields get a hash index.
+    Fields without an `index` setting take it from the compound containing
+    them. Assigning a field of a stored instance, or of a compound inside it,
+    updates the indexes. Changes made in place to lists and mappings aren't
+    seen, call `reindex` after them. If the key of an instance is changed to
+    one already in use, the instance is dropped from the store and the
+    assignment raises a ValueError.
+    """
+    def __init__(self, model, key: str):
+        steps, _ = resolve(model, key)
+        if fans_out(steps):
+            raise ValueError(f"Key path {key} can select more than one value")
+        self.model = model
+        self.key = key
+        self._get_key = getter(model, key)
+
+        indexed = _indexed_fields(model)
+        self.paths = tuple(join(_p) for _p, _ in indexed)
+        self._positions = {_p: _i for _i, (_p, _) in enumerate(indexed)}
+        self._extractors = tuple((getter(model, join(_p)), fans_out(_p)) for _p, _ in indexed)
+        self._indexes = tuple(_SortedIndex() if isinstance(_f, (Integer, Float)) else _HashIndex()
+                              for _, _f in indexed)
+
+        # The compounds to watch for changes, along each path up to its leaf or the first list or mapping
+        watched = set()
+        for path in [steps] + [_p for _p, _ in indexed]:
+            for end in range(1, len(path)):
+                if path[end] in (LIST, MAPPING):
+                    break
+                watched.add(path[:end])
+        self._watched = tuple(sorted(watched))
+        self._watched_names = {_p[-1] for _p in watched}
+        self._on_change = self._root_changed
+
+        self._objects: Dict[Any, Any] = {}
+        self._values: Dict[Any, Tuple] = {}
+        self._children: Dict[Any, Tuple] = {}
+        self._keys: Dict[int, Any] = {}
+        self._predicates: Dict[Tuple[str, str], typing.Callable] = {}
+
+    def _extract(self, obj) -> Tuple:
+        """Get the value at each indexed path of an instance, or the distinct values for paths that fan out."""
+        data = obj._data
+        values = []
+        for get, fan_out in self._extractors:
+            value = get(data)
+            if fan_out:
+                value = tuple(dict.fromkeys(_v for _v in value if _v is not None))
+            values.append(value)
+        return tuple(values)
+
+    def _index(self, key, values, positions=None):
+        for position in positions if positions is not None else range(len(values)):
+            value = values[position]
+            if self._extractors[position][1]:
+                add = self._indexes[position].add
+                for item in value:
+                    add(item, key)
+            elif value is not None:
+                self._indexes[position].add(value, key)
+
+    def _unindex(self, key, values, positions=None):
+        for position in positions if positions is not None else range(len(values)):
+            value = values[position]
+            if self._extractors[position][1]:
+                remove = self._indexes[position].remove
+                for item in value:
+                    remove(item, key)
+            elif value is not None:
+                self._indexes[position].remove(value, key)
+
+    def _watch(self, obj, key):
+        targets = []
+        for path in self._watched:
+            node = obj
+            for name in path:
+                node = node._compounds.get(name)
+                if node is None:
+                    break
+            else:
+                targets.append(node)
+        if targets:
+            callback = functools.partial(self._child_changed, obj)
+            for target in targets:
+                observe(target, callback)
+            self._children[key] = (callback, targets)
+
+    def _unwatch(self, key):
+        callback, targets = self._children.pop(key, (None, ()))
+        for target in targets:
+            unobserve(target, callback)
+
+    def _prepare(self, obj):
+        if not isinstance(obj, self.model):
+            obj = self.model(obj)
+        key = self._get_key(obj._data)
+        if key is None:
+            raise ValueError(f"Missing key {self.key} for {self.model.__name__} in store")
+        if key in self._objects:
+            raise ValueError(f"Duplicate key {key!r} in store")
+        return obj, key
+
+    def _insert(self, obj, key, values):
+        self._objects[key] = obj
+        self._values[key] = values
+        self._keys[id(obj)] = key
+        observe(obj, self._on_change)
+        if self._watched:
+            self._watch(obj, key)
+
+    def add(self, obj):
+        """Add an instance, or data to construct one, returning the stored instance."""
+        obj, key = self._prepare(obj)
+        values = self._extract(obj)
+        self._insert(obj, key, values)
+        self._index(key, values)
+        return obj
+
+    def add_many(self, objs: Iterable):
+        """Add many instances, building the sorted indexes once rather than inserting into them each time."""
+        pending = []
+        adders = []
+        for index, (_, fan_out) in zip(self._indexes, self._extractors):
+            if isinstance(index, _SortedIndex):
+                entries = ([], [])
+                pending.append((index, entries))
+
+                def add(value, key, _values=entries[0].append, _keys=entries[1].append):
+                    _values(value)
+                    _keys(key)
+            else:
+                add = index.add
+            adders.append((add, fan_out))
+
+        # Check the whole batch before touching the store so a bad entry leaves it unchanged
+        prepare = self._prepare
+        extract = self._extract
+        batch = {}
+        for obj in objs:
+            obj, key = prepare(obj)
+            if key in batch:
+                raise ValueError(f"Duplicate key {key!r} in store")
+            batch[key] = (obj, extract(obj))
+
+        insert = self._insert
+        for key, (obj, values) in batch.items():
+            insert(obj, key, values)
+            for value, (add, fan_out) in zip(values, adders):
+                if fan_out:
+                    for item in value:
+                        add(item, key)
+                elif value is not None:
+                    add(value, key)
+
+        for index, entries in pending:
+            if entries[0]:
+                index.extend(*entries)
+
+    def remove(self, key):
+        """Remove and return the instance with a key."""
+        obj = self._objects.pop(key)
+        unobserve(obj, self._on_change)
+        self._unwatch(key)
+        del self._keys[id(obj)]
+        self._unindex(key, self._values.pop(key))
+        return obj
+
+    def reindex(self, obj):
+        """Update the indexes for an instance after changing it in ways the store can't see."""
+        self._update(obj, None)
+
+    def _root_changed(self, obj, name):
+        self._update(obj, name)
+
+    def _child_changed(self, root, obj, name):
+        self._update(root, name)
+
+    def _update(self, obj, name):
+        key = self._keys.get(id(obj))
+        if key is None or self._objects.get(key) is not obj:
+            return
+        if self._get_key(obj._data) != key:
+            self.remove(key)
+            self.add(obj)
+            return
+
+        before = self._values[key]
+        after = self._values[key] = self._extract(obj)
+        changed = [_p for _p, (_b, _a) in enumerate(zip(before, after)) if _b != _a]
+        if changed:
+            self._unindex(key, before, changed)
+            self._index(key, after, changed)
+        if name is None or name in self._watched_names:
+            self._unwatch(key)
+            self._watch(obj, key)
+
+    def get(self, key, default=None):
+        return self._objects.get(key, default)
+
+    def __getitem__(self, key):
+        return self._objects[key]
+
+    def __contains__(self, key):
+        return key in self._objects
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._objects.values())
+
+    def keys(self):
+        return self._objects.keys()
+
+    def _predicate(self, path: str, op: str):
+        try:
+            return self._predicates[(path, op)]
+        except KeyError:
+            check = self._predicates[(path, op)] = _compile_predicate(self.model, path, op)
+            return check
+
+    def query(self, *conditions: Condition) -> List:
+        """Find the instances matching every condition, in no particular order.
+
+        Conditions are `(path, operator, value)` with one of the operators
+        `==`, `!=`, `<`, `<=`, `>`, `>=` or `in`. Conditions on indexed paths are
+        answered from the indexes, the rest are checked against each candidate.
+        On paths through a list or mapping a condition matches if any value does.
+        """
+        candidates = []
+        residual = []
+        for path, op, value in conditions:
+            check = self._predicate(path, op)
+            position = self._positions.get(tokenize(path))
+            index = None if position is None else self._indexes[position]
+            if index is not None and op == '==':
+                candidates.append(index.equal(value))
+            elif index is not None and op == 'in':
+                candidates.append(set().union(*(index.equal(_v) for _v in value)))
+            elif isinstance(index, _SortedIndex) and op in _ranges:
+                candidates.append(index.range(op, value))
+            else:
+                residual.append((check, value))
+
+        objects = self._objects
+        if candidates:
+            candidates.sort(key=len)
+            keys = candidates[0]
+            if len(candidates) > 1:
+                keys = set(keys)
+                for other in candidates[1:]:
+                    if not keys:
+                        break
+                    keys.intersection_update(other)
+            found: Iterable = (objects[_k] for _k in keys)
+        else:
+            found = objects.values()
+
+        if not residual:
+            return list(found)
+        return [_o for _o in found if all(check(_o._data, value) for check, value in residual)]
+
+    def first(self, *conditions: Condition) -> Optional[Any]:
+        """Find one instance matching every condition, or None."""
+        found = self.query(*conditions)
+        return found[0] if found else None
@@ -0,0 +1,104 @@
+"""Construct models from large JSON documents without loading the whole document first."""
+import codecs
+import json
+import re
+from typing import Iterator
+
+_whitespace = re.compile(r'[ \t\n\r]*')
+
+# The most text a truncated token (a literal like -Infinity, or a \uXXXX escape) leaves after where an error is reported
+_PARTIAL_TOKEN = 16
+
+# Characters that can follow a complete element
+_DELIMITERS = {',', ']', ' ', '\t', '\n', '\r'}
+
+
+class _TextReader:
+    """Read text from a file opened in either text or binary mode."""
+    def __init__(self, fp):
+        self.fp = fp
+        self.decoder = None
+
+    def read(self, size: int) -> str:
+        while True:
+            data = self.fp.read(size)
+            if isinstance(data, str):
+                return data
+            if self.decoder is None:
+                self.decoder = codecs.getincrementaldecoder('utf-8')()
+            text = self.decoder.decode(data, final=not data)
+            # A read can end part way through a character, only return nothing at the end of the file
+            if text or not data:
+                return text
+
+
+def iter_json_array(fp, model, chunk_size: int = 2**16) -> Iterator:
+    """Construct a model from each element of a JSON array as it is read from a file.
+
+    The file is read `chunk_size` characters (or bytes) at a time, only the
+    text of the element being parsed is kept, so memory use is bounded by the
+    largest element rather than the whole document.
+    """
+    read = _TextReader(fp).read
+    raw_decode = json.JSONDecoder().raw_decode
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def fill(size):
+        nonlocal buffer, pos, eof
+        text = read(size)
+        eof = not text
+        buffer = buffer[pos:] + text
+        pos = 0
+
+    def skip() -> str:
+        """Move past any whitespace, returning the next character, or nothing at the end of the file."""
+        nonlocal pos
+        while True:
+            pos = _whitespace.match(buffer, pos).end()
+            if pos < len(buffer) or eof:
+                return buffer[pos:pos + 1]
+            fill(chunk_size)
+
+    def decode():
+        nonlocal pos
+        size = chunk_size
+        while True:
+            skip()
+            try:
+                value, end = raw_decode(buffer, pos)
+            except json.JSONDecodeError as error:
+                # Only errors at the end of what has been read, or in a string running up to it, can be fixed by
+                # reading more, don't buffer the rest of the file when an element is malformed
+                truncated = error.pos >= len(buffer) - _PARTIAL_TOKEN or error.msg.startswith('Unterminated string')
+                if eof or not truncated:
+                    raise ValueError(f"Invalid element in JSON array: {error}") from None
+            else:
+                # Anything but an object or array could continue past the end of what we have read, a number
+                # cut off part way through its fraction or exponent parses but stops just before the cut
+                if eof or isinstance(value, (dict, list)) or buffer[end:end + 1] in _DELIMITERS \
+                        or end < len(buffer) - _PARTIAL_TOKEN:
+                    pos = end
+                    return value
+            # Grow reads with the element so large elements aren't parsed from the start too often
+            size = max(size, len(buffer) - pos)
+            fill(size)
+
+    if skip() != '[':
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    if skip() == ']':
+        pos += 1
+    else:
+        while True:
+            yield model(decode())
+            token = skip()
+            pos += 1
+            if token == ']':
+                break
+            if token != ',':
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {token!r}")
+
+    if skip():
+        raise ValueError("Unexpected data after JSON array")
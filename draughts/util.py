@@ -1,8 +1,12 @@
+import copy
 import typing
-from .model_decorator import model_fields
-from .fields import ListTypes, Compound
+from .model_decorator import ClassCache, model_fields, trusted, is_frozen
+from .fields import ListTypes, MappingTypes, Compound, Any
+from .fields.bases import MultiField, MultivaluedField, ProxyField
 import collections.abc
 
+_copiers: typing.Dict[type, typing.Tuple] = typing.cast(typing.Dict, ClassCache('copiers'))
+
 
 def recursive_update(d: typing.Dict, u: typing.Mapping) -> typing.Union[typing.Dict, typing.Mapping]:
     if d is None:
@@ -68,3 +72,92 @@ def construct_safe(mod, data) -> typing.Tuple[typing.Any, typing.Dict]:
         return mod(clean), dropped
     except ValueError as _:
         return None, recursive_update(dropped, clean)
+
+
+def _value_copier(field) -> typing.Optional[typing.Callable]:
+    """A function to copy the data of a field, or None if the data is never changed in place and can be shared."""
+    if isinstance(field, Compound):
+        model = field.model
+        return lambda value: _copy_data(model, value)
+    if isinstance(field, ProxyField):
+        item = _value_copier(field.field)
+        if isinstance(field, MappingTypes):
+            return dict if item is None else lambda value: {_k: item(_v) for _k, _v in value.items()}
+        return list if item is None else lambda value: [item(_v) for _v in value]
+    if isinstance(field, MultivaluedField):
+        # Build the typed container directly, so it isn't copied again when the model wraps it
+        item = _value_copier(field.field)
+        if item is None:
+            return lambda value: field.container(value, field.field.cast, trusted=True)
+        if isinstance(field, MappingTypes):
+            return lambda value: field.container({_k: item(_v) for _k, _v in value.items()}, field.field.cast,
+                                                 trusted=True)
+        return lambda value: field.container([item(_v) for _v in value], field.field.cast, trusted=True)
+    if isinstance(field, Any):
+        return copy.deepcopy
+    return None
+
+
+def _copier(model):
+    try:
+        return _copiers[model]
+    except KeyError:
+        pass
+    keys = set()
+    copiers = []
+    for name, field in model_fields(model).items():
+        if isinstance(field, MultiField):
+            keys.update(field.components())
+            continue
+        keys.add(name)
+        copy_value = _value_copier(field)
+        if copy_value is not None:
+            copiers.append((name, copy_value))
+    entry = _copiers[model] = (frozenset(keys), tuple(copiers))
+    return entry
+
+
+def _copy_data(model, data: dict) -> dict:
+    keys, copiers = _copier(model)
+    copied = dict(data)
+    for name, copy_value in copiers:
+        value = copied.get(name)
+        if value is not None:
+            copied[name] = copy_value(value)
+    # Models that aren't strict can hold other keys, nothing is known about them
+    for key in copied.keys() - keys:
+        copied[key] = copy.deepcopy(copied[key])
+    return copied
+
+
+def clone(obj, **overrides):
+    """Copy a model instance without casting its data again, then set the fields given.
+
+    Containers are copied and values that can't be changed in place are
+    shared with the original. Only the overrides are cast. Frozen instances
+    are returned as they are when there is nothing to override.
+    """
+    model = obj.__class__
+    if not overrides and is_frozen(model):
+        return obj
+
+    data = _copy_data(model, obj._data)
+    fields = model_fields(model)
+    for name, value in overrides.items():
+        field = fields.get(name)
+        if field is None:
+            raise ValueError(f"Unexpected key provided: {name}")
+        if value is None and not field.metadata.get('optional', False):
+            raise ValueError(f"Missing key [{name}] to construct {model.__name__}")
+        if isinstance(field, MultiField):
+            if value is None:
+                for component in field.components():
+                    data.pop(component, None)
+            else:
+                field.proxy(data, field.cast(value))
+        elif isinstance(field, ProxyField):
+            # Instances and their containers give up their own data, so copy it rather than share it with them
+            data[name] = None if value is None else _value_copier(field)(field.cast_data(value))
+        else:
+            data[name] = field.cast(value)
+    return trusted(model, data)
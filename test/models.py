@@ -0,0 +1,52 @@
+"""Models shared by the tests walking whole documents, containers use factories so no test sees another's changes."""
+from draughts import model
+from draughts.fields import Integer, Float, Keyword, Boolean, List, Mapping, Compound, SeparatedFraction
+
+
+@model
+class Leaf:
+    value = Integer()
+    tags = List(Keyword(), factory=list)
+    scores = Mapping(Float(), factory=dict)
+
+    def total(self):
+        return self.value + len(self.tags)
+
+
+@model
+class Branch:
+    name = Keyword()
+    leaf = Compound(Leaf, optional=True)
+    leaves = List(Compound(Leaf), factory=list)
+
+
+@model(cache_json=True)
+class Tree:
+    name = Keyword()
+    flag = Boolean(default=False)
+    ratio = SeparatedFraction(default=1)
+    leaf = Compound(Leaf)
+    branch = Compound(Branch, optional=True)
+    branches = List(Compound(Branch), factory=list)
+    leaves = List(Compound(Leaf), factory=list)
+    named = Mapping(Compound(Leaf), factory=dict)
+    lazy = List(Compound(Leaf), lazy=True, factory=list)
+    counts = Mapping(Integer(), factory=dict)
+    samples = List(Float(), packed=True, factory=list)
+
+
+def make_tree():
+    return Tree({
+        'name': 'tree',
+        'leaf': {'value': 1, 'tags': ['a']},
+        'branch': {'name': 'b', 'leaves': [{'value': 2}]},
+        'branches': [
+            {'name': 'c', 'leaf': {'value': 3}, 'leaves': [{'value': 4, 'scores': {'x': 0.5}}]},
+            {'name': 'd'},
+        ],
+        'leaves': [{'value': 5}, {'value': 6, 'scores': {'y': 1.5}}],
+        'named': {'e': {'value': 7}},
+        'lazy': [{'value': 8}],
+        'counts': {'a': 1},
+        'samples': [0.5, 1],
+    })
@@ -0,0 +1,113 @@
+import asyncio
+import concurrent.futures
+import json
+
+import pytest
+
+from draughts import model
+from draughts.aio import validate_stream, collect
+from draughts.fields import Integer, Keyword
+
+
+@model
+class Event:
+    name = Keyword()
+    value = Integer()
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def lines(count):
+    return [json.dumps({'name': f'event-{_i}', 'value': _i}) + '\n' for _i in range(count)]
+
+
+async def iterate(records):
+    for record in records:
+        yield record
+
+
+def test_stream_reader():
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(''.join(lines(1000)).encode() + b'\n')
+        reader.feed_eof()
+        return await collect(reader, Event, chunk_size=64)
+
+    events = run(read())
+    assert [_e.value for _e in events] == list(range(1000))
+    assert all(isinstance(_e, Event) for _e in events)
+
+
+def test_async_iterable():
+    records = lines(10) + [{'name': 'dict', 'value': '10'}]
+    events = run(collect(iterate(records), Event))
+    assert [_e.value for _e in events] == list(range(11))
+    assert events[-1].name == 'dict'
+
+
+def test_executor():
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        events = run(collect(iterate(lines(500)), Event, executor=executor, chunk_size=50))
+    assert [_e.value for _e in events] == list(range(500))
+
+
+@pytest.mark.parametrize('threaded', [False, True])
+def test_errors_in_order(threaded):
+    records = lines(5) + [{'name': 'bad', 'value': 'cats'}] + lines(5)
+
+    async def read(executor):
+        seen = []
+        with pytest.raises(ValueError):
+            async for event in validate_stream(iterate(records), Event, executor=executor):
+                seen.append(event.value)
+        return seen
+
+    # The bad record is in the middle of a chunk, the models before it still arrive
+    if threaded:
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            assert run(read(executor)) == [0, 1, 2, 3, 4]
+    else:
+        assert run(read(None)) == [0, 1, 2, 3, 4]
+
+
+def test_yields_to_loop():
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    async def read():
+        task = asyncio.ensure_future(ticker())
+        events = await collect(iterate(lines(2000)), Event, time_slice=0, chunk_size=2000)
+        task.cancel()
+        return events
+
+    assert len(run(read())) == 2000
+    assert len(ticks) > 100
+
+
+def test_backpressure():
+    produced = []
+
+    async def source():
+        for record in lines(10000):
+            produced.append(record)
+            yield record
+
+    async def read():
+        async with validate_stream(source(), Event, chunk_size=10, queue_size=2) as events:
+            first = await events.__anext__()
+            for _ in range(20):
+                await asyncio.sleep(0)
+            return first
+
+    assert run(read()).value == 0
+    assert len(produced) < 100
@@ -0,0 +1,134 @@
+import enum
+import fractions
+import json
+
+import pytest
+
+from draughts import model, raw, dumps
+from draughts.model_decorator import trusted
+from draughts import fields
+from draughts.binary import encode, decode
+from draughts.randomizer import sample
+
+
+class Colour(enum.Enum):
+    Red = 'red'
+    Green = 'green'
+
+
+@model
+class Inner:
+    number = fields.Integer()
+    text = fields.String(optional=True)
+
+
+@model
+class Everything:
+    any = fields.Any()
+    boolean = fields.Boolean()
+    integer = fields.Integer()
+    float = fields.Float()
+    timestamp = fields.Timestamp()
+    keyword = fields.Keyword()
+    text = fields.Text()
+    date = fields.DateString()
+    json = fields.JSON()
+    enum = fields.Enum(Colour)
+    enum_value = fields.Enum(Colour, store_value=True)
+    data = fields.Bytes()
+    md5 = fields.MD5()
+    ratio: fractions.Fraction = fields.SeparatedFraction()
+    inner = fields.Compound(Inner)
+    inners = fields.List(fields.Compound(Inner))
+    named = fields.Mapping(fields.Compound(Inner))
+    numbers = fields.List(fields.Integer())
+    grid = fields.List(fields.List(fields.Float()))
+    counts = fields.Mapping(fields.Integer())
+    maybe_integer = fields.Integer(optional=True)
+    maybe_inner = fields.Compound(Inner, optional=True)
+    maybe_ratio = fields.SeparatedFraction(optional=True)
+
+
+def sample_everything(**data):
+    obj = sample(Everything, **data)
+    # Sampling leaves the fraction objects next to their components in the data
+    raw(obj).pop('ratio', None)
+    raw(obj).pop('maybe_ratio', None)
+    return obj
+
+
+def test_round_trip():
+    for _ in range(20):
+        obj = sample_everything()
+        buf = encode(obj)
+        copy = decode(Everything, buf)
+        assert raw(copy) == raw(obj)
+        assert raw(decode(Everything, buf, trusted=True)) == raw(obj)
+
+
+def test_optional_and_values():
+    obj = sample_everything(integer=-2**70, maybe_integer=None, maybe_inner=None)
+    del raw(obj)['maybe_integer']
+    copy = decode(Everything, encode(obj))
+    assert copy.integer == -2**70
+    assert copy.maybe_integer is None
+    assert copy.maybe_inner is None
+    assert 'maybe_integer' not in raw(copy)
+    assert copy.inner.number == obj.inner.number
+    assert copy.ratio == obj.ratio
+
+    # The rebuilt model still checks types
+    with pytest.raises(ValueError):
+        copy.numbers.append('cats')
+
+
+def test_checked_by_default():
+    @model
+    class Checked:
+        md5 = fields.MD5()
+        size = fields.Integer(min=0)
+
+    buf = encode(trusted(Checked, {'md5': 'not a hash', 'size': -1}))
+    with pytest.raises(ValueError):
+        decode(Checked, buf)
+    assert raw(decode(Checked, buf, trusted=True)) == {'md5': 'not a hash', 'size': -1}
+
+
+def test_optional_items_and_keys():
+    @model
+    class Sparse:
+        numbers = fields.List(fields.Integer(optional=True))
+        named = fields.Mapping(fields.Keyword(optional=True))
+        counts = fields.Mapping(fields.Integer())
+
+    obj = Sparse(numbers=[1, None, -3], named={'a': None, 'b': 'x'},
+                 counts={'a': 1, 2: 2, 2.5: 3, False: 4, None: 5})
+    for trust in (True, False):
+        copy = decode(Sparse, encode(obj), trusted=trust)
+        assert raw(copy) == raw(obj)
+        assert [type(_k) for _k in copy.counts] == [str, int, float, bool, type(None)]
+
+    obj.counts[(1, 2)] = 6
+    with pytest.raises(ValueError):
+        encode(obj)
+
+
+def test_smaller_than_json():
+    @model
+    class Event:
+        kind = fields.Keyword()
+        at = fields.Timestamp()
+        size = fields.Integer()
+        tags = fields.List(fields.Keyword())
+
+    obj = Event(kind='open', at=1600000000.5, size=100, tags=['a', 'b'])
+    assert len(encode(obj)) < len(dumps(obj))
+    assert json.loads(dumps(decode(Event, encode(obj)))) == json.loads(dumps(obj))
+
+
+def test_bad_buffer():
+    buf = encode(sample_everything())
+    with pytest.raises(ValueError):
+        decode(Everything, buf[:len(buf) // 2])
+    with pytest.raises(ValueError):
+        decode(Everything, buf + b'\x00')
@@ -0,0 +1,118 @@
+import pytest
+
+from draughts import model
+from draughts.fields import String, Integer, Float, Boolean, Keyword, List, Mapping, Compound, MD5, DateString
+from draughts.fields.constraints import compile_cast
+
+
+@model
+class Item:
+    name = Keyword(min_length=1, max_length=8)
+    count = Integer(min=0, max=100)
+    price = Float(min=0, optional=True)
+    color = String(choices=['red', 'blue'], default='red')
+    hash = MD5(optional=True)
+    tags = List(Integer(min=1), max_length=3, default=[])
+    scores = Mapping(Float(max=1.0), default={})
+
+
+def test_constraints():
+    item = Item(name=b'box', count='5')
+    assert item.name == 'box' and item.count == 5 and item.price is None and item.color == 'red'
+
+    item.count = 0
+    item.count = 100
+    with pytest.raises(ValueError, match='count must be at most 100'):
+        item.count = 101
+    with pytest.raises(ValueError, match='count must be at least 0'):
+        Item(name='box', count=-1)
+    with pytest.raises(ValueError, match='name must have at least 1'):
+        item.name = ''
+    with pytest.raises(ValueError, match='at most 8 characters'):
+        item.name = 'x' * 9
+    with pytest.raises(ValueError, match='color must be one of'):
+        item.color = 'green'
+    with pytest.raises(ValueError):
+        item.price = -0.5
+    with pytest.raises(ValueError, match='Illegal value for MD5'):
+        item.hash = 'abc'
+    item.hash = 'a' * 32
+
+    # Lists and mappings check their length and their items
+    item.tags = [1, 2, 3]
+    with pytest.raises(ValueError, match='at most 3 items'):
+        item.tags = [1, 2, 3, 4]
+    with pytest.raises(ValueError, match='at least 1'):
+        item.tags.append(0)
+    with pytest.raises(ValueError):
+        item.scores['a'] = 2
+    assert item.tags == [1, 2, 3] and item.scores == {}
+
+    with pytest.raises(ValueError):
+        @model
+        class Bad:
+            item = Compound(Item, min=1)
+
+
+def test_compiled_casts():
+    # Unconstrained fields with no conversion to add keep their own cast
+    date = DateString()
+    assert compile_cast(date) == date.cast
+
+    flag = Boolean(optional=True)
+    cast = compile_cast(flag)
+    assert [cast(_v) for _v in (None, True, 'False', 'yes', 0)] == [None, True, False, True, False]
+
+    # Compiling again starts from the original cast
+    flag.cast = cast
+    assert compile_cast(flag).__wrapped__ == cast.__wrapped__
+
+    class Upper(String):
+        def cast(self, value):
+            return super().cast(value).upper()
+
+    assert compile_cast(Upper(choices=['A']))('a') == 'A'
+    assert compile_cast(Keyword(intern=True))('abc') == 'abc'
+
+
+class Even(Integer):
+    def cast(self, value):
+        value = super().cast(value)
+        if value % 2:
+            raise ValueError(f"{value} is odd")
+        return value
+
+
+@model
+class Packed:
+    counts = List(Integer(min=0), packed=True, default=[])
+    evens = List(Even(), packed=True, default=[])
+    ratios = List(Float(max=1.0), packed=True, default=[])
+
+
+def test_packed_constraints():
+    packed = Packed(counts=[1, '2'], evens=[0, 2], ratios=[0.5, 1])
+    assert packed.counts == [1, 2] and packed.evens == [0, 2] and packed.ratios == [0.5, 1.0]
+
+    # Every way in checks the items, and a failure leaves the list as it was
+    for counts, evens, ratios in [([-5, 3], [], []), ([], [1], []), ([], [], [1.5])]:
+        with pytest.raises(ValueError):
+            Packed(counts=counts, evens=evens, ratios=ratios)
+    with pytest.raises(ValueError, match='at least 0'):
+        packed.counts.extend([3, -1])
+    with pytest.raises(ValueError, match='at least 0'):
+        packed.counts[0:1] = [-1]
+    with pytest.raises(ValueError, match='at least 0'):
+        packed.counts += [-1]
+    with pytest.raises(ValueError, match='odd'):
+        packed.evens.extend([4, 3])
+    with pytest.raises(ValueError):
+        packed.ratios[:] = [2.0]
+    assert packed.counts == [1, 2] and packed.evens == [0, 2] and packed.ratios == [0.5, 1.0]
+
+    packed.counts[0:1] = [7, 8]
+    packed.evens.extend(['4'])
+    assert packed.counts == [7, 8, 2] and packed.evens == [0, 2, 4]
+
+    with pytest.raises(ValueError):
+        List(Integer(optional=True), packed=True)
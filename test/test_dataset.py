@@ -0,0 +1,107 @@
+import json
+import os
+
+import pytest
+
+from draughts import model, raw
+from draughts.dataset import Dataset, build_index, open_dataset
+from draughts.fields import Any, Compound, Integer, Keyword, List
+
+
+@model
+class Source:
+    id = Keyword()
+
+
+@model
+class Entry:
+    value = Integer()
+    source = Compound(Source)
+    tags = List(Keyword(), default=[])
+
+
+@model
+class Loose:
+    value = Integer()
+    source = Compound(Source)
+    extra = Any()
+
+
+def write(path, count):
+    with open(path, 'w') as out:
+        for index in range(count):
+            out.write(json.dumps({'value': index, 'source': {'id': f'id-{index}'}}) + '\n')
+            if index % 10 == 0:
+                out.write('\n')
+
+
+def test_positions(tmpdir):
+    path = str(tmpdir.join('data.jsonl'))
+    write(path, 100)
+
+    with open_dataset(path, Entry) as data:
+        assert len(data) == 100
+        assert os.path.exists(path + '.idx')
+        assert data[0].value == 0
+        assert data[57].source.id == 'id-57'
+        assert data[-1].value == 99
+        with pytest.raises(IndexError):
+            data[100]
+        assert [_e.value for _e in data] == list(range(100))
+        with pytest.raises(ValueError):
+            data.get('id-1')
+
+
+def test_keys(tmpdir):
+    path = str(tmpdir.join('data.jsonl'))
+    write(path, 100)
+
+    with Dataset(path, Entry, key='source.id') as data:
+        assert data.get('id-42').value == 42
+        assert data.get('missing') is None
+        assert 'id-7' in data
+        assert [_e.value for _e in data.get_many(['id-9', 'missing', 'id-3'])] == [3, 9]
+        assert len(data.keys()) == 100
+
+    with pytest.raises(ValueError):
+        build_index(path, Entry, key='tags[]')
+    with pytest.raises(ValueError):
+        build_index(path, Entry, key='source.name')
+    # Keys must be single hashable values
+    with pytest.raises(ValueError, match='single values'):
+        build_index(path, Entry, key='tags')
+    with pytest.raises(ValueError, match='single values'):
+        Dataset(path, Entry, key='source')
+    with open(path, 'w') as out:
+        out.write(json.dumps({'value': 0, 'source': {'id': 'a'}, 'extra': [1]}) + '\n')
+    with pytest.raises(ValueError, match='unhashable'):
+        build_index(path, Loose, key='extra')
+
+
+def test_rebuild(tmpdir):
+    path = str(tmpdir.join('data.jsonl'))
+    write(path, 10)
+    with open_dataset(path, Entry) as data:
+        assert len(data) == 10
+
+    write(path, 20)
+    with open_dataset(path, Entry) as data:
+        assert len(data) == 20
+        assert raw(data[19]) == {'value': 19, 'source': {'id': 'id-19'}, 'tags': []}
+
+    # An index without keys is rebuilt when keys are wanted
+    with open_dataset(path, Entry, key='source.id') as data:
+        assert data.get('id-19').value == 19
+
+    with open(path, 'a') as out:
+        out.write(json.dumps({'value': 20, 'source': {'id': 'id-0'}}) + '\n')
+    with pytest.raises(ValueError):
+        open_dataset(path, Entry, key='source.id')
+
+
+def test_empty(tmpdir):
+    path = str(tmpdir.join('data.jsonl'))
+    open(path, 'w').close()
+    with open_dataset(path, Entry) as data:
+        assert len(data) == 0
+        assert list(data) == []
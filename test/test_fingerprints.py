@@ -0,0 +1,109 @@
+import json
+
+from draughts import model, dumps, fingerprint
+from draughts.fields import Integer, Keyword, Compound, Any
+from draughts.frozen import frozen
+from draughts.fingerprints import DIGEST_SIZE
+
+from .models import Leaf, Tree, make_tree
+
+
+def test_stable():
+    tree = make_tree()
+    digest = fingerprint(tree)
+    assert len(digest) == DIGEST_SIZE
+    assert fingerprint(tree) == digest
+
+    # Key order and model variant don't matter, values and their types do
+    reordered = json.loads(dumps(tree))
+    reordered = Tree(dict(reversed(list(reordered.items()))))
+    assert fingerprint(reordered) == digest
+    assert fingerprint(frozen(Tree)(json.loads(dumps(tree)))) == digest
+
+    other = make_tree()
+    other.leaves[0].value = 50
+    assert fingerprint(other) != digest
+    other.leaves[0].value = 5
+    assert fingerprint(other) == digest
+    other.samples.append(2)
+    assert fingerprint(other) != digest
+
+
+def test_invalidation():
+    tree = make_tree()
+    seen = {fingerprint(tree)}
+
+    def changed(action):
+        action()
+        digest = fingerprint(tree)
+        assert digest not in seen
+        seen.add(digest)
+        # A fresh copy agrees with the incrementally updated digest
+        assert fingerprint(Tree(json.loads(dumps(tree)))) == digest
+
+    changed(lambda: setattr(tree, 'flag', True))
+    changed(lambda: setattr(tree, 'ratio', 0.5))
+    changed(lambda: setattr(tree.leaf, 'value', 10))
+    changed(lambda: tree.leaf.tags.append('b'))
+    changed(lambda: tree.leaf.tags.sort(reverse=True))
+    changed(lambda: tree.leaves[1].scores.update(z=1.0))
+    changed(lambda: tree.leaves[1].scores.pop('y'))
+    changed(lambda: tree.leaves.append({'value': 9}))
+    changed(lambda: tree.leaves.reverse())
+    changed(lambda: tree.leaves[0].tags.extend(['c', 'd']))
+    changed(lambda: setattr(tree.branch, 'leaf', {'value': 10}))
+    changed(lambda: tree.branches[0].leaves[0].tags.append('f'))
+    changed(lambda: setattr(tree.branches[1], 'name', 'g'))
+    changed(lambda: tree.named['e'].tags.insert(0, 'e'))
+    changed(lambda: tree.named.update(c={'value': 11}))
+    changed(lambda: tree.named.pop('e'))
+    changed(lambda: setattr(tree.lazy[0], 'value', 80))
+    changed(lambda: tree.lazy.append({'value': 12}))
+    changed(lambda: tree.counts.update(b=2))
+    changed(lambda: tree.samples.append(2))
+
+
+def test_any_values():
+    @model
+    class Loose:
+        name = Keyword()
+        extra = Any(optional=True)
+
+    loose = Loose(name='x', extra={'nested': [1, 'two']})
+    digest = fingerprint(loose)
+    loose.extra['nested'].append(3)
+    assert fingerprint(loose) != digest
+    assert fingerprint(loose) == fingerprint(Loose(name='x', extra={'nested': [1, 'two', 3]}))
+    loose.extra = {'nested': [1, 2]}
+    assert fingerprint(loose) == fingerprint(Loose(name='x', extra={'nested': [1, 2]}))
+
+
+def test_reuses_subtrees():
+    tree = make_tree()
+    fingerprint(tree)
+    leaves_entry = tree.leaves._memo['fingerprint']
+    named_entry = tree.named._memo['fingerprint']
+
+    tree.leaves[1].value = 30
+    fingerprint(tree)
+    assert tree.leaves._memo['fingerprint'] is not leaves_entry
+    assert tree.named._memo['fingerprint'] is named_entry
+
+
+def test_changes_before_first_fingerprint():
+    @model
+    class Pair:
+        left = Integer()
+        right = Compound(Leaf)
+
+    pair = Pair(left=1, right={'value': 1})
+    pair.left = 2
+    pair.right = {'value': 2}
+    first = fingerprint(pair)
+    assert first == fingerprint(Pair(left=2, right={'value': 2}))
+
+    # Once fingerprinted, assignments drop the cached digest
+    pair.left = 3
+    assert fingerprint(pair) != first
+    pair.right.value = 4
+    assert fingerprint(pair) == fingerprint(Pair(left=3, right={'value': 4}))
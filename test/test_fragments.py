@@ -0,0 +1,64 @@
+import json
+
+from draughts import model, raw, dumps, fingerprint
+from draughts.fields import Keyword, Any
+from draughts.frozen import frozen
+
+from .models import Tree, make_tree
+
+
+def test_fragments():
+    doc = make_tree()
+    text = dumps(doc)
+    assert text == json.dumps(raw(doc), default=list)
+    assert dumps(doc) is text
+    # Sharing the memo with fingerprints keeps both cached
+    fingerprint(doc)
+    assert dumps(doc) is text
+
+    def changed(action):
+        action()
+        assert dumps(doc) == json.dumps(raw(doc), default=list)
+
+    changed(lambda: setattr(doc, 'name', 'other'))
+    changed(lambda: setattr(doc, 'ratio', 0.25))
+    changed(lambda: doc.leaf.tags.append('b'))
+    changed(lambda: setattr(doc.branch.leaves[0], 'value', 20))
+    changed(lambda: doc.branch.leaves[0].scores.update(y=1.0))
+    changed(lambda: setattr(doc.branches[0].leaf, 'value', 30))
+    changed(lambda: doc.branches.append({'name': 'f'}))
+    changed(lambda: doc.branches[-1].leaves.extend([{'value': 9}]))
+    changed(lambda: doc.leaves[1].scores.pop('y'))
+    changed(lambda: doc.named.update(g={'value': 10}))
+    changed(lambda: setattr(doc.named['e'], 'value', 70))
+    changed(lambda: setattr(doc.lazy[0], 'value', 80))
+    changed(lambda: doc.lazy.append({'value': 11}))
+    changed(lambda: doc.counts.update(b=2))
+    changed(lambda: doc.samples.append(2))
+    changed(lambda: setattr(doc, 'branch', {'name': 'h'}))
+
+    # Keys that aren't strings are written the way json writes them
+    changed(lambda: doc.named.update({1: {'value': 10}}))
+    changed(lambda: doc.leaf.scores.update({2: 0.5, 2.5: 1.0, None: 0.0}))
+    changed(lambda: setattr(doc.named[1], 'value', 11))
+
+    # Unchanged nodes keep their text
+    branch = doc.branches[0]._memo['json'][0]
+    doc.branches[1].name = 'i'
+    assert dumps(doc) == json.dumps(raw(doc), default=list)
+    assert doc.branches[0]._memo['json'][0] is branch
+
+
+def test_uncached():
+    @model(cache_json=True)
+    class Loose:
+        name = Keyword()
+        extra = Any(optional=True)
+
+    loose = Loose(name='x', extra={'nested': [1]})
+    assert dumps(loose) == json.dumps(raw(loose))
+    loose.extra['nested'].append(2)
+    assert dumps(loose) == json.dumps(raw(loose))
+
+    fixed = frozen(Tree)(json.loads(dumps(make_tree())))
+    assert dumps(fixed) is dumps(fixed)
@@ -0,0 +1,146 @@
+import pickle
+
+import pytest
+
+from draughts import model, raw
+from draughts.frozen import frozen
+from draughts.fields import Integer, List, Mapping, Compound
+
+from .models import Leaf, Tree, make_tree
+
+
+@model(frozen=True, intern=True)
+class Interned:
+    leaves = List(Compound(Leaf))
+    named = Mapping(Compound(Leaf), factory=dict)
+
+
+def test_read_only():
+    fixed = frozen(Tree)(raw(make_tree()))
+    assert fixed.leaf.total() == 2
+    assert fixed.leaves[1].value == 6
+
+    with pytest.raises(AttributeError):
+        fixed.name = 'other'
+    with pytest.raises(AttributeError):
+        fixed.leaf = {'value': 0}
+    with pytest.raises(AttributeError):
+        fixed.ratio = 5
+    with pytest.raises(AttributeError):
+        fixed.leaf.value = 10
+    with pytest.raises(AttributeError):
+        fixed.leaves[0].value = 10
+    with pytest.raises(AttributeError):
+        fixed.branches[0].leaf.value = 10
+    with pytest.raises(TypeError):
+        fixed.leaves.append({'value': 1})
+    with pytest.raises(TypeError):
+        fixed.leaves[0] = {'value': 1}
+    with pytest.raises(TypeError):
+        fixed.leaves.pop()
+    with pytest.raises(TypeError):
+        del fixed.leaves[0]
+    with pytest.raises(TypeError):
+        fixed.named['b'] = {'value': 1}
+    with pytest.raises(TypeError):
+        fixed.named.update(b={'value': 1})
+    with pytest.raises(TypeError):
+        named = fixed.named
+        named |= {'b': {'value': 1}}
+    with pytest.raises(TypeError):
+        fixed.named.pop('e')
+    with pytest.raises(TypeError):
+        fixed.leaf.tags.append('b')
+    with pytest.raises(TypeError):
+        fixed.leaf.tags.pop()
+    with pytest.raises(TypeError):
+        fixed.branches[0].leaves.append({'value': 1})
+    with pytest.raises(TypeError):
+        fixed.counts['b'] = 2
+    with pytest.raises(TypeError):
+        fixed.counts.update({'b': 2})
+    with pytest.raises(TypeError):
+        fixed.samples.append(2)
+
+    assert raw(fixed)['leaf'] == {'value': 1, 'tags': ['a'], 'scores': {}}
+
+    # The models used inside the frozen one are left alone
+    leaf = Leaf(value=1)
+    leaf.value = 5
+    assert leaf.value == 5
+
+
+def test_nested_lists():
+    @model(frozen=True)
+    class Grid:
+        rows = List(List(Integer()))
+
+    grid = Grid(rows=[[1, 2]])
+    assert hash(grid) == hash(Grid(rows=[[1, 2]]))
+    with pytest.raises(TypeError):
+        grid.rows[0].append(3)
+
+
+def test_hash():
+    first, second = frozen(Tree)(raw(make_tree())), frozen(Tree)(raw(make_tree()))
+    assert first is not second
+    assert hash(first) == hash(second)
+    assert len({first, second}) == 1
+    assert hash(first.leaves) == hash(second.leaves)
+    assert hash(first.leaf) == hash(second.leaf)
+    assert hash(first.leaf.tags) == hash(second.leaf.tags)
+    assert hash(first.samples) == hash(second.samples)
+
+
+def test_intern():
+    x = Interned(leaves=[{'value': 1}, {'value': 1}, {'value': 2}], named={'a': {'value': 1}})
+    assert x.leaves[0] is x.leaves[1]
+    assert x.leaves[0] is not x.leaves[2]
+    assert x.named['a'] is x.leaves[0]
+    assert raw(x)['leaves'][0] is raw(x)['leaves'][1]
+
+    y = Interned(leaves=[{'value': 2}])
+    assert y.leaves[0] is x.leaves[2]
+
+
+def test_pickle():
+    fixed = frozen(Tree)(raw(make_tree()))
+    copy = pickle.loads(pickle.dumps(fixed))
+    assert raw(copy) == raw(fixed)
+    assert hash(copy) == hash(fixed)
+    with pytest.raises(AttributeError):
+        copy.leaf.value = 10
+    with pytest.raises(TypeError):
+        copy.leaf.tags.append('b')
+
+
+def test_lazy():
+    @model(frozen=True)
+    class Path:
+        leaves = List(Compound(Leaf), lazy=True)
+        named = Mapping(Compound(Leaf), lazy=True)
+
+    first = Path(leaves=[{'value': 1}], named={'a': {'value': 2}})
+    second = Path(leaves=[{'value': 1}], named={'a': {'value': 2}})
+    assert hash(first) == hash(second)
+    assert first.leaves[0].value == 1
+    with pytest.raises(AttributeError):
+        first.leaves[0].value = 10
+    with pytest.raises(TypeError):
+        first.leaves.append({'value': 1})
+    with pytest.raises(TypeError):
+        first.named['b'] = {'value': 1}
+
+
+def test_source_instances():
+    leaf = Leaf(value=1, tags=['x'])
+    for intern in (False, True):
+        fixed = frozen(Tree, intern)(name='t', leaf=leaf, leaves=[leaf, {'value': 2}], named={'a': leaf})
+        assert fixed.leaf.value == 1 and [_l.value for _l in fixed.leaves] == [1, 2]
+        assert fixed.named['a'].tags == ['x']
+        with pytest.raises(TypeError):
+            fixed.leaf.tags.append('y')
+
+    # The source instance is copied, not taken over
+    leaf.tags.append('y')
+    assert fixed.leaf.tags == ['x'] and leaf.tags == ['x', 'y']
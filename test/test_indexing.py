@@ -0,0 +1,90 @@
+import fractions
+import json
+
+from draughts import model
+from draughts.fields import String, Integer, List, Compound, Mapping, Keyword, SeparatedFraction
+from draughts.indexing import exporter
+
+
+@model
+class Tag:
+    name = Keyword(index=True)
+    note = String()
+
+
+@model(index=True)
+class Secret:
+    value = String()
+
+
+@model
+class Document:
+    id = Keyword(index=True)
+    body = String()
+    tags = List(Compound(Tag), default=[])
+    labels = Mapping(Compound(Tag), default={})
+    scores = List(Integer(), index=True, default=[])
+    counts = Mapping(Integer(), index=True, default={})
+    hidden = Compound(Secret, index=False, optional=True)
+    shown = Compound(Secret, optional=True)
+    ratio: fractions.Fraction = SeparatedFraction(index=True, default=1)
+
+
+def test_export():
+    doc = Document({
+        'id': 'abc',
+        'body': 'not indexed',
+        'tags': [{'name': 'a', 'note': 'x'}, {'name': 'b', 'note': 'y'}],
+        'labels': {'first': {'name': 'c', 'note': 'z'}},
+        'scores': [1, 2],
+        'counts': {'x': 1},
+        'hidden': {'value': 'secret'},
+        'shown': {'value': 'public'},
+    })
+
+    assert exporter(Document)(doc) == {
+        'id': 'abc',
+        'tags.name': ['a', 'b'],
+        'labels.first.name': 'c',
+        'scores': [1, 2],
+        'counts.x': 1,
+        'shown.value': 'public',
+        'ratio_numerator': 1,
+        'ratio_denominator': 1,
+    }
+
+    # Unset index settings can default to indexed
+    assert exporter(Document, default=True)(doc)['body'] == 'not indexed'
+    assert 'hidden.value' not in exporter(Document, default=True)(doc)
+
+
+def test_export_batch():
+    docs = [Document(id=str(ii), body='') for ii in range(5)]
+    export = exporter(Document)
+    assert export is exporter(Document)
+    assert [doc['id'] for doc in export.batch(docs)] == ['0', '1', '2', '3', '4']
+    assert export.batch([]) == []
+
+
+def test_export_nothing_indexed():
+    @model
+    class Plain:
+        value = String()
+
+    assert exporter(Plain)(Plain(value='x')) == {}
+
+
+def test_export_lists():
+    @model(index=True)
+    class Series:
+        counts = List(Integer(), packed=True)
+        labels = List(Keyword())
+
+    series = Series(counts=[1, 2], labels=['a'])
+    doc = exporter(Series)(series)
+    assert json.loads(json.dumps(doc)) == {'counts': [1, 2], 'labels': ['a']}
+
+    # The export is a copy, changing it leaves the model alone
+    doc['labels'].append('b')
+    doc['counts'].append(3)
+    assert series.labels == ['a'] and series.counts == [1, 2]
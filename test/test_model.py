@@ -1,15 +1,19 @@
+import array
 import enum
 import fractions
+import pickle
+import sys
 import typing
 import time
 import json
 import datetime
+from copy import copy, deepcopy
 
 import pytest
 
 from draughts import model, model_fields, model_fields_flat, raw, dumps
-from draughts.fields import String, Integer, List, Compound, Mapping, Timestamp, Enum, Keyword, Bytes, Boolean, UUID, \
-    DateString, SeparatedFraction
+from draughts.fields import String, Integer, Float, List, Compound, Mapping, Timestamp, Enum, Keyword, Bytes, \
+    Boolean, UUID, DateString, DateValue, date_key, JSON, JSONValue, SeparatedFraction
 from draughts.fields.bases import MultiField
 
 
@@ -59,6 +63,18 @@ class Label:
     second = Integer()
 
 
+@model
+class Nested:
+    label = Compound(Label)
+    labels = List(Compound(Label), default=[])
+    named = Mapping(Compound(Label), default={})
+    grid = List(List(Integer()), default=[])
+    counts = Mapping(Integer(), default={})
+    packed = List(Float(), packed=True, default=[])
+    ratio = SeparatedFraction(default=(1, 3))
+    extra = Compound(Label, optional=True)
+
+
 def test_creation(subtests):
 
     data_1 = dict(first='abc', second=567)
@@ -354,6 +370,40 @@ def test_create_list():
         test.values[0:2] = ['cats', 0]
 
 
+def test_packed_list():
+    @model
+    class Test:
+        values = List(Integer(), packed=True)
+        floats = List(Float(), packed=True, default=[])
+
+    test = Test(dict(values=[0, '100', 5.5]))
+    assert test.values == [0, 100, 5]
+    assert isinstance(test.values, array.array)
+
+    with pytest.raises(ValueError):
+        Test(dict(values=['bugs']))
+    with pytest.raises(ValueError):
+        Test(dict(values=[2**70]))
+    with pytest.raises(ValueError):
+        test.values.append('cats')
+    with pytest.raises(ValueError):
+        test.values.extend([1, 'cats'])
+    assert len(test.values) == 3
+
+    test.values += range(3)
+    test.values.extend(['7'])
+    test.values.insert(0, -1)
+    test.values[0:2] = ['3', 4]
+    assert test.values == [3, 4, 100, 5, 0, 1, 2, 7]
+
+    test.floats = [1, '2.5']
+    assert test.floats == [1.0, 2.5]
+    assert json.loads(dumps(test)) == {'values': [3, 4, 100, 5, 0, 1, 2, 7], 'floats': [1.0, 2.5]}
+
+    with pytest.raises(ValueError):
+        List(String(), packed=True)
+
+
 def test_list_of_lists():
 
     @model
@@ -593,6 +643,29 @@ def test_enum():
         et.enum = ["a"]
 
 
+def test_enum_store_value():
+    class Status(enum.Enum):
+        Open = 'open'
+        Closed = 'closed'
+
+    @model
+    class EnumTest:
+        status = Enum(Status, store_value=True)
+
+    et = EnumTest(status=Status.Open)
+    assert et.status == 'open'
+    assert raw(et) == {'status': 'open'}
+    assert dumps(et) == '{"status": "open"}'
+
+    et.status = 'Closed'
+    assert et.status == 'closed'
+    et.status = 'open'
+    assert et.status == 'open'
+
+    with pytest.raises(ValueError):
+        et.status = 'bob'
+
+
 def test_timestamp():
     @model
     class Test:
@@ -707,6 +780,66 @@ def test_bytes_field():
     assert Test(data='str').data == b'str'
 
 
+def test_bytes_field_no_copy():
+    @model
+    class Test:
+        data = Bytes(copy=False)
+
+    buffer = bytearray(b'abcdef')
+    x = Test(data=buffer)
+    assert isinstance(x.data, memoryview)
+    assert x.data == b'abcdef'
+    assert x.data.readonly or sys.version_info < (3, 8)
+
+    # The field shares the memory of the buffer it was given
+    buffer[0:1] = b'z'
+    assert x.data == b'zbcdef'
+
+    x.data = memoryview(buffer)[2:4]
+    assert x.data == b'cd'
+    assert Test(data='str').data == b'str'
+
+    with pytest.raises(ValueError):
+        Test(data=100)
+
+    # The view pins the buffer it was taken from
+    with pytest.raises(BufferError):
+        buffer.extend(b'g')
+
+    # Views are no more JSON than bytes are, the rest of the model still encodes
+    with pytest.raises(TypeError):
+        dumps(x)
+    assert dumps(Test(data=b''), exclude=['data']) == '{}'
+
+
+@model
+class Blob:
+    data = Bytes(copy=False)
+    parts = List(Bytes(copy=False), default=[])
+
+
+@model
+class Blobs:
+    blob = Compound(Blob)
+    named = Mapping(Compound(Blob), default={})
+
+
+def test_bytes_field_no_copy_pickle():
+    buffer = bytearray(b'abcdef')
+    x = Blobs(blob={'data': buffer, 'parts': [buffer, memoryview(buffer)[1:3]]},
+              named={'a': {'data': memoryview(buffer)[4:]}})
+
+    for y in (pickle.loads(pickle.dumps(x)), deepcopy(x)):
+        assert raw(y) == raw(x)
+        assert y.blob.data == b'abcdef' and y.blob.parts[1] == b'bc' and y.named['a'].data == b'ef'
+        y.blob.parts.append(b'x')
+
+    # Copies don't share the buffer
+    buffer[0:1] = b'z'
+    assert y.blob.data == b'abcdef' and x.blob.data == b'zbcdef'
+    assert pickle.loads(pickle.dumps(x.blob)).parts[0] == b'zbcdef'
+
+
 def test_boolean_field():
     @model
     class Test:
@@ -727,6 +860,31 @@ def test_boolean_field():
         Test()
 
 
+def test_keyword_intern():
+    @model
+    class Test:
+        default = Keyword()
+        interned = Keyword(intern=True)
+        bounded = Keyword(intern=2)
+
+    def fresh(text):
+        # Build the string at runtime so it isn't a shared constant
+        return ''.join(list(text))
+
+    a = Test(default=fresh('status'), interned=fresh('status'), bounded=fresh('status'))
+    b = Test(default=fresh('status'), interned=fresh('status'), bounded=fresh('status'))
+    assert a.default == b.default and a.default is not b.default
+    assert a.interned is b.interned
+    assert a.bounded is b.bounded
+
+    # Once the table is full new values are kept but not shared
+    Test(default='', interned='', bounded=fresh('second'))
+    c = Test(default='', interned='', bounded=fresh('third'))
+    d = Test(default='', interned='', bounded=fresh('third'))
+    assert c.bounded == d.bounded and c.bounded is not d.bounded
+    assert Test(default='', interned='', bounded=fresh('status')).bounded is a.bounded
+
+
 def test_uuid_field():
     @model
     class Test:
@@ -755,6 +913,94 @@ def test_datestring():
     assert match
 
 
+def test_clean_values_kept():
+    @model
+    class Test:
+        number = Integer()
+        real = Float()
+        flag = Boolean()
+        label = Keyword()
+        date = DateString()
+
+    text = ''.join(['2020-02-28T23:59:59', '+00:00'])
+    x = Test(number=10**20, real=0.5, flag=False, label=''.join(['a', 'b']), date=text)
+    assert x.number == 10**20 and x.real == 0.5 and x.flag is False
+    assert x.label == 'ab' and x.date is text
+
+    # Subclasses of the target types are still converted
+    x.number = True
+    assert type(x.number) is int and x.number == 1
+    x.label = DateValue('text', datetime.datetime.now())
+    assert type(x.label) is str
+
+    # Dates that look close to canonical are still checked
+    x.date = '2020-02-28T00:00:00.000000+00:00'
+    assert x.date == '2020-02-28T00:00:00+00:00'
+    x.date = '2020-02-29T00:00:00+00:00'
+    assert x.date == '2020-02-29T00:00:00+00:00'
+    with pytest.raises(ValueError):
+        x.date = '2021-02-29T00:00:00+00:00'
+
+
+def test_datestring_parsed():
+    @model
+    class Test:
+        data = DateString(parsed=True)
+        plain = DateString(optional=True)
+
+    x = Test(data='2020-03-20T14:28:23.382748')
+    assert x.data == '2020-03-20T14:28:23.382748+00:00'
+    assert x.data.datetime == datetime.datetime(2020, 3, 20, 14, 28, 23, 382748, tzinfo=datetime.timezone.utc)
+    assert x.data.epoch == x.data.datetime.timestamp()
+    assert raw(x) == {'data': '2020-03-20T14:28:23.382748+00:00'}
+    assert json.loads(dumps(x)) == raw(x)
+
+    # Values are only parsed once, assigning an existing value keeps it
+    y = Test(data=x.data)
+    assert y.data is x.data
+    y.data = time.time()
+    assert isinstance(y.data, DateValue)
+    assert Test(data='NOW').data.datetime.tzinfo is not None
+    assert Test(plain='2020-01-01', data='2020-01-01').plain == Test(data='2020-01-01').data
+
+    # Dates compare and sort by the instant they name, not the text
+    early = Test(data='2020-01-01T09:00:00').data
+    late = Test(data=datetime.datetime(2020, 1, 1, 10, tzinfo=datetime.timezone.utc).timestamp()).data
+    assert early.datetime.hour == 9 and late.datetime.hour == 10
+    assert early < late and late > early and early <= late and late >= early
+    assert sorted([late, early]) == [early, late]
+    assert sorted(['2020-01-02', late, early], key=date_key) == [early, late, '2020-01-02']
+
+    copy = pickle.loads(pickle.dumps(x.data))
+    assert isinstance(copy, DateValue) and copy == x.data and copy.epoch == x.data.epoch
+
+
+def test_json_parsed():
+    @model
+    class Test:
+        data = JSON(parsed=True)
+
+    x = Test(data='{"a": [1, 2]}')
+    assert x.data == '{"a": [1, 2]}'
+    assert x.data.value == {'a': [1, 2]}
+
+    # Decoded objects are only encoded for their text
+    blob = {'b': None}
+    x.data = blob
+    assert x.data.value is blob
+    assert raw(x) == {'data': '{"b": null}'}
+    assert json.loads(dumps(x)) == {'data': '{"b": null}'}
+    assert Test(data=x.data).data is x.data
+
+    with pytest.raises(ValueError):
+        Test(data='{')
+    with pytest.raises(TypeError):
+        Test(data={'c': object()})
+
+    copy = pickle.loads(pickle.dumps(x.data))
+    assert isinstance(copy, JSONValue) and copy.value == blob
+
+
 def test_multi_value_fraction():
     @model
     class Test:
@@ -796,6 +1042,33 @@ def test_multi_value_fraction():
             data_numerator = Integer()
 
 
+def test_fraction_lazy():
+    @model
+    class Test:
+        data = SeparatedFraction()
+
+    x = Test(data_numerator=4, data_denominator=-6)
+    assert raw(x) == {'data_numerator': -2, 'data_denominator': 3}
+    assert x._compounds['data'] == (-2, 3)
+    assert x.data == fractions.Fraction(-2, 3)
+    assert x.data is x.data
+
+    assert Test(data=(3,)).data == 3
+    assert Test(data='1/4').data == fractions.Fraction(1, 4)
+    assert raw(Test(data=0.5)) == {'data_numerator': 1, 'data_denominator': 2}
+    with pytest.raises(ZeroDivisionError):
+        Test(data=(1, 0))
+
+    # Only pairs of integers skip building a Fraction, anything else is checked by it
+    for bad in [(None, 'x'), ('a', 5), ['1', '2'], (1.5, 2)]:
+        with pytest.raises(TypeError):
+            Test(data=bad)
+        with pytest.raises(TypeError):
+            x.data = bad
+    x.data = (2, 4)
+    assert type(x.data) is fractions.Fraction and x.data == fractions.Fraction(1, 2)
+
+
 def test_multi_value_duplicate():
     """Make sure that multi-fields can use their own name as a component"""
 
@@ -857,3 +1130,172 @@ def test_multi_value_duplicate():
         class Test:
             field = CopiedInteger('collide')
             second = CopiedInteger('field')
+
+
+def test_pickle():
+    x = Nested({
+        'label': {'first': 'a', 'second': 1},
+        'labels': [{'first': 'b', 'second': 2}],
+        'named': {'c': {'first': 'c', 'second': 3}},
+        'grid': [[1, 2], [3]],
+        'counts': {'x': 1},
+        'packed': [1.5, 2],
+    })
+
+    y = pickle.loads(pickle.dumps(x))
+    assert type(y) is Nested
+    assert raw(y) == raw(x)
+    assert y.label.first == 'a'
+    assert y.labels[0].second == 2
+    assert y.named['c'].first == 'c'
+    assert y.ratio == fractions.Fraction(1, 3)
+    assert y.extra is None
+
+    # The rebuilt object keeps enforcing types
+    with pytest.raises(ValueError):
+        y.grid[0].append('cats')
+    with pytest.raises(ValueError):
+        y.counts['y'] = 'cats'
+    with pytest.raises(ValueError):
+        y.packed.append('cats')
+    assert isinstance(y.packed, array.array)
+    with pytest.raises(ValueError):
+        y.labels.append({'first': 'd'})
+    y.labels[0].first = 'z'
+    assert raw(y)['labels'][0]['first'] == 'z'
+
+    # Shallow copies can change their containers without breaking the original
+    z = copy(x)
+    assert type(z) is Nested and raw(z) == raw(x)
+    z.labels.append(Label(first='d', second=4))
+    z.named['e'] = {'first': 'e', 'second': 5}
+    z.packed.append(3)
+    assert len(x.labels) == 1 and x.labels[0].first == 'b' and list(x.named) == ['c'] and x.packed == [1.5, 2]
+    assert z.labels[1].first == 'd' and z.named['e'].second == 5
+
+
+def test_lazy_compound_lists():
+    @model
+    class Test:
+        labels = List(Compound(Label), lazy=True)
+        named = Mapping(Compound(Label), lazy=True)
+
+    x = Test({
+        'labels': [{'first': 'a', 'second': 1}, Label(first='b', second=2)],
+        'named': {'c': {'first': 'c', 'second': '3'}},
+    })
+    assert len(x.labels) == 2
+    assert len(x.named) == 1
+
+    # Items were cast up front even though no views exist yet
+    assert raw(x)['named']['c']['second'] == 3
+    with pytest.raises(ValueError):
+        Test(labels=[{'first': 'a'}], named={})
+    with pytest.raises(ValueError):
+        Test(labels=[], named={'c': {'first': 'c', 'second': 'cats'}})
+
+    # Views are cached while in use and write through to the data
+    first = x.labels[0]
+    assert first is x.labels[0]
+    first.first = 'z'
+    assert raw(x)['labels'][0]['first'] == 'z'
+    x.named['c'].second = 10
+    assert raw(x)['named']['c']['second'] == 10
+
+    assert [_l.first for _l in x.labels] == ['z', 'b']
+    assert [_l.first for _l in x.labels[1:]] == ['b']
+    assert [_k for _k, _v in x.named.items()] == ['c']
+    assert [_v.second for _v in x.named.values()] == [10]
+
+    # Mutations are still checked
+    label = Label(first='d', second=4)
+    x.labels.append(label)
+    assert x.labels[-1] is label
+    x.labels.extend([{'first': 'e', 'second': 5}])
+    assert x.labels[-1].first == 'e'
+    with pytest.raises(ValueError):
+        x.labels.append({'first': 'f'})
+    with pytest.raises(ValueError):
+        x.named['d'] = {'second': 'cats'}
+    x.named['d'] = label
+    assert x.named['d'] is label
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_bulk_mutation(lazy):
+    @model
+    class Test:
+        labels = List(Compound(Label), lazy=lazy)
+        named = Mapping(Compound(Label), lazy=lazy)
+        numbers = List(Integer())
+        counts = Mapping(Integer())
+
+    x = Test(labels=[], named={}, numbers=[], counts={})
+
+    def label(index):
+        return {'first': str(index), 'second': index}
+
+    # Lists of compounds
+    x.labels.extend(label(_i) for _i in range(5))
+    x.labels += [label(5)]
+    assert [_l.second for _l in x.labels] == [0, 1, 2, 3, 4, 5]
+    with pytest.raises(ValueError):
+        x.labels.extend([label(6), {'first': 'cats'}])
+    assert len(x.labels) == 6
+
+    assert x.labels.pop().second == 5
+    assert x.labels.pop(0).second == 0
+    del x.labels[0]
+    x.labels.remove(label(3))
+    assert [_l.second for _l in x.labels] == [2, 4]
+    x.labels[0:1] = [label(7), label(8)]
+    x.labels.sort(key=lambda _l: -_l.second)
+    assert [_l.second for _l in x.labels] == [8, 7, 4]
+    x.labels.reverse()
+    assert [_l['second'] for _l in raw(x)['labels']] == [4, 7, 8]
+    assert [_l.second for _l in x.labels] == [4, 7, 8]
+    x.labels.clear()
+    assert raw(x)['labels'] == [] and len(x.labels) == 0
+
+    # Mappings of compounds
+    x.named.update({'a': label(1)}, b=label(2))
+    assert x.named['b'].second == 2
+    with pytest.raises(ValueError):
+        x.named.update({'c': label(3), 'd': {'second': 'cats'}})
+    assert set(x.named.keys()) == {'a', 'b'}
+    assert x.named.setdefault('a', label(10)).second == 1
+    assert x.named.setdefault('c', label(3)).second == 3
+    assert x.named.get('c').second == 3
+    assert x.named.get('z') is None
+    assert x.named.pop('c').second == 3
+    assert x.named.pop('c', None) is None
+    with pytest.raises(KeyError):
+        x.named.pop('c')
+    del x.named['b']
+    assert x.named.popitem()[0] == 'a'
+    assert raw(x)['named'] == {} and len(x.named) == 0
+    x.named['a'] = label(1)
+    named = x.named
+    named |= {'b': label(2)}
+    assert named is x.named and x.named['b'].second == 2 and raw(x)['named']['b'] == label(2)
+    x.named.clear()
+    assert raw(x)['named'] == {}
+
+    # Lists and mappings of basic values
+    x.numbers.extend(['1', 2])
+    x.numbers += ['3']
+    x.numbers[1:] = ['4']
+    assert x.numbers == [1, 4]
+    with pytest.raises(ValueError):
+        x.numbers.extend([5, 'cats'])
+    assert x.numbers == [1, 4]
+
+    x.counts.update({'a': '1'}, b='2')
+    x.counts |= {'c': '3'}
+    assert x.counts == {'a': 1, 'b': 2, 'c': 3}
+    with pytest.raises(ValueError):
+        x.counts.update({'d': 4, 'e': 'cats'})
+    assert 'd' not in x.counts
+    assert x.counts.setdefault('a', 10) == 1
+    assert x.counts.setdefault('d', '4') == 4
+    assert raw(x)['counts'] == {'a': 1, 'b': 2, 'c': 3, 'd': 4}
@@ -0,0 +1,78 @@
+import pytest
+
+from draughts import model, raw, keyfunc, group_by, top_k
+from draughts.fields import Integer, Float, Keyword, Compound, List
+
+
+@model
+class Source:
+    name = Keyword()
+    rank = Integer(optional=True)
+
+
+@model
+class Event:
+    source = Compound(Source)
+    origin = Compound(Source, optional=True)
+    ts = Float()
+    kind = Keyword()
+    tags = List(Keyword(), default=[])
+
+
+def events():
+    return [
+        Event(source={'name': 'b', 'rank': 2}, ts=1.0, kind='x'),
+        Event(source={'name': 'a'}, origin={'name': 'z', 'rank': 1}, ts=3.0, kind='y'),
+        Event(source={'name': 'b', 'rank': 1}, ts=2.0, kind='y'),
+        Event(source={'name': 'a', 'rank': 5}, origin={'name': 'y'}, ts=4.0, kind='x'),
+    ]
+
+
+def test_keyfunc():
+    items = events()
+
+    ordered = sorted(items, key=keyfunc(Event, 'source.name', '-ts'))
+    assert [_e.ts for _e in ordered] == [4.0, 3.0, 2.0, 1.0]
+
+    ordered = sorted(items, key=keyfunc(Event, '-kind', 'ts'))
+    assert [(_e.kind, _e.ts) for _e in ordered] == [('y', 2.0), ('y', 3.0), ('x', 1.0), ('x', 4.0)]
+
+    # Missing values sort last in both directions, even under a missing compound
+    assert [_e.ts for _e in sorted(items, key=keyfunc(Event, 'source.rank'))] == [2.0, 1.0, 4.0, 3.0]
+    assert [_e.ts for _e in sorted(items, key=keyfunc(Event, '-source.rank'))] == [4.0, 1.0, 2.0, 3.0]
+    assert [_e.ts for _e in sorted(items, key=keyfunc(Event, 'origin.name', 'ts'))] == [4.0, 3.0, 1.0, 2.0]
+    assert [_e.ts for _e in sorted(items, key=keyfunc(Event, '-origin.rank', 'ts'))] == [3.0, 1.0, 2.0, 4.0]
+
+    # Raw data works as well, and keys are compiled once
+    key = keyfunc(Event, 'source.name', '-ts')
+    assert key is keyfunc(Event, 'source.name', '-ts')
+    assert sorted(map(raw, items), key=key) == [raw(_e) for _e in ordered_by_hand(items)]
+
+    with pytest.raises(ValueError):
+        keyfunc(Event, 'tags[]')
+    with pytest.raises(ValueError):
+        keyfunc(Event, 'missing')
+    with pytest.raises(ValueError):
+        keyfunc(Event)
+
+
+def ordered_by_hand(items):
+    return sorted(sorted(items, key=lambda _e: _e.ts, reverse=True), key=lambda _e: _e.source.name)
+
+
+def test_group_and_top_k():
+    items = events()
+
+    groups = group_by(Event, items, 'kind')
+    assert list(groups) == ['x', 'y'] and [_e.ts for _e in groups['y']] == [3.0, 2.0]
+    groups = group_by(Event, items, 'source.name', 'origin.rank')
+    assert list(groups) == [('b', None), ('a', 1), ('a', None)] and len(groups[('a', None)]) == 1
+    with pytest.raises(ValueError):
+        group_by(Event, items, 'tags[]')
+    for path in ('tags', 'source'):
+        with pytest.raises(ValueError):
+            group_by(Event, items, 'kind', path)
+
+    assert [_e.ts for _e in top_k(Event, items, 2, '-ts')] == [4.0, 3.0]
+    assert [_e.ts for _e in top_k(Event, items, 3, 'source.name', 'ts')] == [3.0, 4.0, 1.0]
+    assert top_k(Event, items, 0, 'ts') == []
@@ -0,0 +1,90 @@
+import gc
+import weakref
+
+import pytest
+
+from draughts import model, model_fields_flat, dumps, keyfunc
+from draughts.indexing import exporter
+from draughts.fields import List, Keyword
+from draughts.path import getter, tokenize, join
+
+from .models import Branch, Tree, make_tree
+
+
+def test_tokenize():
+    assert tokenize('a.b[].c') == ('a', 'b', '[]', 'c')
+    assert tokenize('m.*.x') == ('m', '*', 'x')
+    assert tokenize('values[]') == ('values', '[]')
+    assert tokenize('m.*.') == ('m', '*')
+
+    for path in ['a.b[].c', 'm.*.x', 'values[]', 'grid[][]', 'a']:
+        assert join(tokenize(path)) == path
+
+
+def test_scalar_paths():
+    tree = make_tree()
+    assert getter(Tree, 'name')(tree) == 'tree'
+    assert getter(Tree, 'leaf.value')(tree) == 1
+    assert getter(Tree, 'leaf.value')(tree._data) == 1
+    assert getter(Tree, 'leaf.tags[]')(tree) == ['a']
+
+    missing = getter(Branch, 'leaf.value')
+    assert missing(Branch(name='a')) is None
+
+
+def test_fan_out():
+    tree = make_tree()
+    assert getter(Tree, 'branches[].name')(tree) == ['c', 'd']
+    assert getter(Tree, 'branches[].leaves[].value')(tree) == [4]
+    assert getter(Tree, 'branches[].leaf.value')(tree) == [3]
+    assert getter(Tree, 'named.*.value')(tree) == [7]
+    assert getter(Tree, 'leaves[].scores.*')(tree) == [1.5]
+    assert getter(Tree, 'samples[]')(tree) == [0.5, 1]
+
+
+def test_many_paths():
+    tree = make_tree()
+    extract = getter(Tree, 'name', 'branches[].name', 'branches[].leaves[].value', 'leaf.value')
+    assert extract(tree) == ('tree', ['c', 'd'], [4], 1)
+
+    # Every flat path of the model can be compiled together
+    assert len(getter(Tree, *model_fields_flat(Tree))(tree)) == len(model_fields_flat(Tree))
+
+
+def test_compiled_once():
+    assert getter(Tree, 'branches[].name') is getter(Tree, 'branches[].name')
+
+
+def test_bad_paths():
+    with pytest.raises(ValueError):
+        getter(Tree, 'cats')
+    with pytest.raises(ValueError):
+        getter(Tree, 'name.cats')
+    with pytest.raises(ValueError):
+        getter(Tree, 'branches.name')
+    with pytest.raises(ValueError):
+        getter(Tree, 'leaf[].value')
+    with pytest.raises(ValueError):
+        getter(Tree)
+
+
+def test_compiled_collected():
+    # Compiled accessors refer to their model, they must not keep it alive
+    def build():
+        @model(index=True)
+        class Temporary:
+            name = Keyword()
+            tags = List(Keyword(), default=[])
+
+        obj = Temporary(name='x')
+        getter(Temporary, 'name', 'tags[]')(obj)
+        keyfunc(Temporary, '-name')(obj)
+        dumps(obj, include=['name'])
+        exporter(Temporary)(obj)
+        Temporary.project('name')(name='x')
+        return weakref.ref(Temporary)
+
+    ref = build()
+    gc.collect()
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,189 @@
+import json
+import pickle
+
+import pytest
+
+from draughts import model, raw, dumps
+from draughts.fields import String, Integer, List, Compound, Mapping, Keyword, Timestamp, SeparatedFraction
+from draughts.projection import encoder
+
+
+@model
+class Meta:
+    created = Timestamp()
+    author = Keyword()
+
+
+@model
+class Entry:
+    key = Keyword()
+    value = Integer()
+
+
+@model
+class Wide:
+    id = Keyword()
+    meta = Compound(Meta)
+    body = String()
+    entries = List(Compound(Entry))
+    named = Mapping(Compound(Entry), default={})
+
+
+def test_projection():
+    Small = Wide.project('id', 'meta.created')
+    data = {
+        'id': 'abc',
+        'meta': {'created': '100', 'author': 'someone'},
+        'body': 'unchecked ' * 10,
+        'entries': 'not a list',
+    }
+    obj = Small(data)
+    assert obj.id == 'abc'
+    assert obj.meta.created == 100.0
+    assert raw(obj)['meta']['created'] == 100.0
+
+    # Everything outside the projection is left as it was
+    assert raw(obj)['meta']['author'] == 'someone'
+    assert raw(obj)['entries'] == 'not a list'
+    assert not hasattr(obj, 'body')
+
+    # Only the projected fields are required
+    Small({'id': 'abc', 'meta': {'created': 0}})
+    with pytest.raises(ValueError):
+        Small({'id': 'abc', 'meta': {'author': 'someone'}})
+    with pytest.raises(ValueError):
+        Small({'id': 'abc', 'meta': {'created': 'yesterday'}})
+
+
+def test_projection_containers():
+    Keys = Wide.project('entries[].key', 'named.*.value')
+    obj = Keys({'entries': [{'key': 1}, {'key': 'b', 'value': 'x'}], 'named': {'a': {'value': '5'}}})
+    assert [entry.key for entry in obj.entries] == ['1', 'b']
+    assert obj.named['a'].value == 5
+
+    Whole = Wide.project('meta')
+    with pytest.raises(ValueError):
+        Whole({'meta': {'created': 0}})
+
+
+def test_projection_cached():
+    assert Wide.project('id', 'meta.created') is Wide.project('meta.created', 'id')
+    assert Wide.project('id') is not Wide.project('meta.created', 'id')
+
+
+def test_projection_errors():
+    with pytest.raises(ValueError):
+        Wide.project()
+    with pytest.raises(ValueError):
+        Wide.project('cats')
+    with pytest.raises(ValueError):
+        Wide.project('id.value')
+    with pytest.raises(ValueError):
+        Wide.project('entries.key')
+
+
+def test_project_field_name():
+    @model
+    class Test:
+        project = String()
+
+    assert Test(project='x').project == 'x'
+
+
+def test_projection_methods():
+    @model
+    class Test:
+        name = Keyword()
+        size = Integer()
+
+        def hello(self):
+            return f'hello {self.name}'
+
+        @property
+        def label(self):
+            return self.name.upper()
+
+    Named = Test.project('name')
+    obj = Named({'name': 'x', 'size': 'unchecked'})
+    assert obj.hello() == 'hello x' and obj.label == 'X'
+    assert Named.__name__ == 'Test' and not hasattr(Named, 'size')
+
+
+def test_projection_pickle():
+    Small = Wide.project('id', 'meta.created')
+    obj = Small({'id': 'abc', 'meta': {'created': 10, 'author': 'x'}, 'body': 'text'})
+    copy = pickle.loads(pickle.dumps(obj))
+    assert type(copy) is Small
+    assert copy.meta.created == 10
+    assert raw(copy) == raw(obj)
+
+
+@model
+class Record:
+    id = Keyword()
+    wide = Compound(Wide)
+    ratio = SeparatedFraction(default=1)
+    secrets = Mapping(Compound(Entry), default={})
+
+
+def test_dumps_projection():
+    obj = Record(id='r', wide={
+        'id': 'w',
+        'meta': {'created': 1, 'author': 'someone'},
+        'body': 'text \u00e9',
+        'entries': [{'key': 'a', 'value': 1}, {'key': 'b', 'value': 2}],
+        'named': {'x': {'key': 'c', 'value': 3}},
+    }, secrets={'s': {'key': 'k', 'value': 4}}, ratio=(1, 2))
+
+    def expected(**changes):
+        data = json.loads(dumps(obj))
+        for key, value in changes.items():
+            if value is None:
+                data.pop(key)
+            else:
+                data[key] = value
+        return data
+
+    assert dumps(obj, exclude=['secrets', 'wide.body']) == json.dumps(expected(secrets=None, wide={
+        'id': 'w', 'meta': {'created': 1.0, 'author': 'someone'},
+        'entries': [{'key': 'a', 'value': 1}, {'key': 'b', 'value': 2}],
+        'named': {'x': {'key': 'c', 'value': 3}},
+    }))
+    assert json.loads(dumps(obj, include=['id', 'wide.meta.author', 'wide.entries[].value'])) == {
+        'id': 'r', 'wide': {'meta': {'author': 'someone'}, 'entries': [{'value': 1}, {'value': 2}]},
+    }
+    assert json.loads(dumps(obj, include=['wide'], exclude=['wide.named.*.value', 'wide.entries[]'])) == {
+        'wide': {'id': 'w', 'meta': {'created': 1.0, 'author': 'someone'}, 'body': 'text \u00e9',
+                 'entries': [], 'named': {'x': {'key': 'c'}}},
+    }
+
+    # Multi-fields are selected by their own name
+    assert json.loads(dumps(obj, include=['ratio'])) == {'ratio_numerator': 1, 'ratio_denominator': 2}
+    assert dumps(obj, include=['secrets.*.key']) == '{"secrets": {"s": {"key": "k"}}}'
+    assert dumps(obj, exclude=['id', 'wide', 'ratio', 'secrets']) == '{}'
+
+    assert encoder(Record, ['id']) is encoder(Record, ('id',))
+    assert encoder(Record, 'id') is encoder(Record, ['id'])
+    assert dumps(obj, include='wide.meta.author') == '{"wide": {"meta": {"author": "someone"}}}'
+    with pytest.raises(ValueError):
+        dumps(obj, include=['wide.unknown'])
+    with pytest.raises(ValueError):
+        dumps(obj, exclude=['id[]'])
+
+
+@model
+class Counted:
+    id = Keyword()
+    counts = Mapping(Integer(), default={})
+    entries = Mapping(Compound(Entry), default={})
+
+
+def test_dumps_projection_keys():
+    # Keys that aren't strings are written the way json writes them
+    obj = Counted(id='c', counts={1: 2, 2.5: 3, False: 4, None: 5}, entries={7: {'key': 'k', 'value': 1}})
+    assert dumps(obj, exclude='id') == json.dumps({_k: _v for _k, _v in raw(obj).items() if _k != 'id'})
+    assert dumps(obj, include='counts') == '{"counts": {"1": 2, "2.5": 3, "false": 4, "null": 5}}'
+    assert dumps(obj, include=['entries.*.key']) == '{"entries": {"7": {"key": "k"}}}'
+    obj.counts[(1, 2)] = 1
+    with pytest.raises(TypeError):
+        dumps(obj, exclude='id')
@@ -34,6 +34,13 @@ class UnsafeTypes:
     bytes = fields.Bytes()
 
 
+@model
+class ZeroCopyTypes:
+    """A model holding views rather than copies of its binary data"""
+    bytes = fields.Bytes(copy=False)
+    parts = fields.List(fields.Bytes(copy=False))
+
+
 @model
 class MultiTypes:
     compound = fields.Compound(ManyTypes)
@@ -71,6 +78,47 @@ def test_non_json_fields():
     assert obj == sample(UnsafeTypes, **raw(obj))
 
 
+def test_zero_copy_fields():
+    for make in (minimal_sample, sample):
+        obj = make(ZeroCopyTypes)
+        assert isinstance(obj.bytes, memoryview)
+        assert obj == ZeroCopyTypes(bytes=bytes(obj.bytes), parts=[bytes(_p) for _p in obj.parts])
+        assert obj == make(ZeroCopyTypes, **raw(obj))
+        assert obj == deepcopy(obj)
+        assert json.loads(dumps(obj, exclude=['bytes', 'parts'])) == {}
+
+
+def test_constrained_fields():
+    @model
+    class Constrained:
+        small = fields.Integer(min=-3, max=10)
+        positive = fields.Integer(min=1)
+        ratio = fields.Float(min=0, max=1)
+        below = fields.Float(max=-5)
+        name = fields.Keyword(min_length=3, max_length=5)
+        colour = fields.String(choices=['red', 'blue'])
+        tags = fields.List(fields.Integer(min=0, max=2), min_length=2, max_length=4)
+        scores = fields.Mapping(fields.Float(min=1), min_length=1)
+        nested = fields.List(fields.List(fields.Keyword(choices=['a'])), default=[])
+
+    @model
+    class Outer:
+        inner = fields.Compound(Constrained)
+        inners = fields.List(fields.Compound(Constrained))
+
+    for _ in range(20):
+        for obj in (sample(Constrained), minimal_sample(Constrained), sample(Outer).inner):
+            assert -3 <= obj.small <= 10 and obj.positive >= 1
+            assert 0 <= obj.ratio <= 1 and obj.below <= -5
+            assert 3 <= len(obj.name) <= 5 and obj.colour in ('red', 'blue')
+            assert 2 <= len(obj.tags) <= 4 and all(0 <= _t <= 2 for _t in obj.tags)
+            assert len(obj.scores) >= 1 and all(_v >= 1 for _v in obj.scores.values())
+        minimal_sample(Outer)
+
+    minimal = minimal_sample(Constrained)
+    assert len(minimal.tags) == 2 and len(minimal.scores) == 1 and minimal.nested == []
+
+
 def test_minimal_compound_fields():
     obj = minimal_sample(MultiTypes)
     assert obj != minimal_sample(MultiTypes)
@@ -0,0 +1,187 @@
+import pytest
+
+from draughts import model
+from draughts.fields import Compound, Integer, Keyword, List, Mapping, Timestamp, String
+from draughts.store import ModelStore
+
+
+@model(index=True)
+class Source:
+    id = Keyword()
+    region = Keyword()
+
+
+@model
+class Event:
+    id = Keyword()
+    kind = Keyword(index=True)
+    size = Integer(index=True)
+    time = Timestamp(index=True)
+    tags = List(Keyword(), index=True, default=[])
+    source = Compound(Source)
+    notes = String(default='')
+    counts = Mapping(Integer(), default={})
+    related = List(Compound(Source), index=False, default=[])
+    named = Mapping(Compound(Source), index=True, default={})
+
+
+def make(index, **extra):
+    data = {
+        'id': f'event-{index}',
+        'kind': ['a', 'b', 'c'][index % 3],
+        'size': index,
+        'time': 1000.0 + index,
+        'tags': [f'tag-{index % 5}', 'all'],
+        'source': {'id': f'source-{index % 4}', 'region': 'north' if index % 2 else 'south'},
+    }
+    data.update(extra)
+    return Event(data)
+
+
+def ids(found):
+    return sorted(int(_e.id.split('-')[1]) for _e in found)
+
+
+def test_indexes():
+    store = ModelStore(Event, 'id')
+    assert store.paths == ('kind', 'size', 'time', 'tags[]', 'source.id', 'source.region',
+                           'named.*.id', 'named.*.region')
+    store.add_many(make(_i) for _i in range(100))
+    assert len(store) == 100
+    assert store['event-5'].size == 5
+    assert 'event-100' not in store
+
+    assert ids(store.query(('kind', '==', 'a'))) == list(range(0, 100, 3))
+    assert ids(store.query(('size', '<', 5))) == [0, 1, 2, 3, 4]
+    assert ids(store.query(('size', '>=', 97))) == [97, 98, 99]
+    assert ids(store.query(('time', '>', 1097.0))) == [98, 99]
+    assert ids(store.query(('size', '<=', 10), ('kind', '==', 'b'))) == [1, 4, 7, 10]
+    assert ids(store.query(('tags[]', '==', 'tag-1'), ('source.id', 'in', ['source-1', 'source-2']))) == \
+        [_i for _i in range(100) if _i % 5 == 1 and _i % 4 in (1, 2)]
+    assert ids(store.query(('kind', '==', 'z'), ('size', '<', 5))) == []
+
+    # Conditions on unindexed paths or with unindexed operators are checked on each candidate
+    assert ids(store.query(('kind', '!=', 'a'), ('size', '<', 4))) == [1, 2]
+    assert ids(store.query(('notes', '==', ''), ('size', '<', 2))) == [0, 1]
+    assert len(store.query()) == 100
+
+    with pytest.raises(ValueError):
+        store.query(('missing', '==', 1))
+    with pytest.raises(ValueError):
+        store.query(('size', '~', 1))
+    with pytest.raises(ValueError):
+        store.add(make(1))
+    with pytest.raises(ValueError):
+        ModelStore(Event, 'tags[]')
+
+    # A failing batch leaves the store as it was
+    for batch in ([make(100), make(101), make(5)], [make(100), make(100)], [make(100), {'id': 'bad'}]):
+        with pytest.raises(ValueError):
+            store.add_many(batch)
+        assert len(store) == 100 and 'event-100' not in store
+        assert ids(store.query(('size', '>=', 97))) == [97, 98, 99]
+    store.add_many([make(100)])
+    assert ids(store.query(('size', '>=', 97))) == [97, 98, 99, 100]
+    assert store.remove('event-100').size == 100
+
+
+def test_updates():
+    store = ModelStore(Event, 'id')
+    for index in range(10):
+        store.add(make(index, named={'x': {'id': 'n', 'region': 'r'}}))
+
+    obj = store['event-3']
+    obj.kind = 'z'
+    assert ids(store.query(('kind', '==', 'z'))) == [3]
+    assert 3 not in ids(store.query(('kind', '==', 'a')))
+
+    obj.size = 1000
+    assert ids(store.query(('size', '>', 100))) == [3]
+
+    # Assignments inside compounds and replacing compounds are both seen
+    source = obj.source
+    source.region = 'east'
+    assert ids(store.query(('source.region', '==', 'east'))) == [3]
+    obj.source = {'id': 'other', 'region': 'west'}
+    assert ids(store.query(('source.region', '==', 'west'))) == [3]
+    assert store.query(('source.region', '==', 'east')) == []
+    obj.source.id = 'moved'
+    assert ids(store.query(('source.id', '==', 'moved'))) == [3]
+
+    # Changing the key moves the instance
+    obj.id = 'event-30'
+    assert 'event-3' not in store
+    assert store['event-30'] is obj
+
+    # In place container changes need a reindex
+    obj.tags.append('extra')
+    assert store.query(('tags[]', '==', 'extra')) == []
+    store.reindex(obj)
+    assert ids(store.query(('tags[]', '==', 'extra'))) == [30]
+
+    obj.named['x'].region = 'changed'
+    store.reindex(obj)
+    assert ids(store.query(('named.*.region', '==', 'changed'))) == [30]
+
+    removed = store.remove('event-30')
+    assert removed is obj
+    removed.kind = 'y'
+    assert store.query(('kind', '==', 'y')) == []
+    assert len(store) == 9
+
+
+def test_data():
+    store = ModelStore(Event, 'source.id')
+    obj = store.add({'id': 'x', 'kind': 'a', 'size': '5', 'time': 1, 'source': {'id': 's', 'region': 'r'}})
+    assert isinstance(obj, Event)
+    assert store.get('s') is obj
+    assert store.first(('size', '==', 5)) is obj
+    assert store.first(('size', '==', 6)) is None
+
+
+def test_sorted_index():
+    store = ModelStore(Event, 'id')
+    # Enough entries to spread over many chunks, with runs of equal values crossing chunk boundaries
+    store.add_many(make(_i, size=_i // 700) for _i in range(3000))
+    for index in range(3000, 4000):
+        store.add(make(index, size=index % 7))
+
+    sizes = {f'event-{_i}': _i // 700 for _i in range(3000)}
+    sizes.update({f'event-{_i}': _i % 7 for _i in range(3000, 4000)})
+    for size in range(-1, 9):
+        assert sorted(_e.id for _e in store.query(('size', '==', size))) == \
+            sorted(_k for _k, _v in sizes.items() if _v == size)
+        assert len(store.query(('size', '<', size))) == sum(1 for _v in sizes.values() if _v < size)
+        assert len(store.query(('size', '>=', size))) == sum(1 for _v in sizes.values() if _v >= size)
+
+    for index in range(0, 4000, 3):
+        store.remove(f'event-{index}')
+        del sizes[f'event-{index}']
+    for size in range(-1, 9):
+        assert len(store.query(('size', '<=', size))) == sum(1 for _v in sizes.values() if _v <= size)
+        assert len(store.query(('size', '>', size))) == sum(1 for _v in sizes.values() if _v > size)
+
+
+def test_changes_before_and_after_adding():
+    @model
+    class Part:
+        id = Keyword()
+        size = Integer(index=True)
+        source = Compound(Source, optional=True)
+
+    part = Part(id='p', size=1)
+    part.size = 2
+    part.source = {'id': 's', 'region': 'east'}
+    store = ModelStore(Part, 'id')
+    store.add(part)
+    assert ids_of(store.query(('size', '==', 2))) == ['p']
+
+    # Setters start calling the store once it observes the first instance
+    part.size = 3
+    part.source.region = 'west'
+    assert ids_of(store.query(('size', '==', 3))) == ['p']
+    assert ids_of(store.query(('source.region', '==', 'west'))) == ['p']
+
+
+def ids_of(found):
+    return [_p.id for _p in found]
@@ -0,0 +1,71 @@
+import io
+import json
+
+import pytest
+
+from draughts import model, raw
+from draughts.fields import Integer, String, List
+from draughts.stream import iter_json_array
+
+
+@model
+class Record:
+    name = String()
+    values = List(Integer(), default=[])
+
+
+def records(count):
+    return [{'name': f'record-{_i} é中', 'values': list(range(_i % 7))} for _i in range(count)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 17, 2**16])
+def test_iter_json_array(chunk_size):
+    data = records(50)
+    text = json.dumps(data, indent=2)
+
+    parsed = list(iter_json_array(io.StringIO(text), Record, chunk_size=chunk_size))
+    assert all(isinstance(_r, Record) for _r in parsed)
+    assert [raw(_r) for _r in parsed] == data
+
+    parsed = list(iter_json_array(io.BytesIO(text.encode()), Record, chunk_size=chunk_size))
+    assert [raw(_r) for _r in parsed] == data
+
+
+def test_lazy():
+    stream = io.StringIO(json.dumps(records(3)) + 'garbage')
+    parsed = iter_json_array(stream, Record, chunk_size=8)
+    assert next(parsed).name.startswith('record-0')
+    assert stream.tell() < len(stream.getvalue())
+    next(parsed)
+    next(parsed)
+    with pytest.raises(ValueError):
+        next(parsed)
+
+
+def test_edge_cases():
+    assert list(iter_json_array(io.StringIO(' [ ] '), Record)) == []
+    assert list(iter_json_array(io.StringIO('[1234567, 2]'), int, chunk_size=3)) == [1234567, 2]
+    for chunk_size in range(1, 12):
+        parsed = iter_json_array(io.StringIO('[-1.5e-300, 2.25]'), float, chunk_size=chunk_size)
+        assert list(parsed) == [-1.5e-300, 2.25]
+
+    for text in ['', '{}', '[{"name": "a"}', '[{"name": "a"},]', '[{"name": "a"} {"name": "b"}]', '[{"name": ]',
+                 '[{"name": "a"}] []']:
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO(text), Record, chunk_size=4))
+
+    # Elements are validated as they are constructed
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"name": "a", "values": ["cats"]}]'), Record))
+
+
+def test_malformed_element_stops_reading():
+    for garbage, error in [('{"name": "bad" "values": []}', 'Invalid element'), ('12345x', "Expected ','")]:
+        text = json.dumps(records(5))[:-1] + f', {garbage}, ' + json.dumps(records(5000))[1:]
+        stream = io.StringIO(text)
+        parsed = iter_json_array(stream, lambda _v: _v, chunk_size=256)
+        with pytest.raises(ValueError, match=error):
+            for _ in parsed:
+                pass
+        # The error is found without reading on to the end of the file
+        assert stream.tell() < 4096
@@ -1,6 +1,9 @@
-from draughts.util import construct_safe
+import pytest
+
+from draughts.util import construct_safe, clone
 from draughts import model, raw
-from draughts.fields import Integer, List, Compound
+from draughts.fields import Integer, Keyword, List, Mapping, Compound, Any, SeparatedFraction
+from draughts.frozen import frozen
 
 
 @model
@@ -35,4 +38,76 @@ def test_construct_safe():
             {'count': 10, 'size': -1},
             {'count': 100, 'size': 1},
         ]
-    }
\ No newline at end of file
+    }
+
+
+@model
+class Template:
+    name = Keyword()
+    block = Compound(Block)
+    rows = List(Compound(Row), default=[])
+    lazy_rows = List(Compound(Row), lazy=True, default=[])
+    labels = List(Keyword(), default=[])
+    packed = List(Integer(), packed=True, default=[])
+    nested = Mapping(List(Integer()), default={})
+    extra = Any(optional=True)
+    ratio = SeparatedFraction(default=1)
+    note = Keyword(optional=True)
+
+
+def test_clone():
+    original = Template({
+        'name': 'template',
+        'block': {'sections': [{'count': 1, 'size': 2}]},
+        'rows': [{'count': 3, 'size': 4}],
+        'lazy_rows': [{'count': 5, 'size': 6}],
+        'labels': ['a'],
+        'packed': [1, 2],
+        'nested': {'x': [1]},
+        'extra': {'deep': [1]},
+        'note': 'n',
+    })
+    expected = raw(Template(raw(original)))
+
+    copy = clone(original)
+    assert raw(copy) == expected and copy is not original
+
+    # Changing any container of the copy leaves the original alone
+    copy.block.sections[0].count = 10
+    copy.block.sections.append({'count': 0, 'size': 0})
+    copy.rows[0].size = 40
+    copy.lazy_rows[0].size = 60
+    copy.labels.append('b')
+    copy.packed.append(3)
+    copy.nested['x'].append(2)
+    copy.extra['deep'].append(2)
+    assert raw(original) == expected
+
+    # Copies keep their typing
+    copy.labels.append(5)
+    assert copy.labels[-1] == '5'
+    with pytest.raises(ValueError):
+        copy.packed.append('x')
+
+    # Only the overrides are cast
+    changed = clone(original, name=b'other', rows=[{'count': '7', 'size': 8}], ratio=(2, 4), note=None)
+    assert changed.name == 'other' and changed.rows[0].count == 7
+    assert changed.ratio == 0.5 and changed.note is None
+    assert changed.block.sections[0].count == 1
+
+    # Overriding with another instance's compounds copies them
+    block = Block(sections=[{'count': 9, 'size': 9}])
+    changed = clone(original, block=block, rows=original.rows)
+    changed.block.sections[0].count = 90
+    changed.block.sections.append({'count': 0, 'size': 0})
+    changed.rows[0].size = 400
+    assert raw(block) == {'sections': [{'count': 9, 'size': 9}]} and raw(original) == expected
+
+    with pytest.raises(ValueError):
+        clone(original, missing=1)
+    with pytest.raises(ValueError):
+        clone(original, name=None)
+
+    fixed = frozen(Template)(raw(Template(raw(original))))
+    assert clone(fixed) is fixed
+    assert clone(fixed, name='x').name == 'x' and fixed.name == 'template'